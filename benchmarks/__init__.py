@@ -0,0 +1 @@
+"""Performance benchmarks for the samplers. Run a module with ``python -m benchmarks.<module>``."""
@@ -0,0 +1,62 @@
+"""Benchmarks for street-level address generation.
+
+Usage:
+    python -m benchmarks.bench_addresses
+"""
+
+import json
+import random
+
+import numpy as np
+
+from benchmarks.bench_locations import POPULATION_DATA
+from benchmarks.common import print_table, synthetic_name_data, time_per_call
+from src.address_sampler import BrazilianAddressSampler, StreetIndex
+from src.br_location_class import BrazilianLocationSampler
+
+
+def _synthetic_street_index(sampler: BrazilianLocationSampler, records: int = 1_000_000) -> StreetIndex:
+    """Street index shaped like the cepaberto dumps: one record per CEP of the largest cities."""
+    index = sampler.index
+    rng = np.random.default_rng(0)
+    cities = np.argsort(index.city_population)[::-1][:500].astype(np.int32)
+    city = cities[rng.integers(0, len(cities), records)]
+    city.sort()
+    counts = np.bincount(city, minlength=len(index))
+    return StreetIndex(
+        city_keys=index.city_keys,
+        offsets=np.concatenate(([0], np.cumsum(counts))),
+        cep=index.cep_table.sample(city, rng),
+        street=rng.integers(0, 200_000, records).astype(np.int32),
+        neighborhood=rng.integers(0, 20_000, records).astype(np.int32),
+        streets=tuple(f'Rua {street}' for street in range(200_000)),
+        neighborhoods=tuple(f'Bairro {neighborhood}' for neighborhood in range(20_000)),
+    )
+
+
+def bench_addresses(n: int = 1_000_000) -> None:
+    """Addresses per second, synthetic and backed by a street index, scalar and batch."""
+    with POPULATION_DATA.open(encoding='utf-8') as file:
+        location_sampler = BrazilianLocationSampler({**json.load(file), **synthetic_name_data(100)})
+    rows = []
+    for label, street_index in (('synthetic', None), ('street index', _synthetic_street_index(location_sampler))):
+        sampler = BrazilianAddressSampler(location_sampler, street_index)
+        random.seed(0)
+        scalar = time_per_call(sampler.get_random_address, 50_000)
+        batch = time_per_call(lambda sampler=sampler: sampler.get_random_addresses(n), 3) / n
+        columns = sampler.get_random_addresses(n)
+        rendered = time_per_call(columns.to_list, 1) / n
+        rows += [
+            [f'{label}: get_random_address (loop)', f'{scalar:,.0f}', f'{1e9 / scalar:,.0f}'],
+            [f'{label}: get_random_addresses({n:,})', f'{batch:,.1f}', f'{1e9 / batch:,.0f}'],
+            [f'{label}: AddressColumns.to_list', f'{rendered:,.1f}', f'{1e9 / rendered:,.0f}'],
+        ]
+    print_table('Address throughput', ['Path', 'ns/address', 'addresses/s'], rows)
+
+
+def main() -> None:
+    bench_addresses()
+
+
+if __name__ == '__main__':
+    main()
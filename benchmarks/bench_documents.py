@@ -0,0 +1,145 @@
+"""Benchmarks for document number generation.
+
+Usage:
+    python -m benchmarks.bench_documents
+"""
+
+import random
+
+import numpy as np
+
+from benchmarks.common import print_table, time_per_call
+from src.utils.cnpj import random_alnum_cnpj, random_cnpj, random_cnpj_values, render_cnpjs, validate_cnpj, validate_cnpjs
+from src.utils.cpf import (
+    CPF_FISCAL_REGIONS,
+    cpf_region_digits,
+    random_cpf,
+    random_cpf_digits,
+    random_cpfs,
+    render_cpfs,
+    validate_cpf,
+    validate_cpfs,
+)
+from src.utils.unique import UniqueIdStream
+
+
+def bench_cpf(n: int = 10_000_000, checked: int = 200_000) -> None:
+    """CPFs per second: scalar generator against the digit-matrix batch, with a validate_cpf cross-check."""
+    random.seed(0)
+    rng = np.random.default_rng(0)
+    scalar = time_per_call(random_cpf, 100_000)
+    digits_only = time_per_call(lambda: random_cpf_digits(n, rng), 1) / n
+    rendered = time_per_call(lambda: render_cpfs(random_cpf_digits(n, rng)), 1) / n
+    strings = time_per_call(lambda: random_cpfs(n // 10, rng=rng), 1) / (n // 10)
+    regions = cpf_region_digits(rng.choice(list(CPF_FISCAL_REGIONS), n))
+    by_state = time_per_call(lambda: render_cpfs(random_cpf_digits(n, rng, regions)), 1) / n
+
+    sample = random_cpfs(checked, rng=rng)
+    invalid = sum(not validate_cpf(cpf) for cpf in sample)
+    in_region = render_cpfs(random_cpf_digits(checked, rng, regions[:checked]), formatted=False).astype(str).tolist()
+    invalid += sum(not validate_cpf(cpf) or int(cpf[8]) != region for cpf, region in zip(in_region, regions.tolist(), strict=False))
+    if invalid:
+        raise SystemExit(f'{invalid} of {checked:,} batch CPFs failed validate_cpf')
+    rows = [
+        ['random_cpf (loop)', f'{scalar:,.0f}', f'{1e9 / scalar:,.0f}'],
+        [f'random_cpf_digits({n:,})', f'{digits_only:,.1f}', f'{1e9 / digits_only:,.0f}'],
+        [f'render_cpfs(random_cpf_digits({n:,}))', f'{rendered:,.1f}', f'{1e9 / rendered:,.0f}'],
+        [f'random_cpfs({n // 10:,}) as str', f'{strings:,.1f}', f'{1e9 / strings:,.0f}'],
+        [f'render_cpfs(random_cpf_digits({n:,}, regions))', f'{by_state:,.1f}', f'{1e9 / by_state:,.0f}'],
+    ]
+    print_table(f'CPF throughput ({checked:,} batch CPFs cross-checked with validate_cpf)', ['Path', 'ns/CPF', 'CPFs/s'], rows)
+
+
+def bench_cnpj(n: int = 10_000_000, checked: int = 200_000) -> None:
+    """Mixed-format CNPJs per second: scalar generators, batch generation and batch validation."""
+    random.seed(0)
+    rng = np.random.default_rng(0)
+    numeric = time_per_call(random_cnpj, 100_000)
+    alnum = time_per_call(random_alnum_cnpj, 100_000)
+    rendered = time_per_call(lambda: render_cnpjs(random_cnpj_values(n, 0.5, rng)), 1) / n
+    cnpjs = render_cnpjs(random_cnpj_values(n, 0.5, rng))
+    scalar_check = time_per_call(lambda: [validate_cnpj(cnpj) for cnpj in cnpjs[:checked].astype(str).tolist()], 1) / checked
+    batch_check = time_per_call(lambda: validate_cnpjs(cnpjs), 1) / n
+
+    sample = cnpjs[:checked].astype(str).tolist()
+    invalid = sum(not validate_cnpj(cnpj) for cnpj in sample) + int((~validate_cnpjs(cnpjs)).sum())
+    if invalid:
+        raise SystemExit(f'{invalid} batch CNPJs failed validation')
+    rows = [
+        ['random_cnpj (loop)', f'{numeric:,.0f}', f'{1e9 / numeric:,.0f}'],
+        ['random_alnum_cnpj (loop)', f'{alnum:,.0f}', f'{1e9 / alnum:,.0f}'],
+        [f'render_cnpjs(random_cnpj_values({n:,}, 0.5))', f'{rendered:,.1f}', f'{1e9 / rendered:,.0f}'],
+        ['validate_cnpj (loop)', f'{scalar_check:,.0f}', f'{1e9 / scalar_check:,.0f}'],
+        [f'validate_cnpjs({n:,})', f'{batch_check:,.1f}', f'{1e9 / batch_check:,.0f}'],
+    ]
+    print_table('CNPJ throughput, half alphanumeric', ['Path', 'ns/CNPJ', 'CNPJs/s'], rows)
+
+
+def bench_bulk_validation(n: int = 10_000_000, checked: int = 200_000) -> None:
+    """Validation throughput for CPF columns in each supported form, against the scalar loop."""
+    rng = np.random.default_rng(0)
+    formatted = render_cpfs(random_cpf_digits(n, rng))
+    bare = render_cpfs(random_cpf_digits(n, rng), formatted=False)
+    unicode = formatted.astype(str)
+    ragged = np.array([cpf.lstrip('0.') for cpf in unicode[:checked].tolist()])
+
+    scalar = time_per_call(lambda: [validate_cpf(cpf) for cpf in unicode[:checked].tolist()], 1) / checked
+    rows = [['validate_cpf (loop)', f'{scalar:,.0f}', f'{1e9 / scalar:,.0f}']]
+    for label, column, size in (
+        ('formatted, NumPy U14', unicode, n),
+        ('formatted, NumPy S14', formatted, n),
+        ('bare, raw byte buffer', bare.tobytes(), n),
+        ('unpadded/ragged, NumPy U', ragged, checked),
+    ):
+        width = 11 if isinstance(column, bytes) else None
+        elapsed = time_per_call(lambda column=column, width=width: validate_cpfs(column, width=width), 1) / size
+        rows.append([f'validate_cpfs, {label}', f'{elapsed:,.1f}', f'{1e9 / elapsed:,.0f}'])
+    try:
+        import pyarrow as pa
+    except ImportError:
+        pass
+    else:
+        column = pa.array(unicode[: n // 10].tolist())
+        elapsed = time_per_call(lambda: validate_cpfs(column), 1) / len(column)
+        rows.append(['validate_cpfs, pyarrow string', f'{elapsed:,.1f}', f'{1e9 / elapsed:,.0f}'])
+    print_table('Bulk CPF validation', ['Input', 'ns/CPF', 'CPFs/s'], rows)
+
+
+def bench_unique(n: int = 10_000_000, checked: int = 1_000_000) -> None:
+    """Distinct CPFs per second: keyed permutation stream against random draws deduplicated with a set."""
+    rng = np.random.default_rng(0)
+
+    def deduplicated(count: int) -> set[str]:
+        seen: set[str] = set()
+        while len(seen) < count:
+            seen.update(random_cpfs(count - len(seen), rng=rng))
+        return seen
+
+    dedup = time_per_call(lambda: deduplicated(checked), 1) / checked
+    stream = time_per_call(lambda: UniqueIdStream('cpf', key=0).take_bytes(n), 1) / n
+    strings = time_per_call(lambda: UniqueIdStream('cpf', key=0).take(checked), 1) / checked
+    sharded = time_per_call(lambda: [UniqueIdStream('cpf', key=0, shard=s, shards=8).take_bytes(n // 8) for s in range(8)], 1) / n
+
+    cpfs = UniqueIdStream('cpf', key=1).take_bytes(n)
+    duplicates = n - len(np.unique(cpfs))
+    invalid = int((~validate_cpfs(cpfs)).sum())
+    if duplicates or invalid:
+        raise SystemExit(f'{duplicates} duplicate and {invalid} invalid CPFs in the unique stream')
+    rows = [
+        [f'random_cpfs + set, {checked:,} distinct', f'{dedup:,.1f}', f'{1e9 / dedup:,.0f}', '1 set entry per CPF'],
+        [f'UniqueIdStream.take_bytes({n:,})', f'{stream:,.1f}', f'{1e9 / stream:,.0f}', 'key + counter'],
+        [f'UniqueIdStream.take({checked:,}) as str', f'{strings:,.1f}', f'{1e9 / strings:,.0f}', 'key + counter'],
+        [f'8 shards x take_bytes({n // 8:,})', f'{sharded:,.1f}', f'{1e9 / sharded:,.0f}', 'key + counter per shard'],
+    ]
+    print_table(f'Unique CPFs ({n:,} streamed CPFs checked distinct and valid)', ['Path', 'ns/CPF', 'CPFs/s', 'State'], rows)
+
+
+def main() -> None:
+    bench_cpf()
+    bench_cnpj()
+    bench_bulk_validation()
+    bench_unique()
+
+
+if __name__ == '__main__':
+    main()
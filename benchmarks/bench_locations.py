@@ -0,0 +1,247 @@
+"""Benchmarks for BrazilianLocationSampler.
+
+Usage:
+    python -m benchmarks.bench_locations
+"""
+
+import json
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.common import (
+    count_file_opens,
+    print_table,
+    synthetic_location_data,
+    synthetic_middle_names_data,
+    synthetic_name_data,
+    time_per_call,
+)
+from src.alias_table import AliasTable
+from src.br_location_class import BrazilianLocationSampler
+from src.location_filter import LocationFilter
+from src.weighting import WeightingScenario, compile_scenario
+from src.utils.muni import muni_code, validate_munis
+
+POPULATION_DATA = Path(__file__).resolve().parents[1] / 'data' / 'fixing_cities' / 'population_data_2024_complete_revised.json'
+
+
+def bench_random_location(calls: int = 20_000) -> None:
+    """Per-call cost of get_random_location with a middle-names file.
+
+    Fails if any call opens a file: the name sampler must be built once and shared.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        middle_names_path = Path(directory) / 'middle_names.json'
+        middle_names_path.write_text(json.dumps(synthetic_middle_names_data(2_000)), encoding='utf-8')
+        sampler = BrazilianLocationSampler(synthetic_location_data(), middle_names_path)
+
+        # The first call builds the shared name sampler and reads the file once
+        sampler.get_random_location()
+        with count_file_opens() as opened:
+            per_call = time_per_call(sampler.get_random_location, calls)
+
+    rows = [['get_random_location', f'{per_call:,.0f}', f'{1e9 / per_call:,.0f}', f'{len(opened):,}']]
+    print_table('Location throughput', ['Path', 'ns/call', 'calls/s', 'files opened'], rows)
+    if opened:
+        sys.exit(f'get_random_location opened {len(opened):,} files during {calls * 3:,} calls, e.g. {opened[0]}')
+
+
+def _implied_city_probabilities(sampler: BrazilianLocationSampler) -> np.ndarray:
+    """Exact probability of each city ID under the sampler's current mode."""
+    if not sampler.two_stage:
+        return sampler._national_city_table.probabilities
+
+    implied = np.zeros(len(sampler.index))
+    state_probability = sampler._state_table.probabilities
+    for state_abbr, table in sampler._city_tables.items():
+        implied[sampler._city_ids_by_state[state_abbr]] = state_probability[sampler.index.state_ids[state_abbr]] * table.probabilities
+    return implied
+
+
+def bench_state_and_city(calls: int = 200_000) -> None:
+    """Single-draw vs two-stage get_state_and_city: throughput and error against IBGE city populations."""
+    with POPULATION_DATA.open(encoding='utf-8') as file:
+        data = {**json.load(file), **synthetic_name_data(100)}
+    ibge = np.array([city_data['city_population'] for city_data in data['cities'].values()], dtype=np.float64)
+    ibge /= ibge.sum()
+
+    rows = []
+    for label, two_stage in [('single draw', False), ('two stage', True)]:
+        sampler = BrazilianLocationSampler(data, two_stage=two_stage)
+        per_call = time_per_call(sampler.get_state_and_city, calls)
+        error = np.abs(_implied_city_probabilities(sampler) - ibge)
+        relative = error / ibge
+        rows.append([label, f'{per_call:,.0f}', f'{0.5 * error.sum():.5f}', f'{relative.mean():.3%}', f'{relative.max():.2%}'])
+    print_table(
+        f'get_state_and_city over {len(ibge):,} cities',
+        ['Mode', 'ns/call', 'TV distance', 'mean rel. error', 'max rel. error'],
+        rows,
+    )
+
+
+def bench_batch_locations(n: int = 1_000_000) -> None:
+    """Locations with CEPs per second: scalar loop vs get_random_locations, with and without formatting."""
+    with POPULATION_DATA.open(encoding='utf-8') as file:
+        sampler = BrazilianLocationSampler({**json.load(file), **synthetic_name_data(100)})
+
+    def scalar() -> str:
+        state_name, state_abbr, city_name = sampler.get_state_and_city()
+        return sampler.format_full_location(city_name, state_name, state_abbr)
+
+    per_call = time_per_call(scalar, 100_000, repeat=1)
+    columns = time_per_call(lambda: sampler.get_random_locations(n), 1) / n
+    formatted = time_per_call(lambda: sampler.get_random_locations(n).to_list(), 1) / n
+    rows = [
+        ['format_full_location (loop)', f'{per_call:,.0f}', f'{n * per_call / 1e9:,.2f}'],
+        ['get_random_locations', f'{columns:,.0f}', f'{n * columns / 1e9:,.2f}'],
+        ['get_random_locations + to_list', f'{formatted:,.0f}', f'{n * formatted / 1e9:,.2f}'],
+    ]
+    print_table(f'Batch locations with CEP ({n:,} rows)', ['Path', 'ns/row', f's per {n:,}'], rows)
+
+
+def _parse_and_draw_cep(city_data: dict) -> int:
+    """Reference implementation that parses the CEP strings and flips a coin between ranges on every call."""
+    if city_data.get('cep_range_begins_two') and random.random() >= 0.5:
+        start, end = city_data['cep_range_begins_two'], city_data['cep_range_ends_two']
+    else:
+        start, end = city_data['cep_range_begins'], city_data['cep_range_ends']
+    return random.randint(int(start.replace('-', '')), int(end.replace('-', '')))
+
+
+def bench_cep_draws(calls: int = 200_000, n: int = 1_000_000) -> None:
+    """CEP draws: per-call string parsing vs the compiled range table, scalar and batch."""
+    with POPULATION_DATA.open(encoding='utf-8') as file:
+        sampler = BrazilianLocationSampler({**json.load(file), **synthetic_name_data(100)})
+    city_data = sampler.data['cities']['São Paulo_SP']
+    cities = sampler._national_city_table.sample(n)
+
+    parse = time_per_call(lambda: _parse_and_draw_cep(city_data), calls)
+    scalar = time_per_call(lambda: sampler._get_random_cep_for_city('São Paulo_SP'), calls)
+    batch = time_per_call(lambda: sampler._cep_table.sample(cities), 1) / n
+    rows = [
+        ['parse + coin (loop)', f'{parse:,.0f}'],
+        ['_get_random_cep_for_city (loop)', f'{scalar:,.0f}'],
+        [f'CepRangeTable.sample({n:,})', f'{batch:,.1f}'],
+    ]
+    print_table(f'CEP draws ({len(sampler._cep_table.starts):,} ranges)', ['Path', 'ns/CEP'], rows)
+
+
+def _scan_for_cep(cities: dict, cep: int) -> str | None:
+    """Reference implementation: linear scan over every city's ranges."""
+    for city_name, city_data in cities.items():
+        if int(city_data['cep_range_begins'].replace('-', '')) <= cep <= int(city_data['cep_range_ends'].replace('-', '')):
+            return city_name
+    return None
+
+
+def bench_cep_lookup(calls: int = 100_000, n: int = 5_000_000) -> None:
+    """Reverse CEP lookups: linear scan vs the interval index, scalar and batch."""
+    with POPULATION_DATA.open(encoding='utf-8') as file:
+        sampler = BrazilianLocationSampler({**json.load(file), **synthetic_name_data(100)})
+    ceps = sampler.get_random_locations(n).cep
+    # Half of a batch that also misses: uniform CEPs over the whole space
+    mixed = np.where(np.arange(n) % 2 == 0, ceps, np.random.default_rng(0).integers(0, 100_000_000, n))
+    cep = int(ceps[0])
+    sampler.cep_index  # noqa: B018 - build the index outside the timings
+
+    scan = time_per_call(lambda: _scan_for_cep(sampler.data['cities'], cep), 50)
+    scalar = time_per_call(lambda: sampler.lookup_cep(cep), calls)
+    batch = time_per_call(lambda: sampler.cep_index.lookup_many(ceps), 1) / n
+    batch_mixed = time_per_call(lambda: sampler.cep_index.lookup_many(mixed), 1) / n
+    rows = [
+        ['linear scan (loop)', f'{scan:,.0f}', f'{1e9 / scan:,.0f}'],
+        ['lookup_cep (loop)', f'{scalar:,.0f}', f'{1e9 / scalar:,.0f}'],
+        [f'lookup_many({n:,}), all hits', f'{batch:,.1f}', f'{1e9 / batch:,.0f}'],
+        [f'lookup_many({n:,}), half misses', f'{batch_mixed:,.1f}', f'{1e9 / batch_mixed:,.0f}'],
+    ]
+    print_table(f'Reverse CEP lookup ({len(sampler.cep_index.starts):,} ranges)', ['Path', 'ns/CEP', 'CEPs/s'], rows)
+
+
+def bench_ibge_codes(calls: int = 200_000, n: int = 5_000_000) -> None:
+    """IBGE code emission from the compiled index against computing check digits per record."""
+    with POPULATION_DATA.open(encoding='utf-8') as file:
+        sampler = BrazilianLocationSampler({**json.load(file), **synthetic_name_data(100)})
+    columns = sampler.get_random_locations(n)
+    codes = columns.ibge_code
+    stems = [str(code // 10) for code in codes[:calls].tolist()]
+
+    computed = time_per_call(lambda: [muni_code(stem) for stem in stems], 1) / calls
+    scalar = time_per_call(lambda: sampler.get_ibge_code('São Paulo', 'SP'), calls)
+    emitted = time_per_call(lambda: columns.ibge_code, 1) / n
+    validated = time_per_call(lambda: validate_munis(codes), 1) / n
+    rows = [
+        ['muni_code per record (loop)', f'{computed:,.0f}', f'{1e9 / computed:,.0f}'],
+        ['get_ibge_code (loop)', f'{scalar:,.0f}', f'{1e9 / scalar:,.0f}'],
+        [f'LocationColumns.ibge_code ({n:,})', f'{emitted:,.1f}', f'{1e9 / emitted:,.0f}'],
+        [f'validate_munis ({n:,})', f'{validated:,.1f}', f'{1e9 / validated:,.0f}'],
+    ]
+    print_table('IBGE municipality codes', ['Path', 'ns/code', 'codes/s'], rows)
+
+
+def bench_filtered(calls: int = 200_000, n: int = 1_000_000) -> None:
+    """Filtered draws from cached sub-tables against rebuilding the table for every call."""
+    with POPULATION_DATA.open(encoding='utf-8') as file:
+        sampler = BrazilianLocationSampler({**json.load(file), **synthetic_name_data(100)})
+    location_filter = LocationFilter.create(regions='nordeste', min_population=100_000)
+    index = sampler.index
+
+    def rebuild() -> int:
+        cities = np.flatnonzero(location_filter.mask(index))
+        return int(cities[AliasTable(index.city_population[cities]).draw()])
+
+    uncached = time_per_call(rebuild, 200)
+    scalar = time_per_call(lambda: sampler.get_filtered_city(location_filter), calls)
+    unfiltered = time_per_call(sampler.get_city, calls)
+    batch = time_per_call(lambda: sampler.get_random_locations(n, location_filter=location_filter), 3) / n
+    rows = [
+        ['rebuild per call', f'{uncached:,.0f}', f'{1e9 / uncached:,.0f}'],
+        ['get_filtered_city (cached)', f'{scalar:,.0f}', f'{1e9 / scalar:,.0f}'],
+        ['get_city (unfiltered)', f'{unfiltered:,.0f}', f'{1e9 / unfiltered:,.0f}'],
+        [f'get_random_locations({n:,}, filter)', f'{batch:,.1f}', f'{1e9 / batch:,.0f}'],
+    ]
+    print_table(f'Filtered draws, {location_filter}', ['Path', 'ns/draw', 'draws/s'], rows)
+    print(sampler.filter_cache_info())
+
+
+def bench_scenarios(calls: int = 20) -> None:
+    """Cost of applying a weighting scenario: rebuilding the sampler, recompiling, loading from disk."""
+    with POPULATION_DATA.open(encoding='utf-8') as file:
+        data = {**json.load(file), **synthetic_name_data(100)}
+    sampler = BrazilianLocationSampler(data)
+    scenario = WeightingScenario(population_bands=((None, 20_000, 10.0),), state_multipliers={'SP': 0.5}, temperature=2.0)
+    base = sampler.index.national_city_weights()
+
+    rebuild = time_per_call(lambda: BrazilianLocationSampler(data, scenario=scenario), 3)
+    weights = time_per_call(lambda: scenario.weights(sampler.index, base), calls)
+    table = time_per_call(lambda: compile_scenario(sampler.index, scenario, base), calls)
+    switch = time_per_call(lambda: sampler.set_scenario(scenario), calls)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        compile_scenario(sampler.index, scenario, base, cache_dir)
+        cached = time_per_call(lambda: compile_scenario(sampler.index, scenario, base, cache_dir), calls)
+    rows = [
+        ['new sampler with scenario', f'{rebuild / 1e6:,.2f}'],
+        ['scenario.weights (vectorized)', f'{weights / 1e6:,.2f}'],
+        ['compile_scenario (alias table)', f'{table / 1e6:,.2f}'],
+        ['compile_scenario (disk cache hit)', f'{cached / 1e6:,.2f}'],
+        ['set_scenario (all tables)', f'{switch / 1e6:,.2f}'],
+    ]
+    print_table(f'Weighting scenarios ({len(sampler.index):,} cities)', ['Path', 'ms'], rows)
+
+
+def main() -> None:
+    bench_random_location()
+    bench_state_and_city()
+    bench_batch_locations()
+    bench_cep_draws()
+    bench_cep_lookup()
+    bench_ibge_codes()
+    bench_filtered()
+    bench_scenarios()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+"""Benchmarks for BrazilianNameSampler.
+
+Usage:
+    python -m benchmarks.bench_names
+"""
+
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.common import print_table, synthetic_middle_names_data, synthetic_name_data, time_per_call
+from src.br_name_class import BrazilianNameSampler, TimePeriod
+
+VOCABULARY_SIZES = [100, 1_000, 10_000, 100_000]
+
+
+def _rebuild_and_draw(names_data: dict) -> str:
+    """Reference implementation that rebuilds the weight lists on every draw."""
+    names = list(names_data)
+    weights = [info['percentage'] for info in names_data.values()]
+    return random.choices(names, weights=weights, k=1)[0]
+
+
+def bench_first_name_scaling(calls: int = 20_000) -> None:
+    """Per-call cost of a first-name draw should not grow with the vocabulary size."""
+    rows = []
+    baseline = None
+    for size in VOCABULARY_SIZES:
+        data = synthetic_name_data(size)
+        sampler = BrazilianNameSampler(data)
+        names_data = data['common_names_percentage'][TimePeriod.UNTIL_2010.value]['names']
+        per_call = time_per_call(lambda s=sampler: s.get_random_name(TimePeriod.UNTIL_2010, raw=True, include_surname=False), calls)
+        rebuild = time_per_call(lambda n=names_data: _rebuild_and_draw(n), max(calls // size, 10))
+        baseline = baseline or per_call
+        rows.append([f'{size:,}', f'{per_call:,.0f}', f'{per_call / baseline:.2f}x', f'{rebuild:,.0f}'])
+    print_table('First-name draw vs vocabulary size', ['Vocabulary', 'ns/call', 'vs smallest', 'rebuild ns/call'], rows)
+
+
+def bench_batch_names(n: int = 1_000_000) -> None:
+    """Full names per second, scalar loop vs the vectorized batch API."""
+    sampler = BrazilianNameSampler(synthetic_name_data(10_000, surname_count=16_000))
+    scalar_calls = 50_000
+    scalar = time_per_call(lambda: sampler.get_random_name(TimePeriod.UNTIL_2010), scalar_calls, repeat=1)
+    batch = time_per_call(lambda: sampler.get_random_names(n, TimePeriod.UNTIL_2010), 1, repeat=3) / n
+    rows = [
+        ['get_random_name (loop)', f'{scalar:,.0f}', f'{1e9 / scalar:,.0f}'],
+        [f'get_random_names({n:,})', f'{batch:,.0f}', f'{1e9 / batch:,.0f}'],
+    ]
+    print_table('Full-name throughput', ['Path', 'ns/name', 'names/s'], rows)
+
+
+def _rebuild_and_draw_surnames(source: dict) -> str:
+    """Reference implementation that rebuilds the surname lists for each of the two surnames."""
+    surnames = [surname for surname in source if surname != 'top_40']
+    weights = [source[surname]['percentage'] for surname in surnames]
+    return ' '.join(random.choices(surnames, weights=weights, k=1)[0] for _ in range(2))
+
+
+def bench_surnames(calls: int = 100_000, n: int = 1_000_000) -> None:
+    """Surname-pair throughput on the full and top-40 tables."""
+    data = synthetic_name_data(1_000, surname_count=16_000)
+    sampler = BrazilianNameSampler(data)
+    rows = []
+    for label, top_40, source in [('full', False, data['surnames']), ('top 40', True, data['surnames']['top_40'])]:
+        scalar = time_per_call(lambda t=top_40: sampler.get_random_surname(top_40=t, raw=True), calls)
+        batch = time_per_call(lambda t=top_40: sampler.get_random_name_columns(n, top_40=t), 1) / n
+        rebuild = time_per_call(lambda s=source: _rebuild_and_draw_surnames(s), 200)
+        rows.append([label, f'{len(source):,}', f'{rebuild:,.0f}', f'{scalar:,.0f}', f'{batch:,.0f}'])
+    print_table('Surname-pair throughput', ['Table', 'Entries', 'rebuild ns/pair', 'get_random_surname ns/pair', 'columns ns/row'], rows)
+
+
+def _rebuild_and_draw_middle(middle_names_data: dict) -> str:
+    """Reference implementation that converts every percentage on each draw."""
+    if random.random() >= middle_names_data['percentage_with_second'] / 100:
+        return ''
+    names = [entry['name'] for entry in middle_names_data['most_common']]
+    weights = [float(entry['percentage']) for entry in middle_names_data['most_common']]
+    return random.choices(names, weights=weights, k=1)[0]
+
+
+def bench_middle_names(calls: int = 100_000, n: int = 1_000_000, size: int = 2_000) -> None:
+    """Middle-name throughput: scalar mask and draw, and the vectorized Bernoulli mask in the batch path."""
+    middle_names_data = synthetic_middle_names_data(size)
+    with tempfile.TemporaryDirectory() as directory:
+        middle_names_path = Path(directory) / 'middle_names.json'
+        middle_names_path.write_text(json.dumps(middle_names_data), encoding='utf-8')
+        sampler = BrazilianNameSampler(synthetic_name_data(1_000), middle_names_path)
+
+    def scalar_middle() -> str:
+        return sampler._get_random_middle_name() if sampler._should_add_middle_name() else ''
+
+    rebuild = time_per_call(lambda: _rebuild_and_draw_middle(middle_names_data), 2_000)
+    scalar = time_per_call(scalar_middle, calls)
+    batch = time_per_call(lambda: sampler.get_random_middle_names(n), 1) / n
+    without = time_per_call(lambda: sampler.get_random_name_columns(n, always_middle=False), 1) / n
+    always = time_per_call(lambda: sampler.get_random_name_columns(n, always_middle=True), 1) / n
+    rows = [
+        ['rebuild + mask (loop)', f'{rebuild:,.0f}', f'{1e9 / rebuild:,.0f}'],
+        ['compiled mask + draw (loop)', f'{scalar:,.0f}', f'{1e9 / scalar:,.0f}'],
+        [f'get_random_middle_names({n:,})', f'{batch:,.0f}', f'{1e9 / batch:,.0f}'],
+        [f'name columns, {middle_names_data["percentage_with_second"]:.0f}% masked', f'{without:,.0f}', f'{1e9 / without:,.0f}'],
+        ['name columns, always_middle', f'{always:,.0f}', f'{1e9 / always:,.0f}'],
+    ]
+    print_table(f'Middle-name throughput ({size:,} names)', ['Path', 'ns/row', 'rows/s'], rows)
+
+
+def bench_columnar_memory(n: int = 2_000_000) -> None:
+    """Peak traced memory of dictionary-encoded columns vs a list of name strings."""
+    sampler = BrazilianNameSampler(synthetic_name_data(10_000, surname_count=16_000))
+    rows = []
+    for label, func in [
+        ('get_random_names', lambda: sampler.get_random_names(n)),
+        ('get_random_name_columns', lambda: sampler.get_random_name_columns(n)),
+    ]:
+        tracemalloc.start()
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del result
+        rows.append([label, f'{peak / 2**20:,.1f}', f'{peak / n:,.1f}'])
+    print_table(f'Peak memory for {n:,} names', ['Path', 'peak MiB', 'bytes/name'], rows)
+
+
+def _period_footprint(vocabulary_size: int, periods: int) -> None:
+    """Child-process body: print RSS growth and time to construct a sampler and draw from ``periods`` periods."""
+    data = synthetic_name_data(vocabulary_size)
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    sampler = BrazilianNameSampler(data)
+    for period in list(TimePeriod)[:periods]:
+        sampler.get_random_name(period, include_surname=False)
+    elapsed = time.perf_counter() - start
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({'seconds': elapsed, 'rss_kib': after - before}))
+
+
+def bench_period_footprint(vocabulary_size: int = 50_000) -> None:
+    """RSS and construction time when a process uses one time period vs all of them.
+
+    Each case runs in a fresh interpreter so the peak RSS of one does not hide the other.
+    """
+    rows = []
+    for periods in (1, len(TimePeriod)):
+        code = f'from benchmarks.bench_names import _period_footprint; _period_footprint({vocabulary_size}, {periods})'
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+        result = json.loads(output)
+        rows.append([f'{periods}', f'{result["seconds"] * 1000:,.0f}', f'{result["rss_kib"] / 1024:,.1f}'])
+    print_table(f'Construction + first draw ({vocabulary_size:,} names per period)', ['Periods used', 'ms', 'RSS growth MiB'], rows)
+
+
+def main() -> None:
+    bench_first_name_scaling()
+    bench_batch_names()
+    bench_surnames()
+    bench_middle_names()
+    bench_columnar_memory()
+    bench_period_footprint()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""Benchmarks for phone number generation.
+
+Usage:
+    python -m benchmarks.bench_phones
+"""
+
+import json
+import random
+
+from benchmarks.bench_locations import POPULATION_DATA
+from benchmarks.common import print_table, synthetic_name_data, time_per_call
+from src.br_location_class import BrazilianLocationSampler
+from src.utils.phone import random_phone
+
+
+def _per_digit_phone(ddd: int) -> str:
+    """Reference implementation that draws every digit with random.randint."""
+    digits = '9' + str(random.randint(6, 9)) + ''.join(str(random.randint(0, 9)) for _ in range(7))
+    return f'({ddd}) {digits[:5]}-{digits[5:]}'
+
+
+def bench_phones(n: int = 10_000_000) -> None:
+    """Phone numbers per second: per-digit loop, scalar generator, batch numbers and batch strings."""
+    with POPULATION_DATA.open(encoding='utf-8') as file:
+        sampler = BrazilianLocationSampler({**json.load(file), **synthetic_name_data(100)})
+    cities = sampler.get_random_locations(n).city
+
+    per_digit = time_per_call(lambda: _per_digit_phone(11), 100_000)
+    scalar = time_per_call(lambda: random_phone(11), 100_000)
+    batch = time_per_call(lambda: sampler.get_random_phones(cities), 1) / n
+    phones = sampler.get_random_phones(cities[:1_000_000])
+    rendered = time_per_call(phones.to_list, 1) / len(phones)
+    rows = [
+        ['per-digit randint (loop)', f'{per_digit:,.0f}', f'{1e9 / per_digit:,.0f}'],
+        ['random_phone (loop)', f'{scalar:,.0f}', f'{1e9 / scalar:,.0f}'],
+        [f'get_random_phones({n:,})', f'{batch:,.1f}', f'{1e9 / batch:,.0f}'],
+        ['PhoneColumns.to_list', f'{rendered:,.1f}', f'{1e9 / rendered:,.0f}'],
+    ]
+    print_table('Phone number throughput', ['Path', 'ns/number', 'numbers/s'], rows)
+
+
+def main() -> None:
+    bench_phones()
+
+
+if __name__ == '__main__':
+    main()
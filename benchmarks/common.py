@@ -0,0 +1,144 @@
+"""Shared helpers for the benchmark scripts."""
+
+import builtins
+import io
+import random
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from rich.console import Console
+from rich.table import Table
+
+from src.br_name_class import BrazilianNameSampler, TimePeriod
+
+console = Console()
+
+STATE_ABBRS = (
+    'AC', 'AL', 'AM', 'AP', 'BA', 'CE', 'DF', 'ES', 'GO', 'MA', 'MG', 'MS', 'MT', 'PA',
+    'PB', 'PE', 'PI', 'PR', 'RJ', 'RN', 'RO', 'RR', 'RS', 'SC', 'SE', 'SP', 'TO',
+)  # fmt: skip
+
+
+def synthetic_name_data(vocabulary_size: int, surname_count: int = 1000, seed: int = 0) -> dict[str, Any]:
+    """Build a name dataset with the same structure as the real JSON file.
+
+    Args:
+        vocabulary_size: Number of first names per time period
+        surname_count: Number of surnames
+        seed: Seed for the generated weights
+
+    Returns:
+        Dictionary with 'common_names_percentage' and 'surnames' keys
+    """
+    rng = random.Random(seed)
+
+    def entries(prefix: str, size: int) -> dict[str, dict[str, float]]:
+        return {f'{prefix}{i}': {'percentage': rng.random()} for i in range(size)}
+
+    # The most common real surnames carry the prefix rules, so they head the synthetic list with about a quarter of the mass
+    head_weight = surname_count * 0.05
+    surnames = {surname: {'percentage': head_weight / (rank + 1)} for rank, surname in enumerate(BrazilianNameSampler.SURNAME_PREFIXES)}
+    surnames.update(entries('SOBRENOME', surname_count - len(surnames)))
+    surnames['top_40'] = dict(list(surnames.items())[:40])
+    return {
+        'common_names_percentage': {
+            period.value: {'names': entries('NOME', vocabulary_size), 'total': vocabulary_size} for period in TimePeriod
+        },
+        'surnames': surnames,
+    }
+
+
+def synthetic_middle_names_data(size: int, percentage_with_second: float = 35.0, seed: int = 0) -> dict[str, Any]:
+    """Build a middle-names dataset with the same structure as the real JSON file.
+
+    Args:
+        size: Number of middle names in 'most_common'
+        percentage_with_second: Share of people with a middle name, in percent
+        seed: Seed for the generated weights
+
+    Returns:
+        Dictionary with the keys expected by BrazilianNameSampler
+    """
+    rng = random.Random(seed)
+    counts = [rng.randint(1, 10_000) for _ in range(size)]
+    total = sum(counts)
+    return {
+        'total_people': round(total * 100 / percentage_with_second),
+        'total_with_second_names': total,
+        'percentage_with_second': percentage_with_second,
+        'most_common': [{'name': f'MEIO{i}', 'count': count, 'percentage': f'{count * 100 / total:.4f}'} for i, count in enumerate(counts)],
+    }
+
+
+def synthetic_location_data(city_count: int = 5_570, seed: int = 0) -> dict[str, Any]:
+    """Build a population dataset with states and cities, plus synthetic name data.
+
+    Args:
+        city_count: Number of cities, spread over the 27 states
+        seed: Seed for the generated populations
+
+    Returns:
+        Dictionary with the keys expected by BrazilianLocationSampler
+    """
+    rng = random.Random(seed)
+    populations = [int(rng.paretovariate(1.2) * 5_000) for _ in range(city_count)]
+    states = {f'Estado {abbr}': {'state_abbr': abbr, 'state_population': 0} for abbr in STATE_ABBRS}
+    cities = {}
+    for i, population in enumerate(populations):
+        abbr = STATE_ABBRS[i % len(STATE_ABBRS)]
+        states[f'Estado {abbr}']['state_population'] += population
+        first = 10_000_000 + i * 1_000
+        cities[f'Cidade {i}_{abbr}'] = {
+            'city_name': f'Cidade {i}',
+            'city_uf': abbr,
+            'city_population': population,
+            'cep_starts': f'{first:08d}'[:5] + '-' + f'{first:08d}'[5:],
+            'cep_ends': f'{first + 999:08d}'[:5] + '-' + f'{first + 999:08d}'[5:],
+        }
+    total = sum(populations)
+    for state in states.values():
+        state['population_percentage'] = state['state_population'] * 100 / total
+    for city in cities.values():
+        state_population = states[f'Estado {city["city_uf"]}']['state_population']
+        city['population_percentage_state'] = city['city_population'] * 100 / state_population
+    return {**synthetic_name_data(1_000), 'states': states, 'cities': cities}
+
+
+@contextmanager
+def count_file_opens() -> Iterator[list[str]]:
+    """Record the path of every file opened through ``open``/``Path.open`` inside the block."""
+    opened: list[str] = []
+    original_builtin, original_io = builtins.open, io.open
+
+    def tracking_open(file: Any, *args: Any, **kwargs: Any) -> Any:
+        opened.append(str(file))
+        return original_io(file, *args, **kwargs)
+
+    builtins.open = io.open = tracking_open
+    try:
+        yield opened
+    finally:
+        builtins.open, io.open = original_builtin, original_io
+
+
+def time_per_call(func: Callable[[], Any], calls: int, repeat: int = 3) -> float:
+    """Return the best per-call time in nanoseconds over several repetitions."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(calls):
+            func()
+        best = min(best, (time.perf_counter_ns() - start) / calls)
+    return best
+
+
+def print_table(title: str, columns: list[str], rows: list[list[Any]]) -> None:
+    """Print benchmark results as a rich table."""
+    table = Table(title=title)
+    for column in columns:
+        table.add_column(column, justify='right')
+    for row in rows:
+        table.add_row(*(str(value) for value in row))
+    console.print(table)
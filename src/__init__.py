@@ -8,14 +8,16 @@ Classes:
     TimePeriod: Enum for different historical time periods
     BrazilianNameSampler: Generator for Brazilian names
     BrazilianLocationSampler: Generator for Brazilian locations
+    BrazilianAddressSampler: Generator for street-level Brazilian addresses
 
 The package requires JSON files containing population data and name statistics.
 """
 
+from src.address_sampler import BrazilianAddressSampler
 from src.br_location_class import BrazilianLocationSampler
 from src.br_name_class import BrazilianNameSampler, TimePeriod
 from src.cli import app, main
 
-__all__ = ['TimePeriod', 'BrazilianNameSampler', 'BrazilianLocationSampler', 'app', 'main']
+__all__ = ['TimePeriod', 'BrazilianNameSampler', 'BrazilianLocationSampler', 'BrazilianAddressSampler', 'app', 'main']
 
 __version__ = '1.0.0'
@@ -0,0 +1,389 @@
+"""
+Street-level Brazilian addresses.
+
+An address adds a logradouro (street type and name), a number, an optional complement and a
+bairro (neighborhood) to a sampled city and CEP. Streets and neighborhoods are integer IDs into
+precompiled vocabularies and strings are only joined by ``AddressColumns.to_list``.
+
+Without street data, the street is derived from the CEP and the neighborhood from its 5-digit
+sector, so every draw of a CEP gets the same street and nearby CEPs share a bairro. With a
+``StreetIndex`` compiled from the cepaberto dumps fetched by ``download_state_data.py``, cities
+covered by the dumps draw real (CEP, logradouro, bairro) records instead.
+"""
+
+import csv
+import io
+import random
+import zipfile
+from bisect import bisect_right
+from collections.abc import Iterable
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from src.alias_table import DEFAULT_RNG, AliasTable
+from src.br_location_class import BrazilianLocationSampler, LocationColumns, format_cep
+from src.cep_ranges import CepIndex
+from src.location_filter import LocationFilter
+from src.population_index import PopulationIndex
+
+# Street types and their approximate share of logradouros
+STREET_TYPES = (
+    ('Rua', 0.72),
+    ('Avenida', 0.12),
+    ('Travessa', 0.05),
+    ('Estrada', 0.03),
+    ('Alameda', 0.02),
+    ('Praça', 0.02),
+    ('Rodovia', 0.01),
+    ('Viela', 0.01),
+    ('Largo', 0.01),
+    ('Beco', 0.01),
+)
+
+STREET_NAMES = (
+    '7 de Setembro', '15 de Novembro', '13 de Maio', '1º de Maio', '21 de Abril', 'Tiradentes', 'Santos Dumont',
+    'Dom Pedro II', 'Duque de Caxias', 'Marechal Deodoro', 'Floriano Peixoto', 'Rui Barbosa', 'Getúlio Vargas',
+    'Juscelino Kubitschek', 'Castro Alves', 'José de Alencar', 'Machado de Assis', 'Carlos Gomes', 'Barão do Rio Branco',
+    'Princesa Isabel', 'Presidente Vargas', 'Benjamin Constant', 'Osvaldo Cruz', 'Padre Anchieta', 'São João',
+    'São José', 'São Pedro', 'São Paulo', 'Santa Luzia', 'Santo Antônio', 'Nossa Senhora Aparecida', 'das Flores',
+    'das Palmeiras', 'dos Ipês', 'das Acácias', 'das Mangueiras', 'dos Coqueiros', 'da Paz', 'da Liberdade',
+    'da Independência', 'da República', 'do Comércio', 'da Matriz', 'da Igreja', 'do Sol', 'Boa Vista', 'Bela Vista',
+    'Amazonas', 'Bahia', 'Paraná', 'Goiás', 'Minas Gerais', 'Rio Branco', 'Brasil', 'Tocantins', 'Coronel Ribeiro',
+    'Capitão Souza', 'Professor Oliveira', 'Doutor Almeida', 'Major Lima', 'Vereador Pereira', 'Prefeito Santos',
+)  # fmt: skip
+
+NEIGHBORHOODS = (
+    ('Centro', 6.0),
+    ('Vila Nova', 1.0), ('Vila São José', 1.0), ('Vila Operária', 1.0), ('Vila Esperança', 1.0), ('Jardim América', 1.0),
+    ('Jardim das Flores', 1.0), ('Jardim Primavera', 1.0), ('Jardim Europa', 1.0), ('Jardim Paraíso', 1.0),
+    ('Parque Industrial', 1.0), ('Parque São Jorge', 1.0), ('Parque das Nações', 1.0), ('Conjunto Habitacional', 1.0),
+    ('Bairro Alto', 1.0), ('Boa Vista', 1.0), ('Bela Vista', 1.0), ('Santa Cruz', 1.0), ('Santa Rita', 1.0),
+    ('Santo Antônio', 1.0), ('São Francisco', 1.0), ('São Cristóvão', 1.0), ('Cidade Nova', 1.0), ('Nova Esperança', 1.0),
+    ('Planalto', 1.0), ('Alvorada', 1.0), ('Aeroporto', 1.0), ('Industrial', 1.0), ('Liberdade', 1.0), ('Primavera', 1.0),
+)  # fmt: skip
+
+# (template, weight, low, high): the complement number is drawn uniformly from [low, high)
+COMPLEMENTS = (
+    ('', 0.55, 0, 1),
+    ('Apto {}', 0.25, 11, 1_505),
+    ('Casa {}', 0.08, 1, 10),
+    ('Bloco {}', 0.03, 1, 13),
+    ('Sala {}', 0.04, 1, 1_210),
+    ('Loja {}', 0.02, 1, 20),
+    ('Fundos', 0.03, 0, 1),
+)
+
+# Share of addresses without a house number (rendered "S/N"), and the log-normal of the others
+NO_NUMBER_SHARE = 0.03
+NUMBER_MU, NUMBER_SIGMA = 5.3, 1.1
+MAX_NUMBER = 99_999
+
+# Knuth multiplicative hashes mapping a CEP, or its 5-digit sector, to a uniform in [0, 1)
+_STREET_HASH, _SECTOR_HASH = 2_654_435_761, 2_246_822_519
+
+
+def _synthetic_streets() -> tuple[tuple[str, ...], np.ndarray]:
+    """Every street type and name combination with its weight."""
+    streets = tuple(f'{street_type} {name}' for street_type, _ in STREET_TYPES for name in STREET_NAMES)
+    weights = np.repeat([weight for _, weight in STREET_TYPES], len(STREET_NAMES))
+    return streets, weights
+
+
+def _hash_uniform(values: np.ndarray, multiplier: int) -> np.ndarray:
+    """Deterministic uniform in [0, 1) for each integer."""
+    return (np.asarray(values, dtype=np.uint64) * np.uint64(multiplier) % np.uint64(2**32)).astype(np.float64) / 2**32
+
+
+def _read_dump(path: Path) -> Iterable[list[str]]:
+    """Rows of a cepaberto CSV dump, or of every CSV inside a downloaded zip."""
+    if path.suffix.lower() != '.zip':
+        with path.open(encoding='utf-8', newline='') as file:
+            yield from csv.reader(file)
+        return
+    with zipfile.ZipFile(path) as archive:
+        for member in archive.namelist():
+            if member.lower().endswith('.csv'):
+                with archive.open(member) as raw:
+                    yield from csv.reader(io.TextIOWrapper(raw, encoding='utf-8', newline=''))
+
+
+class StreetIndex:
+    """(CEP, logradouro, bairro) records grouped by city ID of a population index.
+
+    ``offsets[i]:offsets[i + 1]`` select the records of city ``i`` in ``cep``, ``street`` and
+    ``neighborhood``; the last two index ``streets`` and ``neighborhoods``.
+    """
+
+    __slots__ = ('cep', 'city_keys', 'neighborhood', 'neighborhoods', 'offsets', 'street', 'streets')
+
+    def __init__(
+        self,
+        city_keys: tuple[str, ...],
+        offsets: np.ndarray,
+        cep: np.ndarray,
+        street: np.ndarray,
+        neighborhood: np.ndarray,
+        streets: tuple[str, ...],
+        neighborhoods: tuple[str, ...],
+    ):
+        self.city_keys = city_keys
+        self.offsets = offsets
+        self.cep = cep
+        self.street = street
+        self.neighborhood = neighborhood
+        self.streets = streets
+        self.neighborhoods = neighborhoods
+
+    def __len__(self) -> int:
+        """Number of records."""
+        return len(self.cep)
+
+    @classmethod
+    def compile(cls, dump_paths: Iterable[str | Path], index: PopulationIndex) -> 'StreetIndex':
+        """Compile cepaberto dumps, assigning each record to the city whose CEP ranges contain it.
+
+        Dump rows are ``cep, logradouro, complemento, bairro, ...`` without a header. Rows without
+        a logradouro (single-CEP towns) and CEPs outside every city range are skipped.
+
+        Args:
+            dump_paths: CSV files, or the zip files fetched by ``download_state_data.py``
+            index: Population index whose city IDs the records are grouped by
+        """
+        street_ids: dict[str, int] = {}
+        neighborhood_ids: dict[str, int] = {}
+        ceps, streets, neighborhoods = [], [], []
+        for path in dump_paths:
+            for row in _read_dump(Path(path)):
+                if len(row) < 4 or not row[0].isdigit() or not row[1].strip():
+                    continue
+                ceps.append(int(row[0]))
+                streets.append(street_ids.setdefault(row[1].strip(), len(street_ids)))
+                neighborhoods.append(neighborhood_ids.setdefault(row[3].strip(), len(neighborhood_ids)))
+
+        cep = np.array(ceps, dtype=np.int64)
+        city = CepIndex(index.cep_table).lookup_many(cep)
+        keep = np.flatnonzero(city >= 0)
+        order = keep[np.argsort(city[keep], kind='stable')]
+        counts = np.bincount(city[order], minlength=len(index))
+        return cls(
+            city_keys=index.city_keys,
+            offsets=np.concatenate(([0], np.cumsum(counts))).astype(np.int64),
+            cep=cep[order],
+            street=np.array(streets, dtype=np.int32)[order],
+            neighborhood=np.array(neighborhoods, dtype=np.int32)[order],
+            streets=tuple(street_ids),
+            neighborhoods=tuple(neighborhood_ids),
+        )
+
+    def save(self, path: str | Path) -> None:
+        """Write the index as an ``.npz`` file."""
+        np.savez_compressed(
+            path,
+            city_keys=np.array(self.city_keys, dtype=str),
+            offsets=self.offsets,
+            cep=self.cep,
+            street=self.street,
+            neighborhood=self.neighborhood,
+            streets=np.array(self.streets, dtype=str),
+            neighborhoods=np.array(self.neighborhoods, dtype=str),
+        )
+
+    @classmethod
+    def load(cls, path: str | Path, index: PopulationIndex | None = None) -> 'StreetIndex':
+        """Read an index written by ``save``.
+
+        Raises:
+            ValueError: If ``index`` is given and its cities differ from those the index was compiled for
+        """
+        with np.load(path) as arrays:
+            street_index = cls(
+                city_keys=tuple(arrays['city_keys'].tolist()),
+                offsets=arrays['offsets'],
+                cep=arrays['cep'],
+                street=arrays['street'],
+                neighborhood=arrays['neighborhood'],
+                streets=tuple(arrays['streets'].tolist()),
+                neighborhoods=tuple(arrays['neighborhoods'].tolist()),
+            )
+        if index is not None and street_index.city_keys != index.city_keys:
+            raise ValueError('Street index was compiled for different population data')
+        return street_index
+
+
+class AddressColumns(NamedTuple):
+    """Batch of addresses as integer columns over a ``LocationColumns`` batch.
+
+    ``street`` indexes ``streets``, ``neighborhood`` indexes ``neighborhoods`` and ``complement``
+    indexes ``COMPLEMENTS``; ``number`` is 0 for addresses without a number.
+    """
+
+    location: LocationColumns
+    street: np.ndarray
+    number: np.ndarray
+    complement: np.ndarray
+    complement_number: np.ndarray
+    neighborhood: np.ndarray
+    streets: tuple[str, ...]
+    neighborhoods: tuple[str, ...]
+
+    def __len__(self) -> int:
+        return len(self.street)
+
+    def to_list(self, cep_without_dash: bool = False) -> list[str]:
+        """Render each row as ``"Rua X, 123, Apto 45 - Bairro, City - UF, 01234-567"``."""
+        location = self.location
+        numbers = np.where(self.number > 0, self.number.astype(str), 'S/N').tolist()
+        complements = np.full(len(self), '', dtype=object)
+        for kind, (template, _, _, high) in enumerate(COMPLEMENTS):
+            rows = self.complement == kind
+            if template and rows.any():
+                prefix = template.replace('{}', '')
+                complements[rows] = [f', {prefix}{value}' if high > 1 else f', {prefix}' for value in self.complement_number[rows].tolist()]
+
+        states = location.state.tolist()
+        cities = location.city.tolist()
+        # City labels are built once per distinct city
+        labels = {}
+        ceps = location.format_ceps(not cep_without_dash)
+        streets, neighborhoods = self.streets, self.neighborhoods
+        rows = []
+        for street, number, complement, neighborhood, city, state, cep in zip(
+            self.street.tolist(), numbers, complements.tolist(), self.neighborhood.tolist(), cities, states, ceps, strict=True
+        ):
+            label = labels.get(city)
+            if label is None:
+                label = labels[city] = f'{location.city_names[city]} - {location.state_abbrs[state]}'
+            tail = f', {cep}' if cep else ''
+            rows.append(f'{streets[street]}, {number}{complement} - {neighborhoods[neighborhood]}, {label}{tail}')
+        return rows
+
+
+class BrazilianAddressSampler:
+    """Street-level addresses on top of a ``BrazilianLocationSampler``."""
+
+    def __init__(self, location_sampler: BrazilianLocationSampler, street_index: StreetIndex | str | Path | None = None):
+        """Compile the vocabularies.
+
+        Args:
+            location_sampler: Sampler drawing the cities and CEPs
+            street_index: Optional compiled ``StreetIndex``, or the path of one saved with ``StreetIndex.save``
+
+        Raises:
+            ValueError: If the street index was compiled for different population data
+        """
+        self.location_sampler = location_sampler
+        if isinstance(street_index, str | Path):
+            street_index = StreetIndex.load(street_index, location_sampler.index)
+        elif street_index is not None and street_index.city_keys != location_sampler.index.city_keys:
+            raise ValueError('Street index was compiled for different population data')
+        self.street_index = street_index
+
+        # Synthetic vocabularies come first; street index IDs are shifted past them
+        synthetic_streets, street_weights = _synthetic_streets()
+        self._synthetic_street_count = len(synthetic_streets)
+        self._synthetic_neighborhood_count = len(NEIGHBORHOODS)
+        self.streets = synthetic_streets + (street_index.streets if street_index else ())
+        self.neighborhoods = tuple(name for name, _ in NEIGHBORHOODS) + (street_index.neighborhoods if street_index else ())
+        self._street_cumulative = np.cumsum(street_weights / street_weights.sum())
+        neighborhood_weights = np.array([weight for _, weight in NEIGHBORHOODS])
+        self._neighborhood_cumulative = np.cumsum(neighborhood_weights / neighborhood_weights.sum())
+        self._street_cumulative_list = self._street_cumulative.tolist()
+        self._neighborhood_cumulative_list = self._neighborhood_cumulative.tolist()
+
+        self._complement_table = AliasTable([weight for _, weight, _, _ in COMPLEMENTS])
+        self._complement_low = np.array([low for _, _, low, _ in COMPLEMENTS])
+        self._complement_high = np.array([high for _, _, _, high in COMPLEMENTS])
+        self._offsets_list = street_index.offsets.tolist() if street_index else None
+
+    def _synthetic_street_ids(self, ceps: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Street and neighborhood IDs derived from CEPs and their 5-digit sectors."""
+        ceps = np.maximum(np.asarray(ceps, dtype=np.int64), 0)
+        street = np.searchsorted(self._street_cumulative, _hash_uniform(ceps, _STREET_HASH), side='right')
+        neighborhood = np.searchsorted(self._neighborhood_cumulative, _hash_uniform(ceps // 1000, _SECTOR_HASH), side='right')
+        return (
+            np.minimum(street, self._synthetic_street_count - 1).astype(np.int32),
+            np.minimum(neighborhood, self._synthetic_neighborhood_count - 1).astype(np.int32),
+        )
+
+    def get_random_addresses(
+        self, n: int, rng: np.random.Generator | None = None, location_filter: LocationFilter | None = None
+    ) -> AddressColumns:
+        """Generate ``n`` addresses as integer columns.
+
+        Args:
+            n: Number of addresses to generate
+            rng: NumPy generator to draw from, defaults to the shared generator
+            location_filter: Optional filter on the cities, as in ``get_random_locations``
+
+        Returns:
+            AddressColumns whose ``location`` holds the city, state and CEP of each row
+        """
+        rng = DEFAULT_RNG if rng is None else rng
+        location = self.location_sampler.get_random_locations(n, rng, location_filter)
+        street, neighborhood = self._synthetic_street_ids(location.cep)
+
+        street_index = self.street_index
+        if street_index is not None and len(street_index):
+            first, last = street_index.offsets[location.city], street_index.offsets[location.city + 1]
+            covered = np.flatnonzero(last > first)
+            if len(covered):
+                record = first[covered] + (rng.random(len(covered)) * (last - first)[covered]).astype(np.int64)
+                location.cep[covered] = street_index.cep[record]
+                street[covered] = street_index.street[record] + self._synthetic_street_count
+                neighborhood[covered] = street_index.neighborhood[record] + self._synthetic_neighborhood_count
+
+        complement = self._complement_table.sample(n, rng)
+        low, high = self._complement_low[complement], self._complement_high[complement]
+        number = np.minimum(rng.lognormal(NUMBER_MU, NUMBER_SIGMA, n).astype(np.int64) + 1, MAX_NUMBER)
+        number[rng.random(n) < NO_NUMBER_SHARE] = 0
+        return AddressColumns(
+            location=location,
+            street=street,
+            number=number,
+            complement=complement.astype(np.int8),
+            complement_number=low + (rng.random(n) * (high - low)).astype(np.int64),
+            neighborhood=neighborhood,
+            streets=self.streets,
+            neighborhoods=self.neighborhoods,
+        )
+
+    def get_random_address(self, city_name: str | None = None, state_abbr: str | None = None, cep_without_dash: bool = False) -> str:
+        """Generate one address, in the format of ``AddressColumns.to_list``.
+
+        Args:
+            city_name: City key, or display name together with ``state_abbr``; drawn by population if None
+            state_abbr: Optional state abbreviation; with no city, the city is drawn within this state
+            cep_without_dash: Format the CEP without dash
+
+        Raises:
+            ValueError: If the city has no CEP range
+        """
+        sampler = self.location_sampler
+        city = sampler.draw_city_id(state_abbr) if city_name is None else sampler.index.city_id(city_name, state_abbr)
+
+        offsets = self._offsets_list
+        if offsets is not None and offsets[city + 1] > offsets[city]:
+            record = random.randrange(offsets[city], offsets[city + 1])
+            cep = int(self.street_index.cep[record])
+            street = self.streets[self._synthetic_street_count + int(self.street_index.street[record])]
+            neighborhood = self.neighborhoods[self._synthetic_neighborhood_count + int(self.street_index.neighborhood[record])]
+        else:
+            cep = sampler.draw_cep(city)
+            street_u = (cep * _STREET_HASH % 2**32) / 2**32
+            sector_u = (cep // 1000 * _SECTOR_HASH % 2**32) / 2**32
+            street = self.streets[min(bisect_right(self._street_cumulative_list, street_u), self._synthetic_street_count - 1)]
+            neighborhood = self.neighborhoods[
+                min(bisect_right(self._neighborhood_cumulative_list, sector_u), self._synthetic_neighborhood_count - 1)
+            ]
+
+        number = (
+            'S/N' if random.random() < NO_NUMBER_SHARE else str(min(int(random.lognormvariate(NUMBER_MU, NUMBER_SIGMA)) + 1, MAX_NUMBER))
+        )
+        template, _, low, high = COMPLEMENTS[self._complement_table.draw()]
+        complement = f', {template.format(low + int(random.random() * (high - low)))}' if template else ''
+        return (
+            f'{street}, {number}{complement} - {neighborhood}, {sampler.city_names[city]} - {sampler.city_state_abbr(city)}, '
+            f'{format_cep(cep, not cep_without_dash)}'
+        )
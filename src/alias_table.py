@@ -0,0 +1,164 @@
+"""
+Walker/Vose alias tables for constant-time weighted sampling.
+
+An alias table is built once from a weight vector in O(n) and then answers each
+weighted draw with one uniform index plus one biased coin, independently of the
+number of items. Scalar draws use the standard ``random`` module, so they follow
+``random.seed``; batch draws use a NumPy ``Generator``.
+"""
+
+import random
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+
+from src.utils.util import DEFAULT_RNG
+
+
+class AliasTable:
+    """Vose alias table over a fixed weight vector.
+
+    Attributes:
+        items: Optional items matching the weights, returned by ``choice`` and ``choices``
+        prob: Acceptance probability of each column
+        alias: Alias index of each column
+    """
+
+    __slots__ = ('_alias_list', '_item_array', '_n', '_prob_list', 'alias', 'items', 'prob', 'weights')
+
+    def __init__(self, weights: Sequence[float] | np.ndarray, items: Sequence[Any] | None = None):
+        """Build the alias table.
+
+        Args:
+            weights: Non-negative weights, one per item; they do not need to sum to 1
+            items: Optional items to draw instead of indices
+
+        Raises:
+            ValueError: If weights are negative, not finite, sum to zero or do not match items
+        """
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.ndim != 1:
+            raise ValueError('Weights must be a one-dimensional sequence')
+        if items is not None and len(items) != len(weights):
+            raise ValueError(f'Got {len(items)} items for {len(weights)} weights')
+        if not np.isfinite(weights).all() or (weights < 0).any():
+            raise ValueError('Weights must be finite and non-negative')
+
+        n = len(weights)
+        total = weights.sum()
+        if n and total <= 0:
+            raise ValueError('Total of weights must be greater than zero')
+
+        self.items = tuple(items) if items is not None else None
+        self.weights = weights
+        self._item_array = None
+        self._n = n
+
+        prob = [1.0] * n
+        alias = list(range(n))
+        if n:
+            scaled = (weights * (n / total)).tolist()
+            small = [i for i, p in enumerate(scaled) if p < 1.0]
+            large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+            while small and large:
+                less = small.pop()
+                more = large[-1]
+                prob[less] = scaled[less]
+                alias[less] = more
+                scaled[more] = (scaled[more] + scaled[less]) - 1.0
+                if scaled[more] < 1.0:
+                    small.append(large.pop())
+
+            # Whatever remains is 1 up to floating point error
+            for i in small + large:
+                prob[i] = 1.0
+
+        self._prob_list = prob
+        self._alias_list = alias
+        self.prob = np.array(prob, dtype=np.float64)
+        self.alias = np.array(alias, dtype=np.intp)
+
+    @classmethod
+    def from_arrays(cls, weights: np.ndarray, prob: np.ndarray, alias: np.ndarray, items: Sequence[Any] | None = None) -> 'AliasTable':
+        """Rebuild a table from the arrays of a compiled one, skipping the O(n) construction.
+
+        Raises:
+            ValueError: If the arrays do not have matching lengths
+        """
+        if not len(weights) == len(prob) == len(alias):
+            raise ValueError(f'Got {len(prob)} probabilities and {len(alias)} aliases for {len(weights)} weights')
+        table = cls.__new__(cls)
+        table.items = tuple(items) if items is not None else None
+        table.weights = np.asarray(weights, dtype=np.float64)
+        table._item_array = None
+        table._n = len(weights)
+        table.prob = np.asarray(prob, dtype=np.float64)
+        table.alias = np.asarray(alias, dtype=np.intp)
+        table._prob_list = table.prob.tolist()
+        table._alias_list = table.alias.tolist()
+        return table
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def item_array(self) -> np.ndarray:
+        """Items as a NumPy object array, for indexing with the result of ``sample``."""
+        if self.items is None:
+            raise ValueError('Table was built without items')
+        if self._item_array is None:
+            self._item_array = np.empty(self._n, dtype=object)
+            self._item_array[:] = self.items
+        return self._item_array
+
+    @property
+    def probabilities(self) -> np.ndarray:
+        """Exact probability of each index implied by the table."""
+        implied = self.prob.copy()
+        np.add.at(implied, self.alias, 1.0 - self.prob)
+        return implied / self._n if self._n else implied
+
+    def draw(self) -> int:
+        """Draw a single index."""
+        if not self._n:
+            raise IndexError('Cannot draw from an empty table')
+        column = int(random.random() * self._n)
+        return column if random.random() < self._prob_list[column] else self._alias_list[column]
+
+    def choice(self) -> Any:
+        """Draw a single item (or index when the table has no items)."""
+        index = self.draw()
+        return index if self.items is None else self.items[index]
+
+    def draw_many(self, k: int) -> list[int]:
+        """Draw ``k`` indices with replacement using the scalar generator."""
+        draw = self.draw
+        return [draw() for _ in range(k)]
+
+    def choices(self, k: int) -> list[Any]:
+        """Draw ``k`` items with replacement using the scalar generator."""
+        indices = self.draw_many(k)
+        return indices if self.items is None else [self.items[index] for index in indices]
+
+    def sample(self, size: int | tuple[int, ...], rng: np.random.Generator | None = None) -> np.ndarray:
+        """Draw a batch of indices.
+
+        Args:
+            size: Number of indices to draw, or the shape of the result
+            rng: NumPy generator to use, defaults to ``DEFAULT_RNG``
+
+        Returns:
+            Integer array of drawn indices
+        """
+        if not self._n:
+            raise IndexError('Cannot draw from an empty table')
+        rng = DEFAULT_RNG if rng is None else rng
+        columns = rng.integers(0, self._n, size)
+        accept = rng.random(size) < self.prob[columns]
+        return np.where(accept, columns, self.alias[columns])
+
+    def sample_items(self, size: int | tuple[int, ...], rng: np.random.Generator | None = None) -> np.ndarray:
+        """Draw a batch of items as a NumPy object array."""
+        return self.item_array[self.sample(size, rng)]
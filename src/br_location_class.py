@@ -1,69 +1,251 @@
 import json
-import random
 from pathlib import Path
+from typing import NamedTuple
 
+import numpy as np
+
+from src.alias_table import DEFAULT_RNG, AliasTable
 from src.br_name_class import BrazilianNameSampler, TimePeriod
+from src.cep_ranges import CepIndex, parse_cep
+from src.location_filter import CacheInfo, FilteredTableCache, LocationFilter
+from src.population_index import PopulationIndex
+from src.utils.cpf import random_cpf_digits, render_cpfs
+from src.utils.phone import DEFAULT_MOBILE_SHARE, PhoneColumns, random_phone, random_phones
+from src.utils.util import render_digits
+from src.weighting import WeightingScenario, compile_scenario
+
+
+def format_cep(cep: int, with_dash: bool = True) -> str:
+    """Format an integer CEP as a string, with or without dash."""
+    cep_str = str(cep).zfill(8)
+    return f'{cep_str[:5]}-{cep_str[5:]}' if with_dash else cep_str
+
+
+def format_ceps(ceps: np.ndarray, with_dash: bool = True) -> list[str]:
+    """Format an array of integer CEPs; negative entries (no CEP) become empty strings."""
+    ceps = np.asarray(ceps, dtype=np.int64)
+    rendered = render_digits(np.maximum(ceps, 0), '#####-###' if with_dash else '########')
+    for row in np.flatnonzero(ceps < 0).tolist():
+        rendered[row] = ''
+    return rendered
+
+
+class LocationColumns(NamedTuple):
+    """Batch of locations as integer columns.
+
+    ``state`` indexes ``state_names``/``state_abbrs``/``state_cpf_regions``, ``city`` indexes
+    ``city_names`` and ``city_ibge_codes``, and ``cep`` holds the CEP as an integer, -1 for
+    cities without a CEP range.
+    """
+
+    state: np.ndarray
+    city: np.ndarray
+    cep: np.ndarray
+    state_names: tuple[str, ...]
+    state_abbrs: tuple[str, ...]
+    city_names: tuple[str, ...]
+    city_ibge_codes: np.ndarray | None = None
+    state_cpf_regions: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return len(self.city)
+
+    @property
+    def ibge_code(self) -> np.ndarray:
+        """7-digit IBGE code of each row, 0 for cities without one (and for CEP lookup misses)."""
+        if self.city_ibge_codes is None:
+            raise ValueError('Columns were built without IBGE codes')
+        return np.where(self.city >= 0, self.city_ibge_codes[np.maximum(self.city, 0)], 0)
+
+    @property
+    def cpf_region(self) -> np.ndarray:
+        """CPF fiscal region digit of each row's state, -1 where unknown (and for CEP lookup misses)."""
+        if self.state_cpf_regions is None:
+            raise ValueError('Columns were built without CPF fiscal regions')
+        return np.where(self.state >= 0, self.state_cpf_regions[np.maximum(self.state, 0)], -1).astype(np.int8)
+
+    def random_cpfs(self, formatted: bool = True, rng: np.random.Generator | None = None) -> list[str]:
+        """One random, valid CPF per row, issued in the fiscal region of the row's state.
+
+        Rows whose region is unknown get an unconstrained CPF. Digits are drawn from ``rng``,
+        defaulting to the shared generator like ``get_random_locations``.
+        """
+        return render_cpfs(random_cpf_digits(len(self), rng, self.cpf_region), formatted).astype(str).tolist()
+
+    def format_ceps(self, with_dash: bool = True) -> list[str]:
+        """Format the CEP column as strings."""
+        return format_ceps(self.cep, with_dash)
+
+    def to_list(self, include_cep: bool = True, cep_without_dash: bool = False) -> list[str]:
+        """Render each row like ``BrazilianLocationSampler.format_full_location``.
+
+        Rows without a city (CEP lookup misses) render as empty strings.
+        """
+        found = self.city >= 0
+        # Render each distinct (state, city) pair once, then index
+        keys, inverse = np.unique(self.state[found].astype(np.int64) * len(self.city_names) + self.city[found], return_inverse=True)
+        states, cities = np.divmod(keys, len(self.city_names))
+        labels = np.empty(len(keys), dtype=object)
+        labels[:] = [
+            f'{self.city_names[city]}, {self.state_names[state]} ({self.state_abbrs[state]})'
+            for state, city in zip(states.tolist(), cities.tolist(), strict=True)
+        ]
+        rows = np.full(len(self), '', dtype=object)
+        rows[found] = labels[inverse.ravel()]
+        if not include_cep:
+            return rows.tolist()
+        ceps = self.format_ceps(not cep_without_dash)
+        return [f'{row}, {cep}' if row else '' for row, cep in zip(rows.tolist(), ceps, strict=True)]
 
 
 class BrazilianLocationSampler:
     """Brazilian location sampling class for generating realistic location data."""
 
-    def __init__(self, json_file_path: str | Path, middle_names_path: str | Path | None = None):
+    def __init__(
+        self,
+        json_file_path: str | Path | dict,
+        middle_names_path: str | Path | None = None,
+        name_sampler: BrazilianNameSampler | None = None,
+        two_stage: bool = False,
+        cep_ranges_path: str | Path | None = None,
+        scenario: WeightingScenario | None = None,
+        scenario_cache_dir: str | Path | None = None,
+    ):
         """Initialize the sampler with population data from JSON files.
 
+        Either population layout is accepted: cities keyed by plain name with
+        ``cep_starts``/``cep_ends``, or keyed as ``"Name_UF"`` with ``city_name`` and
+        ``cep_range_begins``/``cep_range_ends``. Both are compiled into a ``PopulationIndex``.
+
         Args:
-            json_file_path: Path to main JSON file with population data
+            json_file_path: Path to main JSON file with population data, or pre-loaded data
             middle_names_path: Optional path to middle names JSON file
+            name_sampler: Optional name sampler to share; by default one is built from the
+                same data on first use and reused for every location
+            two_stage: If True, draw a state by ``population_percentage`` and then a city within
+                it; by default state and city come from one draw over all cities
+            cep_ranges_path: Optional br-city-codes style CSV whose ``postalCode_ranges`` replace
+                the CEP ranges of the cities it lists, matched by IBGE code
+            scenario: Optional reweighting of the cities; see ``set_scenario``
+            scenario_cache_dir: Optional directory where compiled scenarios are cached
 
         Raises:
             ValueError: If required data is missing or invalid
             FileNotFoundError: If JSON files cannot be found
         """
-        with Path(json_file_path).open(encoding='utf-8') as file:
-            self.data = json.load(file)
+        if isinstance(json_file_path, str | Path):
+            with Path(json_file_path).open(encoding='utf-8') as file:
+                self.data = json.load(file)
+        else:
+            self.data = json_file_path
 
         self.middle_names_path = middle_names_path
+        self._name_sampler = name_sampler
+        self.two_stage = two_stage
+        self.cep_ranges_path = cep_ranges_path
+        self.scenario = scenario
+        self.scenario_cache_dir = scenario_cache_dir
 
         # Ensure we have required data
         if 'common_names_percentage' not in self.data:
             raise ValueError("Missing 'common_names_percentage' data in JSON file")
 
+        self.index = PopulationIndex(self.data, cep_ranges_path)
+        self.state_names = self.index.state_names
+        self.state_abbrs = self.index.state_abbrs
+        self.city_names = self.index.city_names
+
         # Pre-calculate weights for more efficient sampling
         self._calculate_weights()
 
     def _calculate_weights(self) -> None:
-        """Pre-calculate weights for states and cities based on population percentages."""
-        # Calculate state weights
-        self.state_weights = []
-        self.state_names = []
-
-        for state_name, state_data in self.data['states'].items():
-            self.state_names.append(state_name)
-            self.state_weights.append(state_data['population_percentage'])
-
-        # Normalize state weights to sum to 1
-        total_weight = sum(self.state_weights)
-        self.state_weights = [w / total_weight for w in self.state_weights]
+        """Compile the state, per-state and nationwide city tables over integer IDs."""
+        index = self.index
+        base = index.national_city_weights()
+        if self.scenario is None:
+            self._state_table = AliasTable(index.state_weights)
+            within = index.state_city_weights()
+            # One table over all cities, so state and city come from a single draw
+            self._national_city_table = AliasTable(base)
+        else:
+            # Scenario weights drive both modes: states by their summed city weights, cities within them
+            self._national_city_table = compile_scenario(index, self.scenario, base, self.scenario_cache_dir)
+            within = self._national_city_table.weights
+            self._state_table = AliasTable(np.bincount(index.city_state, weights=within, minlength=len(index.state_abbrs)))
+
+        # One table per state, drawing positions into that state's city IDs
+        self._city_tables = {}
+        self._city_ids_by_state = {}
+        for state, state_abbr in enumerate(index.state_abbrs):
+            cities = index.state_cities(state)
+            if len(cities) and within[cities].sum() > 0:
+                self._city_tables[state_abbr] = AliasTable(within[cities])
+                self._city_ids_by_state[state_abbr] = cities
+
+        # Scalar paths index plain lists instead of NumPy arrays
+        self._city_state_list = index.city_state.tolist()
+        self._city_ids_by_state_list = {state_abbr: cities.tolist() for state_abbr, cities in self._city_ids_by_state.items()}
+        self._cep_table = index.cep_table
+        self._cep_index = None
+
+        # Filtered tables are compiled on first use of each filter
+        self._filtered_tables = FilteredTableCache(index, self._national_city_table.weights)
+
+    def set_scenario(self, scenario: WeightingScenario | None, cache_dir: str | Path | None = None) -> None:
+        """Reweight the cities, or restore the population weights with None.
+
+        Only the alias tables are recompiled; the population index is kept. Filtered tables
+        are rebuilt on their next use.
 
-        # Calculate city weights per state
-        self.city_weights_by_state = {}
-        self.city_names_by_state = {}
+        Args:
+            scenario: Reweighting to apply, e.g. ``WeightingScenario(population_bands=((None, 20_000, 10.0),))``
+            cache_dir: Optional directory where compiled scenarios are cached
 
-        for city_name, city_data in self.data['cities'].items():
-            state = city_data['city_uf']
+        Raises:
+            ValueError: If the scenario is invalid for the data
+        """
+        previous = self.scenario, self.scenario_cache_dir
+        self.scenario, self.scenario_cache_dir = scenario, cache_dir
+        try:
+            self._calculate_weights()
+        except ValueError:
+            # The scenario is compiled before any table is replaced, so the old tables are intact
+            self.scenario, self.scenario_cache_dir = previous
+            raise
+
+    @property
+    def name_sampler(self) -> BrazilianNameSampler:
+        """Name sampler shared by every location, built once on first use."""
+        if self._name_sampler is None:
+            self._name_sampler = BrazilianNameSampler(self.data, self.middle_names_path)
+        return self._name_sampler
+
+    def _draw_state_id(self) -> int:
+        """Draw a state ID with the sampler's weighting."""
+        if self.two_stage:
+            return self._state_table.draw()
+        return self._city_state_list[self._national_city_table.draw()]
+
+    def draw_city_id(self, state_abbr: str | None = None) -> int:
+        """Draw a city ID, nationwide or within one state, with the sampler's weighting.
+
+        City IDs index ``city_names`` and the arrays of ``index``.
 
-            if state not in self.city_weights_by_state:
-                self.city_weights_by_state[state] = []
-                self.city_names_by_state[state] = []
+        Raises:
+            ValueError: If no cities found for given state
+        """
+        if state_abbr is None:
+            if not self.two_stage:
+                return self._national_city_table.draw()
+            state_abbr = self.state_abbrs[self._state_table.draw()]
 
-            self.city_names_by_state[state].append(city_name)
-            self.city_weights_by_state[state].append(city_data['population_percentage_state'])
+        if state_abbr not in self._city_tables:
+            raise ValueError(f'No cities found for state: {state_abbr}')
+        return self._city_ids_by_state_list[state_abbr][self._city_tables[state_abbr].draw()]
 
-        # Normalize city weights within each state
-        for state in self.city_weights_by_state:
-            total = sum(self.city_weights_by_state[state])
-            if total > 0:
-                self.city_weights_by_state[state] = [w / total for w in self.city_weights_by_state[state]]
+    def city_state_abbr(self, city: int) -> str:
+        """State abbreviation of a city ID."""
+        return self.state_abbrs[self._city_state_list[city]]
 
     def get_state(self) -> tuple[str, str]:
         """Get a random state weighted by population percentage.
@@ -71,9 +253,8 @@ class BrazilianLocationSampler:
         Returns:
             Tuple of (state_name, state_abbreviation)
         """
-        state_name = random.choices(self.state_names, weights=self.state_weights, k=1)[0]
-        state_abbr = self.data['states'][state_name]['state_abbr']
-        return state_name, state_abbr
+        state = self._draw_state_id()
+        return self.state_names[state], self.state_abbrs[state]
 
     def get_city(self, state_abbr: str | None = None) -> tuple[str, str]:
         """Get a random city weighted by population percentage.
@@ -87,15 +268,28 @@ class BrazilianLocationSampler:
         Raises:
             ValueError: If no cities found for given state
         """
-        if state_abbr is None:
-            _, state_abbr = self.get_state()
+        city = self.draw_city_id(state_abbr)
+        return self.city_names[city], self.state_abbrs[self._city_state_list[city]]
 
-        if state_abbr not in self.city_weights_by_state:
-            raise ValueError(f'No cities found for state: {state_abbr}')
+    def get_filtered_city(self, location_filter: LocationFilter) -> tuple[str, str]:
+        """Get a random city among those matching a filter, weighted by population.
+
+        Args:
+            location_filter: Filter built with ``LocationFilter.create``, e.g. ``LocationFilter.create(regions='nordeste')``
+
+        Returns:
+            Tuple of (city_name, state_abbreviation)
 
-        city_name = random.choices(self.city_names_by_state[state_abbr], weights=self.city_weights_by_state[state_abbr], k=1)[0]
+        Raises:
+            ValueError: If the filter is invalid for the data or matches no city
+        """
+        filtered = self._filtered_tables.get(location_filter)
+        city = filtered.city_list[filtered.table.draw()]
+        return self.city_names[city], self.state_abbrs[self._city_state_list[city]]
 
-        return city_name, state_abbr
+    def filter_cache_info(self) -> CacheInfo:
+        """Hit and miss counters of the compiled filter tables."""
+        return self._filtered_tables.cache_info()
 
     def get_state_and_city(self) -> tuple[str, str, str]:
         """Get a random state and city combination weighted by population percentage.
@@ -103,9 +297,9 @@ class BrazilianLocationSampler:
         Returns:
             Tuple of (state_name, state_abbreviation, city_name)
         """
-        state_name, state_abbr = self.get_state()
-        city_name, _ = self.get_city(state_abbr)
-        return state_name, state_abbr, city_name
+        city = self.draw_city_id()
+        state = self._city_state_list[city]
+        return self.state_names[state], self.state_abbrs[state], self.city_names[city]
 
     def _normalize_cep(self, cep: str) -> int:
         """Convert CEP string to integer by removing dash.
@@ -116,7 +310,7 @@ class BrazilianLocationSampler:
         Returns:
             Integer representation of CEP
         """
-        return int(cep.replace('-', ''))
+        return parse_cep(cep)
 
     def _format_cep(self, cep: int, with_dash: bool = True) -> str:
         """Format CEP integer back to string with optional dash.
@@ -128,34 +322,237 @@ class BrazilianLocationSampler:
         Returns:
             Formatted CEP string
         """
-        cep_str = str(cep).zfill(8)
-        return f'{cep_str[:5]}-{cep_str[5:]}' if with_dash else cep_str
+        return format_cep(cep, with_dash)
 
-    def _get_random_cep_for_city(self, city_name: str) -> int:
+    def draw_cep(self, city: int) -> int:
+        """Draw a CEP of a city ID, uniform over the union of its ranges.
+
+        Raises:
+            ValueError: If the city has no CEP range
+        """
+        try:
+            return self._cep_table.draw(city)
+        except ValueError as err:
+            raise ValueError(f'No CEP range for city: {self.index.city_keys[city]}') from err
+
+    def _get_random_cep_for_city(self, city_name: str, state_abbr: str | None = None) -> int:
         """Generate random CEP within city's range(s).
 
         Args:
-            city_name: Name of city to generate CEP for
+            city_name: Key of the city in the data, or its display name together with ``state_abbr``
+            state_abbr: Optional state abbreviation, needed for display names shared by several states
 
         Returns:
             Random valid CEP for given city
+
+        Raises:
+            ValueError: If the city has no CEP range
         """
-        city_data = self.data['cities'][city_name]
-
-        # Handle special cases with two ranges
-        if city_name in ['São Paulo', 'Nova Iguaçu', 'Brasília']:
-            # Randomly choose between the two ranges
-            if random.random() < 0.5:
-                start = self._normalize_cep(city_data['cep_starts'])
-                end = self._normalize_cep(city_data['cep_ends'])
-            else:
-                start = self._normalize_cep(city_data['cep_starts_two'])
-                end = self._normalize_cep(city_data['cep_ends_two'])
+        return self.draw_cep(self.index.city_id(city_name, state_abbr))
+
+    def get_random_locations(
+        self, n: int, rng: np.random.Generator | None = None, location_filter: LocationFilter | None = None
+    ) -> LocationColumns:
+        """Get ``n`` random locations as integer columns in one vectorized pass.
+
+        Cities are drawn with the same weighting as ``get_state_and_city``; each CEP is a
+        uniform integer over the union of its city's precompiled ranges. No strings are built
+        until ``LocationColumns.to_list`` or ``format_ceps`` is called.
+
+        Args:
+            n: Number of locations to generate
+            rng: NumPy generator to draw from, defaults to the shared generator
+            location_filter: Optional filter; cities are then drawn among the matching ones with
+                their nationwide weights renormalized
+
+        Returns:
+            LocationColumns with state index, city index and integer CEP per row
+
+        Raises:
+            ValueError: If a drawn state has no cities, or the filter matches none
+        """
+        rng = DEFAULT_RNG if rng is None else rng
+        if location_filter is not None:
+            filtered = self._filtered_tables.get(location_filter)
+            city = filtered.cities[filtered.table.sample(n, rng)]
+        elif self.two_stage:
+            city = self._sample_cities_two_stage(n, rng)
         else:
-            start = self._normalize_cep(city_data['cep_starts'])
-            end = self._normalize_cep(city_data['cep_ends'])
+            city = self._national_city_table.sample(n, rng).astype(np.int32)
+
+        cep = self._cep_table.sample(city, rng).astype(np.int32)
+
+        return LocationColumns(
+            state=self.index.city_state[city],
+            city=city,
+            cep=cep,
+            state_names=self.state_names,
+            state_abbrs=self.state_abbrs,
+            city_names=self.city_names,
+            city_ibge_codes=self.index.city_ibge_code,
+            state_cpf_regions=self.index.state_cpf_regions,
+        )
+
+    def _sample_cities_two_stage(self, n: int, rng: np.random.Generator) -> np.ndarray:
+        """Draw states by population percentage, then cities within each drawn state."""
+        states = self._state_table.sample(n, rng)
+        city = np.empty(n, dtype=np.int32)
+        for state in np.unique(states).tolist():
+            state_abbr = self.state_abbrs[state]
+            if state_abbr not in self._city_tables:
+                raise ValueError(f'No cities found for state: {state_abbr}')
+            rows = states == state
+            city[rows] = self._city_ids_by_state[state_abbr][self._city_tables[state_abbr].sample(int(rows.sum()), rng)]
+        return city
+
+    @property
+    def cep_index(self) -> CepIndex:
+        """Reverse CEP to city index, built from the city CEP ranges on first use."""
+        if self._cep_index is None:
+            self._cep_index = CepIndex(self._cep_table)
+        return self._cep_index
+
+    def lookup_cep(self, cep: int | str) -> tuple[str, str, str] | None:
+        """Find the city that owns a CEP.
+
+        Args:
+            cep: CEP as an integer or a string with or without dash
+
+        Returns:
+            Tuple of (state_name, state_abbreviation, city_name), or None if no city range contains it
+
+        Raises:
+            ValueError: If a CEP string is malformed
+        """
+        city = self.cep_index.lookup(parse_cep(cep) if isinstance(cep, str) else cep)
+        if city < 0:
+            return None
+        state = self._city_state_list[city]
+        return self.state_names[state], self.state_abbrs[state], self.city_names[city]
+
+    def lookup_ceps(self, ceps: np.ndarray) -> LocationColumns:
+        """Resolve a batch of integer CEPs to cities.
+
+        Args:
+            ceps: Integer CEPs
+
+        Returns:
+            LocationColumns for the input CEPs; ``city`` and ``state`` are -1 where no city range contains the CEP
+        """
+        ceps = np.asarray(ceps, dtype=np.int64)
+        city = self.cep_index.lookup_many(ceps)
+        state = np.where(city >= 0, self.index.city_state[np.maximum(city, 0)], -1).astype(np.int32)
+        return LocationColumns(
+            state=state,
+            city=city,
+            cep=ceps.astype(np.int32),
+            state_names=self.state_names,
+            state_abbrs=self.state_abbrs,
+            city_names=self.city_names,
+            city_ibge_codes=self.index.city_ibge_code,
+            state_cpf_regions=self.index.state_cpf_regions,
+        )
+
+    def validate_cep_for_city(self, cep: int | str, city_name: str, state_abbr: str | None = None) -> bool:
+        """Check that a CEP falls in one of the ranges of a city.
+
+        Args:
+            cep: CEP as an integer or a string with or without dash
+            city_name: Key of the city in the data, or its display name together with ``state_abbr``
+            state_abbr: Optional state abbreviation, needed for display names shared by several states
+
+        Raises:
+            ValueError: If a CEP string is malformed
+        """
+        try:
+            city = self.index.city_id(city_name, state_abbr)
+        except KeyError:
+            return False
+        return self.cep_index.lookup(parse_cep(cep) if isinstance(cep, str) else cep) == city
+
+    def validate_ceps_for_cities(self, ceps: np.ndarray, cities: np.ndarray | list[str]) -> np.ndarray:
+        """Check a batch of CEPs against the cities they are claimed to belong to.
+
+        Args:
+            ceps: Integer CEPs
+            cities: City IDs, or city keys as used in the data
+
+        Returns:
+            Boolean array, True where the CEP belongs to the claimed city
+        """
+        cities = np.asarray(cities)
+        if cities.dtype.kind not in 'iu':
+            # Unknown keys map to -2, which never matches, not even a CEP outside every range
+            city_ids = self.index.city_ids
+            cities = np.array([city_ids.get(city_key, -2) for city_key in cities.tolist()], dtype=np.int32)
+        return self.cep_index.lookup_many(ceps) == cities
+
+    def get_ibge_code(self, city_name: str, state_abbr: str | None = None) -> str:
+        """Get the 7-digit IBGE municipality code of a city.
+
+        Args:
+            city_name: City key, or display name together with ``state_abbr``
+            state_abbr: Optional state abbreviation, needed for display names shared by several states
+
+        Raises:
+            ValueError: If the data has no IBGE code for the city
+        """
+        city = self.index.city_id(city_name, state_abbr)
+        code = int(self.index.city_ibge_code[city])
+        if not code:
+            raise ValueError(f'No IBGE code for city: {self.index.city_keys[city]}')
+        return str(code)
+
+    def validate_ibge_codes(self, codes: np.ndarray) -> np.ndarray:
+        """Check a batch of IBGE codes: True where the code belongs to a city in the data.
+
+        Codes in the index are check-digit verified when it is compiled, so membership is enough;
+        use ``src.utils.muni.validate_munis`` to check codes against the check digit alone.
+        """
+        known = self.index.city_ibge_code
+        return np.isin(np.asarray(codes, dtype=np.int64), known[known > 0])
+
+    def get_random_phone(
+        self, city_name: str | None = None, state_abbr: str | None = None, mobile: bool = True, style: str = 'formatted'
+    ) -> str:
+        """Get a random phone number whose area code (DDD) matches a city.
 
-        return random.randint(start, end)
+        Args:
+            city_name: City key, or display name together with ``state_abbr``; a random city is drawn if None
+            state_abbr: Optional state abbreviation; with no city, the city is drawn within this state
+            mobile: True for a mobile number, False for a landline
+            style: 'formatted' for (11) 91234-5678, 'e164' for +5511912345678 or 'digits'
+
+        Raises:
+            ValueError: If the city has no DDD
+        """
+        city = self.draw_city_id(state_abbr) if city_name is None else self.index.city_id(city_name, state_abbr)
+        ddd = int(self.index.city_ddd[city])
+        if not ddd:
+            raise ValueError(f'No DDD for city: {self.index.city_keys[city]}')
+        return random_phone(ddd, mobile=mobile, style=style)
+
+    def get_random_phones(
+        self, cities: np.ndarray, mobile_share: float = DEFAULT_MOBILE_SHARE, rng: np.random.Generator | None = None
+    ) -> PhoneColumns:
+        """Get one phone number per city ID, with the area code of that city.
+
+        Args:
+            cities: City IDs, e.g. the ``city`` column of ``get_random_locations``
+            mobile_share: Probability that each number is mobile
+            rng: NumPy generator to draw from, defaults to the shared generator
+
+        Returns:
+            PhoneColumns aligned with ``cities``
+
+        Raises:
+            ValueError: If a city has no DDD
+        """
+        ddds = self.index.city_ddd[np.asarray(cities)]
+        missing = ddds == 0
+        if missing.any():
+            raise ValueError(f'No DDD for city: {self.index.city_keys[np.asarray(cities)[missing][0]]}')
+        return random_phones(ddds, mobile_share, rng)
 
     def format_full_location(
         self, city: str, state: str, state_abbr: str, include_cep: bool = True, cep_without_dash: bool = False, name: str | None = None
@@ -180,7 +577,7 @@ class BrazilianLocationSampler:
         parts = [base]
 
         if include_cep:
-            cep = self._get_random_cep_for_city(city)
+            cep = self._get_random_cep_for_city(city, state_abbr)
             formatted_cep = self._format_cep(cep, not cep_without_dash)
             parts.append(formatted_cep)
 
@@ -221,7 +618,7 @@ class BrazilianLocationSampler:
         Returns:
             Formatted location string according to specified options
         """
-        name_sampler = BrazilianNameSampler(self.data, self.middle_names_path)
+        name_sampler = self.name_sampler
 
         if only_middle:
             return name_sampler.get_random_name(raw=name_raw, only_middle=True)
@@ -230,8 +627,7 @@ class BrazilianLocationSampler:
             return name_sampler.get_random_surname(top_40, raw=name_raw)
 
         if only_cep:
-            cep = self._get_random_cep_for_city(self.get_city()[0])
-            return self._format_cep(cep, not cep_without_dash)
+            return self._format_cep(self.draw_cep(self.draw_city_id()), not cep_without_dash)
 
         if state_abbr_only:
             return self.get_state()[1]
@@ -242,8 +638,10 @@ class BrazilianLocationSampler:
         if city_only:
             return self.get_city()[0]
 
-        state_name, state_abbr, city_name = self.get_state_and_city()
+        city = self.draw_city_id()
+        state = self._city_state_list[city]
         name = name_sampler.get_random_name(
             time_period=time_period, raw=name_raw, include_surname=True, top_40=top_40, always_middle=always_middle, only_middle=only_middle
         )
-        return self.format_full_location(city_name, state_name, state_abbr, True, cep_without_dash, name)
+        cep = self._format_cep(self.draw_cep(city), not cep_without_dash)
+        return f'{self.city_names[city]}, {self.state_names[state]} ({self.state_abbrs[state]}), {cep}, {name}'
@@ -1,8 +1,13 @@
 import json
 import random
+from bisect import bisect
 from enum import Enum
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from src.alias_table import DEFAULT_RNG, AliasTable
 
 
 class TimePeriod(str, Enum):
@@ -19,6 +24,149 @@ class TimePeriod(str, Enum):
     UNTIL_2010 = 'ate2010'
 
 
+# Rendered forms a surname can take, indexed by prefix code; '{}' is replaced by the surname
+SURNAME_PREFIX_FORMS = ('{}', 'da {}', 'das {}', 'do {}', 'dos {}', 'de {}', "d'{}", 'e {}', '{} e', '{} da', '{} do')
+SURNAME_PREFIX_FORMS_RAW = tuple(form.upper() for form in SURNAME_PREFIX_FORMS)
+PREFIX_CODES = {form: code for code, form in enumerate(SURNAME_PREFIX_FORMS)}
+
+# Particles kept in lower case inside a name ("Maria das Dores", "Souza e Silva")
+LOWERCASE_PARTICLES = frozenset({'da', 'das', 'de', 'di', 'do', 'dos', 'du', 'e'})
+
+# Rows generated per chunk by the batch APIs, bounding temporary arrays
+BATCH_CHUNK_SIZE = 1 << 18
+
+
+def _object_array(items: tuple[str, ...] | list[str]) -> np.ndarray:
+    """Build a one-dimensional object array of strings."""
+    array = np.empty(len(items), dtype=object)
+    array[:] = items
+    return array
+
+
+def title_case(text: str, leading: bool = True) -> str:
+    """Title-case a Brazilian name.
+
+    Unlike str.title(), particles stay in lower case inside a name and the elided "d'" keeps
+    the next letter capitalized, e.g. "MARIA DAS DORES" -> "Maria das Dores" and
+    "D'ÁVILA" -> "d'Ávila" when it follows another word.
+
+    Args:
+        text: Name in any case
+        leading: Whether the text starts a full name, so its first word is capitalized
+
+    Returns:
+        Title-cased name
+    """
+    rendered = []
+    for position, word in enumerate(text.lower().split(' ')):
+        inner = position > 0 or not leading
+        if inner and word in LOWERCASE_PARTICLES:
+            rendered.append(word)
+        elif inner and word.startswith("d'") and len(word) > 2:
+            rendered.append(f"d'{word[2:].title()}")
+        else:
+            rendered.append(word.title())
+    return ' '.join(rendered)
+
+
+class Vocabulary(NamedTuple):
+    """Raw and title-cased renderings of the entries of a sampling table, by entry index."""
+
+    raw: tuple[str, ...]
+    title: tuple[str, ...]
+
+    @classmethod
+    def from_items(cls, items: tuple[str, ...] | list[str], leading: bool = True) -> 'Vocabulary':
+        """Render every entry once; ``leading`` is False for entries that never start a full name."""
+        return cls(tuple(items), tuple(title_case(item, leading) for item in items))
+
+    def forms(self, raw: bool) -> tuple[str, ...]:
+        """Return the raw or the title-cased column."""
+        return self.raw if raw else self.title
+
+
+class PeriodModel(NamedTuple):
+    """Compiled first-name table of a time period and its rendered vocabulary."""
+
+    table: AliasTable
+    vocabulary: Vocabulary
+
+
+class NameColumns(NamedTuple):
+    """Dictionary-encoded batch of names.
+
+    Code arrays index into the vocabularies; -1 marks a missing middle name or second surname.
+    Both surname columns share the ``surnames`` vocabulary.
+    """
+
+    first_name: np.ndarray
+    middle_name: np.ndarray
+    surname1: np.ndarray
+    surname2: np.ndarray
+    prefix1: np.ndarray
+    prefix2: np.ndarray
+    first_names: tuple[str, ...]
+    middle_names: tuple[str, ...]
+    surnames: tuple[str, ...]
+    prefixes: tuple[str, ...]
+
+    def __len__(self) -> int:
+        return len(self.first_name)
+
+    def to_list(self) -> list[str]:
+        """Join the columns into full name strings."""
+        names = _object_array(self.first_names)[self.first_name]
+        has_middle = self.middle_name >= 0
+        if has_middle.any():
+            names[has_middle] = names[has_middle] + ' ' + _object_array(self.middle_names)[self.middle_name[has_middle]]
+
+        names = names + ' ' + self._render_surnames(self.surname1, self.prefix1)
+        has_second = self.surname2 >= 0
+        if has_second.any():
+            names[has_second] = names[has_second] + ' ' + self._render_surnames(self.surname2[has_second], self.prefix2[has_second])
+        return names.tolist()
+
+    def _render_surnames(self, codes: np.ndarray, prefixes: np.ndarray) -> np.ndarray:
+        """Render surname codes with their prefix forms."""
+        rendered = _object_array(self.surnames)[codes]
+        prefixed = prefixes > 0
+        if prefixed.any():
+            forms = self.prefixes
+            rendered[prefixed] = [
+                forms[code].format(surname) for code, surname in zip(prefixes[prefixed].tolist(), rendered[prefixed], strict=True)
+            ]
+        return rendered
+
+    def to_arrow(self) -> dict[str, Any]:
+        """Convert the columns to ``pyarrow.DictionaryArray`` objects keyed by column name.
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        try:
+            import pyarrow as pa  # noqa: PLC0415 - optional dependency, only needed here
+        except ImportError as err:
+            raise ImportError('pyarrow is required for to_arrow(); install it with `pip install pyarrow`') from err
+
+        first_names = pa.array(self.first_names, type=pa.string())
+        middle_names = pa.array(self.middle_names, type=pa.string())
+        surnames = pa.array(self.surnames, type=pa.string())
+        prefixes = pa.array(self.prefixes, type=pa.string())
+
+        def encode(codes: np.ndarray, dictionary: Any) -> Any:
+            missing = codes < 0
+            return pa.DictionaryArray.from_arrays(pa.array(codes, mask=missing if missing.any() else None), dictionary)
+
+        return {
+            'first_name': encode(self.first_name, first_names),
+            'middle_name': encode(self.middle_name, middle_names),
+            'surname1': encode(self.surname1, surnames),
+            'surname2': encode(self.surname2, surnames),
+            'prefix1': encode(self.prefix1, prefixes),
+            'prefix2': encode(self.prefix2, prefixes),
+        }
+
+
 class BrazilianNameSampler:
     # Dictionary mapping surnames to their prefixes and weights
     SURNAME_PREFIXES = {
@@ -59,49 +207,107 @@ class BrazilianNameSampler:
         if 'surnames' not in data:
             raise ValueError("Missing 'surnames' data")
 
-        self.surname_data = data['surnames']
-        self.top_40_surnames = data['surnames'].get('top_40', {})
+        surnames = data['surnames']
+        if not isinstance(surnames, dict):
+            raise TypeError('Invalid surname data format')
+
+        # The nested top_40 entry is a separate distribution, not a surname
+        self.top_40_surnames = surnames.get('top_40', {})
+        self.surname_data = {surname: info for surname, info in surnames.items() if surname != 'top_40'}
 
         # Load middle names data
         self.middle_names_data = self._load_middle_names(middle_names_path) if middle_names_path else None
         self._validate_data()
 
+        # Compile every weighted draw into an alias table once, so draws cost O(1).
+        # First-name periods are compiled on first use, as most jobs only ever touch one.
+        self._period_models: dict[TimePeriod, PeriodModel] = {}
+        self._surname_table = self._compile_surname_table(self.surname_data)
+        self._top_40_surname_table = self._compile_surname_table(self.top_40_surnames)
+        self._middle_name_table = self._compile_middle_name_table() if self.middle_names_data else None
+        self._middle_name_probability = self._compile_middle_name_probability() if self.middle_names_data else 0.0
+
+        # Render every vocabulary entry once, so raw= only picks a column
+        self._surname_vocabulary = Vocabulary.from_items(self._surname_table.items, leading=False)
+        self._top_40_surname_vocabulary = Vocabulary.from_items(self._top_40_surname_table.items, leading=False)
+        self._middle_name_vocabulary = (
+            Vocabulary.from_items(self._middle_name_table.items, leading=False) if self._middle_name_table is not None else None
+        )
+
+        # Prefix outcomes are categorical tables keyed by surname; each surname code maps to a table row
+        self._compile_prefix_tables()
+        self._surname_prefix_rows = self._prefix_rows_for(self._surname_table)
+        self._top_40_prefix_rows = self._prefix_rows_for(self._top_40_surname_table)
+
     def _load_middle_names(self, path: str | Path) -> dict[str, Any]:
         """Load middle names data from JSON file."""
         with Path(path).open(encoding='utf-8') as file:
             data = json.load(file)
             return data
 
-    def _should_add_middle_name(self) -> bool:
-        """Determine if a middle name should be added based on statistical data."""
-        if not self.middle_names_data:
-            return False
-        return random.random() < (self.middle_names_data['percentage_with_second'] / 100)
-
-    def _get_random_middle_name(self) -> str:
-        """Get a random middle name based on frequency weights."""
-        if not self.middle_names_data:
-            return ''
-
+    def _compile_name_table(self, time_period: TimePeriod) -> AliasTable:
+        """Build the alias table for the first names of a time period."""
+        names_data = self.name_data[time_period.value]['names']
+        return AliasTable([info['percentage'] for info in names_data.values()], items=list(names_data))
+
+    def _period_model(self, time_period: TimePeriod) -> PeriodModel:
+        """Return the compiled first-name model of a period, compiling it on first use."""
+        time_period = TimePeriod(time_period)
+        model = self._period_models.get(time_period)
+        if model is None:
+            table = self._compile_name_table(time_period)
+            model = self._period_models[time_period] = PeriodModel(table, Vocabulary.from_items(table.items))
+        return model
+
+    @staticmethod
+    def _compile_surname_table(source: dict[str, Any]) -> AliasTable:
+        """Build the alias table for a surname dictionary."""
+        return AliasTable([info['percentage'] for info in source.values()], items=list(source))
+
+    def _compile_middle_name_table(self) -> AliasTable | None:
+        """Build the alias table for middle names, or None if no entry has weight."""
         try:
             names = []
             weights = []
-            total_weight = 0
-
             for name_data in self.middle_names_data['most_common']:
                 names.append(name_data['name'])
-                weight = float(name_data['percentage'])  # Ensure numeric conversion
-                weights.append(weight)
-                total_weight += weight
+                weights.append(float(name_data['percentage']))  # Ensure numeric conversion
 
-            if not names or total_weight <= 0:
-                return ''
+            if not names or sum(weights) <= 0:
+                return None
 
-            return random.choices(names, weights=weights, k=1)[0]
+            return AliasTable(weights, items=names)
 
         except (KeyError, ValueError, TypeError) as err:
             raise ValueError(f'Error processing middle names data: {err}') from err
 
+    def _compile_middle_name_probability(self) -> float:
+        """Convert ``percentage_with_second`` into the probability that a name gets a middle name."""
+        try:
+            probability = float(self.middle_names_data['percentage_with_second']) / 100
+        except (KeyError, ValueError, TypeError) as err:
+            raise ValueError(f'Error processing middle names data: {err}') from err
+
+        if not 0.0 <= probability <= 1.0:
+            raise ValueError(f'percentage_with_second must be between 0 and 100, got {probability * 100}')
+        return probability
+
+    def _should_add_middle_name(self) -> bool:
+        """Determine if a middle name should be added based on statistical data."""
+        return random.random() < self._middle_name_probability
+
+    def _middle_name_mask(self, size: int, always_middle: bool, rng: np.random.Generator) -> np.ndarray:
+        """Decide in one Bernoulli draw which of ``size`` rows get a middle name."""
+        if always_middle:
+            return np.ones(size, dtype=bool)
+        return rng.random(size) < self._middle_name_probability
+
+    def _get_random_middle_name(self, raw: bool = True) -> str:
+        """Get a random middle name based on frequency weights."""
+        if self._middle_name_table is None:
+            return ''
+        return self._middle_name_vocabulary.forms(raw)[self._middle_name_table.draw()]
+
     def get_random_name(
         self,
         time_period: TimePeriod = TimePeriod.UNTIL_2010,
@@ -114,31 +320,156 @@ class BrazilianNameSampler:
     ) -> str:
         """Get a random name from the specified time period."""
         if only_middle:
-            middle_name = self._get_random_middle_name()
-            return middle_name if raw else middle_name.title()
-
-        period_data = self.name_data[time_period.value]
-        names_data = period_data['names']
+            middle_name = self._get_random_middle_name(raw)
+            return middle_name if raw else middle_name[:1].upper() + middle_name[1:]
 
-        names = []
-        weights = []
-        for name, info in names_data.items():
-            names.append(name)
-            weights.append(info['percentage'])
-
-        name = random.choices(names, weights=weights, k=1)[0]
+        model = self._period_model(time_period)
+        name = model.vocabulary.forms(raw)[model.table.draw()]
 
         # Handle middle name
         if always_middle or self._should_add_middle_name():
-            middle_name = self._get_random_middle_name()
+            middle_name = self._get_random_middle_name(raw)
             name = f'{name} {middle_name}'
 
         if not include_surname:
-            return name if raw else name.title()
+            return name
 
         # Explicitly pass with_only_one_surname to get_random_surname
         surname = self.get_random_surname(top_40=top_40, raw=raw, with_only_one_surname=with_only_one_surname)
-        return f'{name if raw else name.title()} {surname}'
+        return f'{name} {surname}'
+
+    def get_random_names(
+        self,
+        n: int,
+        time_period: TimePeriod = TimePeriod.UNTIL_2010,
+        raw: bool = False,
+        top_40: bool = False,
+        with_only_one_surname: bool = False,
+        always_middle: bool = False,
+        rng: np.random.Generator | None = None,
+    ) -> list[str]:
+        """Get ``n`` random full names in one vectorized pass.
+
+        First names, the middle-name mask and surname indices are drawn as NumPy arrays;
+        strings are only joined at the end.
+
+        Args:
+            n: Number of names to generate
+            time_period: Time period for first names
+            raw: If True, returns names in original (upper-case) format
+            top_40: If True, only select surnames from the top 40
+            with_only_one_surname: If True, each name gets a single surname
+            always_middle: If True, every name gets a middle name
+            rng: NumPy generator to draw from, defaults to the shared generator
+
+        Returns:
+            List of ``n`` full names
+        """
+        return self.get_random_name_columns(
+            n,
+            time_period=time_period,
+            raw=raw,
+            top_40=top_40,
+            with_only_one_surname=with_only_one_surname,
+            always_middle=always_middle,
+            rng=rng,
+        ).to_list()
+
+    def get_random_middle_names(self, n: int, raw: bool = False, rng: np.random.Generator | None = None) -> list[str]:
+        """Get ``n`` random middle names in one vectorized draw.
+
+        Args:
+            n: Number of middle names to generate
+            raw: If True, returns names in original (upper-case) format
+            rng: NumPy generator to draw from, defaults to the shared generator
+
+        Returns:
+            List of ``n`` middle names, or empty strings when no middle names were loaded
+        """
+        if self._middle_name_table is None:
+            return [''] * n
+        forms = self._middle_name_vocabulary.forms(raw)
+        if not raw:
+            forms = tuple(name[:1].upper() + name[1:] for name in forms)
+        return _object_array(forms)[self._middle_name_table.sample(n, rng)].tolist()
+
+    def get_random_name_columns(
+        self,
+        n: int,
+        time_period: TimePeriod = TimePeriod.UNTIL_2010,
+        raw: bool = False,
+        top_40: bool = False,
+        with_only_one_surname: bool = False,
+        always_middle: bool = False,
+        rng: np.random.Generator | None = None,
+    ) -> NameColumns:
+        """Get ``n`` random names as dictionary-encoded integer columns.
+
+        No per-row strings are built: the result holds int32 code arrays for first name,
+        middle name and both surnames, int8 prefix codes, and the shared vocabularies.
+        Rows are generated in chunks so temporaries stay bounded for very large ``n``.
+
+        Args:
+            n: Number of names to generate
+            time_period: Time period for first names
+            raw: If True, vocabularies are in original (upper-case) format
+            top_40: If True, only select surnames from the top 40
+            with_only_one_surname: If True, surname2 and prefix2 are -1 and 0 for every row
+            always_middle: If True, every name gets a middle name
+            rng: NumPy generator to draw from, defaults to the shared generator
+
+        Returns:
+            NameColumns with the code arrays and vocabularies
+        """
+        rng = DEFAULT_RNG if rng is None else rng
+        n = max(n, 0)
+        period_model = self._period_model(time_period)
+        name_table = period_model.table
+        surname_table = self._top_40_surname_table if top_40 else self._surname_table
+        surname_vocabulary = self._top_40_surname_vocabulary if top_40 else self._surname_vocabulary
+        middle_table = self._middle_name_table
+        prefix_rows = self._top_40_prefix_rows if top_40 else self._surname_prefix_rows
+
+        first_name = np.empty(n, dtype=np.int32)
+        middle_name = np.full(n, -1, dtype=np.int32)
+        surname1 = np.empty(n, dtype=np.int32)
+        surname2 = np.full(n, -1, dtype=np.int32)
+        prefix1 = np.zeros(n, dtype=np.int8)
+        prefix2 = np.zeros(n, dtype=np.int8)
+
+        surname_count = 1 if with_only_one_surname else 2
+
+        for start in range(0, n, BATCH_CHUNK_SIZE):
+            stop = min(start + BATCH_CHUNK_SIZE, n)
+            size = stop - start
+            first_name[start:stop] = name_table.sample(size, rng)
+
+            if middle_table is not None:
+                has_middle = self._middle_name_mask(size, always_middle, rng)
+                middle_name[start:stop][has_middle] = middle_table.sample(int(has_middle.sum()), rng)
+
+            # Both surnames of every row come from a single draw
+            codes = surname_table.sample((size, surname_count), rng)
+            prefixes = self._draw_prefix_codes(prefix_rows[codes], rng)
+
+            surname1[start:stop] = codes[:, 0]
+            prefix1[start:stop] = prefixes[:, 0]
+            if not with_only_one_surname:
+                surname2[start:stop] = codes[:, 1]
+                prefix2[start:stop] = prefixes[:, 1]
+
+        return NameColumns(
+            first_name=first_name,
+            middle_name=middle_name,
+            surname1=surname1,
+            surname2=surname2,
+            prefix1=prefix1,
+            prefix2=prefix2,
+            first_names=period_model.vocabulary.forms(raw),
+            middle_names=self._middle_name_vocabulary.forms(raw) if middle_table is not None else (),
+            surnames=surname_vocabulary.forms(raw),
+            prefixes=SURNAME_PREFIX_FORMS_RAW if raw else SURNAME_PREFIX_FORMS,
+        )
 
     def _validate_data(self) -> None:
         """
@@ -189,49 +520,86 @@ class BrazilianNameSampler:
 
         Notes:
             - Handles case sensitivity consistently based on input format
-            - Implements weighted probability for different prefix variations
-            - Supports special cases for vowel-initial surnames
-            - Maintains proper capitalization throughout the transformation
+            - The drawn form comes from _draw_prefix_code and is rendered from SURNAME_PREFIX_FORMS
         """
-        is_raw = surname.isupper()
-        surname_upper = surname.upper()
-
-        if surname_upper in self.SURNAME_PREFIXES:
-            # Handle compound surname patterns first
-            if surname_upper in ['SANTOS', 'SILVA']:
-                compound_chance = random.random()
-                compound_prefix = None  # Using a different variable name to avoid shadowing
-
-                if compound_chance < 0.05:  # 5% chance for compound with "e"
-                    compound_prefix = 'E' if is_raw else 'e'
-                    return f'{surname} {compound_prefix}'
-
-                if compound_chance < 0.15:  # Additional 10% chance for compound with "da/do"
-                    compound_prefix = ('DA' if random.random() < 0.7 else 'DO') if is_raw else ('da' if random.random() < 0.7 else 'do')
-                    return f'{surname} {compound_prefix}'
-
-            # Regular prefix handling with multiple options
-            prefix_options = self.SURNAME_PREFIXES[surname_upper]
-            total_weight = sum(weight for _, weight in prefix_options)
-            rand = random.random() * total_weight
-
-            cumulative = 0
-            for candidate_prefix, weight in prefix_options:  # Renamed loop variable to avoid shadowing
-                cumulative += weight
-                if rand <= cumulative:
-                    final_prefix = candidate_prefix  # Store the selected prefix in a new variable
+        code = self._draw_prefix_code(surname)
+        if code == 0:
+            return surname
+        return (SURNAME_PREFIX_FORMS_RAW if surname.isupper() else SURNAME_PREFIX_FORMS)[code].format(surname)
 
-                    # Handle special cases for the selected prefix
-                    if final_prefix in ['da', 'do'] and random.random() < 0.08:
-                        final_prefix = ('DOS' if final_prefix == 'do' else 'DAS') if is_raw else ('dos' if final_prefix == 'do' else 'das')
-                    elif final_prefix == 'de' and surname[0].lower() in 'aeiou' and random.random() < 0.7:
-                        final_prefix = "D'" if is_raw else "d'"
-                    else:
-                        final_prefix = final_prefix.upper() if is_raw else final_prefix
-
-                    return f'{final_prefix} {surname}'
+    def _prefix_form_probabilities(self, surname: str) -> list[float]:
+        """
+        Exact probability of each SURNAME_PREFIX_FORMS entry for a surname under the prefix rules.
 
-        return surname
+        Notes:
+            - Prefix options are chosen in proportion to their weights in SURNAME_PREFIXES
+            - SANTOS and SILVA first get a 5% compound "e" and a 10% compound "da"/"do" (70/30)
+            - A chosen "da"/"do" becomes plural 8% of the time
+            - A chosen "de" becomes the d' elision 70% of the time before a vowel
+        """
+        probabilities = [0.0] * len(SURNAME_PREFIX_FORMS)
+        surname_upper = surname.upper()
+        if surname_upper not in self.SURNAME_PREFIXES:
+            probabilities[0] = 1.0
+            return probabilities
+
+        regular = 1.0
+        if surname_upper in ['SANTOS', 'SILVA']:
+            probabilities[PREFIX_CODES['{} e']] += 0.05
+            probabilities[PREFIX_CODES['{} da']] += 0.10 * 0.7
+            probabilities[PREFIX_CODES['{} do']] += 0.10 * 0.3
+            regular = 0.85
+
+        prefix_options = self.SURNAME_PREFIXES[surname_upper]
+        total_weight = sum(weight for _, weight in prefix_options)
+        for candidate_prefix, weight in prefix_options:
+            chance = regular * weight / total_weight
+            if candidate_prefix in ['da', 'do']:
+                probabilities[PREFIX_CODES[f'{candidate_prefix}s {{}}']] += chance * 0.08
+                chance *= 0.92
+            elif candidate_prefix == 'de' and surname_upper[0].lower() in 'aeiou':
+                probabilities[PREFIX_CODES["d'{}"]] += chance * 0.7
+                chance *= 0.3
+            probabilities[PREFIX_CODES[f'{candidate_prefix} {{}}']] += chance
+
+        return probabilities
+
+    def _compile_prefix_tables(self) -> None:
+        """Compile the prefix rules into one cumulative categorical row per surname with rules.
+
+        Row 0 always yields the bare surname and is shared by every surname without rules.
+        """
+        self._prefix_rule_rows = {surname: row for row, surname in enumerate(self.SURNAME_PREFIXES, start=1)}
+        rows = [[1.0] + [0.0] * (len(SURNAME_PREFIX_FORMS) - 1)]
+        rows.extend(self._prefix_form_probabilities(surname) for surname in self.SURNAME_PREFIXES)
+        cumulative = np.cumsum(np.array(rows), axis=1)
+        # Guard the last column against floating point error so every uniform draw lands in a form
+        cumulative[:, -1] = 1.0
+        self._prefix_cumulative_lists = cumulative.tolist()
+        # Offsetting row r by r makes the flattened table sorted, so one searchsorted serves every row
+        self._prefix_cumulative_flat = (cumulative + np.arange(len(rows))[:, None]).ravel()
+
+    def _prefix_rows_for(self, table: AliasTable) -> np.ndarray:
+        """Map every surname code of a table to its row in the prefix tables."""
+        return np.array([self._prefix_rule_rows.get(surname.upper(), 0) for surname in table.items], dtype=np.intp)
+
+    def _draw_prefix_code(self, surname: str) -> int:
+        """Draw the prefix form of a surname, as an index into SURNAME_PREFIX_FORMS, with one uniform draw."""
+        row = self._prefix_rule_rows.get(surname.upper())
+        if row is None:
+            return 0
+        cumulative = self._prefix_cumulative_lists[row]
+        return min(bisect(cumulative, random.random()), len(cumulative) - 1)
+
+    def _draw_prefix_codes(self, rows: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Draw prefix codes for an array of prefix-table rows with one vectorized uniform draw."""
+        codes = np.zeros(rows.shape, dtype=np.int8)
+        with_rule = rows > 0
+        if with_rule.any():
+            rule_rows = rows[with_rule]
+            positions = np.searchsorted(self._prefix_cumulative_flat, rule_rows + rng.random(len(rule_rows)), side='right')
+            codes[with_rule] = np.minimum(positions - rule_rows * len(SURNAME_PREFIX_FORMS), len(SURNAME_PREFIX_FORMS) - 1)
+        return codes
 
     def get_random_surname(self, top_40: bool = False, raw: bool = False, with_only_one_surname: bool = False) -> str:
         """
@@ -245,26 +613,10 @@ class BrazilianNameSampler:
         Returns:
             One or two surnames with appropriate prefixes
         """
-        source = self.top_40_surnames if top_40 else self.surname_data
-        surnames = []
-        weights = []
-
-        for surname, info in source.items():
-            if surname != 'top_40':  # Skip the top_40 nested dictionary
-                surnames.append(surname)
-                weights.append(info['percentage'])
-
-        # Get first surname
-        surname1 = random.choices(surnames, weights=weights, k=1)[0]
-        surname1 = surname1 if raw else surname1.title()
-        surname1 = self._apply_prefix(surname1)
-
-        if with_only_one_surname:
-            return surname1
-
-        # Get second surname
-        surname2 = random.choices(surnames, weights=weights, k=1)[0]
-        surname2 = surname2 if raw else surname2.title()
-        surname2 = self._apply_prefix(surname2)
+        table = self._top_40_surname_table if top_40 else self._surname_table
+        surnames = (self._top_40_surname_vocabulary if top_40 else self._surname_vocabulary).forms(raw)
+        forms = SURNAME_PREFIX_FORMS_RAW if raw else SURNAME_PREFIX_FORMS
 
-        return f'{surname1} {surname2}'
+        # Draw both surnames at once
+        codes = table.draw_many(1 if with_only_one_surname else 2)
+        return ' '.join(forms[self._draw_prefix_code(table.items[code])].format(surnames[code]) for code in codes)
@@ -0,0 +1,225 @@
+"""
+Compiled CEP range tables.
+
+Every city owns any number of inclusive ``[start, end]`` CEP ranges. All ranges live in
+flat arrays, with ``offsets[i]:offsets[i + 1]`` selecting the ranges of city ``i``, and a
+running total of range widths. A CEP is drawn by picking one uniform integer within the
+city's share of that total and locating its range with a single binary search, so ranges
+are chosen in proportion to their width and no strings are parsed after compilation.
+"""
+
+import csv
+import random
+import re
+from bisect import bisect_right
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+
+from src.alias_table import DEFAULT_RNG
+
+# One "[start end]" pair of a postalCode_ranges field, e.g. "[01000-001 05999-999]"
+_POSTAL_CODE_RANGE = re.compile(r'\[\s*(\d{5}-?\d{3})\s+(\d{5}-?\d{3})\s*\]')
+
+
+def parse_cep(cep: str) -> int:
+    """Convert a CEP string, with or without dash, to an integer.
+
+    Raises:
+        ValueError: If the string is not an 8-digit CEP
+    """
+    digits = cep.strip().replace('-', '')
+    if len(digits) != 8 or not digits.isdigit():
+        raise ValueError(f'Invalid CEP: {cep!r}')
+    return int(digits)
+
+
+def parse_postal_code_ranges(text: str) -> list[tuple[int, int]]:
+    """Parse a ``postalCode_ranges`` field such as ``"[01000-001 05999-999] [08000-000 08499-999]"``.
+
+    Returns:
+        List of inclusive (start, end) integer ranges, possibly empty
+    """
+    return [(parse_cep(start), parse_cep(end)) for start, end in _POSTAL_CODE_RANGE.findall(text or '')]
+
+
+def load_postal_code_ranges(csv_path: str | Path) -> dict[str, list[tuple[int, int]]]:
+    """Read ``postalCode_ranges`` from a br-city-codes style CSV, keyed by 7-digit IBGE code.
+
+    Args:
+        csv_path: CSV with at least ``idIBGE`` and ``postalCode_ranges`` columns
+
+    Returns:
+        Mapping of IBGE code to the city's CEP ranges; cities without ranges are omitted
+    """
+    with Path(csv_path).open(encoding='utf-8', newline='') as file:
+        rows = csv.DictReader(file)
+        ranges = {row['idIBGE']: parse_postal_code_ranges(row['postalCode_ranges']) for row in rows}
+    return {code: city_ranges for code, city_ranges in ranges.items() if city_ranges}
+
+
+class CepRangeTable:
+    """Flat table of the CEP ranges of a fixed list of cities.
+
+    Attributes:
+        starts: First CEP of each range
+        ends: Last CEP of each range (inclusive)
+        offsets: ``offsets[i]:offsets[i + 1]`` are the ranges of city ``i``
+        cumulative: Running total of range widths; range ``r`` covers ``[cumulative[r] - width, cumulative[r])``
+    """
+
+    __slots__ = (
+        '_bounds',
+        '_bounds_list',
+        '_cumulative_list',
+        '_ends_list',
+        '_offsets_list',
+        '_starts_list',
+        'cumulative',
+        'ends',
+        'offsets',
+        'starts',
+    )
+
+    def __init__(self, ranges_by_city: Sequence[Sequence[tuple[int, int]]]):
+        """Compile the table.
+
+        Args:
+            ranges_by_city: Inclusive (start, end) integer ranges of each city; a city may have none
+
+        Raises:
+            ValueError: If a range ends before it starts
+        """
+        starts = []
+        ends = []
+        offsets = [0]
+        for city_ranges in ranges_by_city:
+            for start, end in city_ranges:
+                if end < start:
+                    raise ValueError(f'CEP range ends before it starts: {start:08d}-{end:08d}')
+                starts.append(start)
+                ends.append(end)
+            offsets.append(len(starts))
+
+        self.starts = np.array(starts, dtype=np.int64)
+        self.ends = np.array(ends, dtype=np.int64)
+        self.offsets = np.array(offsets, dtype=np.int64)
+        self.cumulative = np.cumsum(self.ends - self.starts + 1)
+        self._bounds = np.concatenate(([0], self.cumulative))
+
+        self._starts_list = starts
+        self._ends_list = ends
+        self._offsets_list = offsets
+        self._cumulative_list = self.cumulative.tolist()
+        self._bounds_list = self._bounds.tolist()
+
+    def __len__(self) -> int:
+        """Number of cities in the table."""
+        return len(self._offsets_list) - 1
+
+    def ranges(self, city: int) -> list[tuple[int, int]]:
+        """Inclusive (start, end) ranges of a city."""
+        first, last = self._offsets_list[city], self._offsets_list[city + 1]
+        return list(zip(self._starts_list[first:last], self._ends_list[first:last], strict=True))
+
+    def draw(self, city: int) -> int:
+        """Draw one CEP of a city, uniform over the union of its ranges.
+
+        Raises:
+            ValueError: If the city has no CEP range
+        """
+        bounds = self._bounds_list
+        low, high = bounds[self._offsets_list[city]], bounds[self._offsets_list[city + 1]]
+        if low == high:
+            raise ValueError(f'No CEP range for city index {city}')
+        position = low + int(random.random() * (high - low))
+        index = bisect_right(self._cumulative_list, position, self._offsets_list[city])
+        return self._ends_list[index] - (self._cumulative_list[index] - 1 - position)
+
+    def sample(self, cities: np.ndarray, rng: np.random.Generator | None = None) -> np.ndarray:
+        """Draw one CEP for each city index in ``cities``.
+
+        Args:
+            cities: Integer array of city indices
+            rng: NumPy generator to use, defaults to ``DEFAULT_RNG``
+
+        Returns:
+            Integer array of CEPs, -1 where the city has no CEP range
+        """
+        rng = DEFAULT_RNG if rng is None else rng
+        cities = np.asarray(cities)
+        first, last = self.offsets[cities], self.offsets[cities + 1]
+        low, high = self._bounds[first], self._bounds[last]
+        position = low + (rng.random(len(cities)) * (high - low)).astype(np.int64)
+
+        # Single-range cities already know their range; only the others need the binary search
+        index = first.copy()
+        several = last - first > 1
+        if several.any():
+            index[several] = np.searchsorted(self.cumulative, position[several], side='right')
+
+        missing = first == last
+        if missing.any():
+            index[missing] = 0
+        ceps = self.ends[index] - (self.cumulative[index] - 1 - position) if len(self.starts) else np.zeros(len(cities), dtype=np.int64)
+        ceps[missing] = -1
+        return ceps
+
+
+class CepIndex:
+    """Interval index from CEP to city over the ranges of a ``CepRangeTable``.
+
+    Ranges are sorted by start, so a lookup is one binary search for the last range
+    starting at or before the CEP followed by a check against that range's end.
+
+    Attributes:
+        starts: Sorted first CEP of each range
+        ends: Last CEP of each range, in the same order
+        cities: City index of each range, in the same order
+    """
+
+    __slots__ = ('_cities_list', '_ends_list', '_starts_list', 'cities', 'ends', 'starts')
+
+    def __init__(self, table: CepRangeTable):
+        """Build the index.
+
+        Args:
+            table: Compiled CEP ranges of every city
+
+        Raises:
+            ValueError: If two ranges overlap, since a CEP would then map to more than one city
+        """
+        order = np.argsort(table.starts, kind='stable')
+        self.starts = table.starts[order]
+        self.ends = table.ends[order]
+        self.cities = np.repeat(np.arange(len(table), dtype=np.int32), np.diff(table.offsets))[order]
+
+        overlapping = np.flatnonzero(self.starts[1:] <= self.ends[:-1])
+        if len(overlapping):
+            first = int(overlapping[0])
+            raise ValueError(
+                f'CEP ranges overlap: {self.starts[first]:08d}-{self.ends[first]:08d} (city {self.cities[first]}) and '
+                f'{self.starts[first + 1]:08d}-{self.ends[first + 1]:08d} (city {self.cities[first + 1]})'
+            )
+
+        self._starts_list = self.starts.tolist()
+        self._ends_list = self.ends.tolist()
+        self._cities_list = self.cities.tolist()
+
+    def lookup(self, cep: int) -> int:
+        """Return the index of the city owning ``cep``, or -1 if no range contains it."""
+        position = bisect_right(self._starts_list, cep) - 1
+        if position >= 0 and cep <= self._ends_list[position]:
+            return self._cities_list[position]
+        return -1
+
+    def lookup_many(self, ceps: np.ndarray) -> np.ndarray:
+        """Return the city index owning each CEP, -1 where no range contains it."""
+        ceps = np.asarray(ceps, dtype=np.int64)
+        if not len(self.starts):
+            return np.full(ceps.shape, -1, dtype=np.int32)
+        position = np.searchsorted(self.starts, ceps, side='right') - 1
+        clipped = np.maximum(position, 0)
+        found = (position >= 0) & (ceps <= self.ends[clipped])
+        return np.where(found, self.cities[clipped], -1).astype(np.int32)
@@ -234,19 +234,16 @@ def sample(
                     sampler.get_random_surname(top_40=top_40, raw=name_raw, with_only_one_surname=with_only_one_surname) for _ in range(qty)
                 ]
             elif only_middle:
-                results = [sampler.get_random_name(raw=name_raw, only_middle=True) for _ in range(qty)]
+                results = sampler.get_random_middle_names(qty, raw=name_raw)
             else:
-                results = [
-                    sampler.get_random_name(
-                        time_period=time_period,
-                        raw=name_raw,
-                        include_surname=True,
-                        top_40=top_40,
-                        with_only_one_surname=with_only_one_surname,
-                        always_middle=always_middle,
-                    )
-                    for _ in range(qty)
-                ]
+                results = sampler.get_random_names(
+                    qty,
+                    time_period=time_period,
+                    raw=name_raw,
+                    top_40=top_40,
+                    with_only_one_surname=with_only_one_surname,
+                    always_middle=always_middle,
+                )
 
             # Add documents for name-only results if not only_middle/only_surname
             if not (only_middle or only_surname):
@@ -1,8 +1,10 @@
 """Brazilian document number generator using utility functions."""
 
+from collections.abc import Sequence
+
 from src.utils.cei import random_cei
-from src.utils.cnpj import random_cnpj
-from src.utils.cpf import random_cpf
+from src.utils.cnpj import random_alnum_cnpj, random_cnpj, random_cnpjs
+from src.utils.cpf import random_cpf, random_cpfs
 from src.utils.pis import random_pis
 
 
@@ -12,13 +14,24 @@ class DocumentSampler:
     def __init__(self):
         """Initialize the document sampler."""
 
-    def generate_cpf(self, formatted: bool = True) -> str:
+    def generate_cpf(self, formatted: bool = True, state_abbr: str | None = None) -> str:
         """Generate a valid CPF number.
 
         Args:
             formatted: If True, returns CPF in XXX.XXX.XXX-XX format
+            state_abbr: Optional UF; the CPF then carries its fiscal region digit
+        """
+        return random_cpf(formatted=formatted, state_abbr=state_abbr)
+
+    def generate_cpfs(self, n: int, formatted: bool = True, state_abbrs: str | Sequence[str] | None = None) -> list[str]:
+        """Generate n valid CPF numbers at once.
+
+        Args:
+            n: Number of CPFs to generate
+            formatted: If True, returns CPFs in XXX.XXX.XXX-XX format
+            state_abbrs: Optional UF for all CPFs, or one UF per CPF, fixing their fiscal region digit
         """
-        return random_cpf(formatted=formatted)
+        return random_cpfs(n, formatted=formatted, state_abbrs=state_abbrs)
 
     def generate_pis(self, formatted: bool = True) -> str:
         """Generate a valid PIS number.
@@ -28,14 +41,27 @@ class DocumentSampler:
         """
         return random_pis(formatted=formatted)
 
-    def generate_cnpj(self, formatted: bool = True) -> str:
+    def generate_cnpj(self, formatted: bool = True, alphanumeric: bool = False) -> str:
         """Generate a valid CNPJ number.
 
         Args:
             formatted: If True, returns CNPJ in XX.XXX.XXX/XXXX-XX format
+            alphanumeric: If True, returns a CNPJ in the alphanumeric format issued from July 2026
         """
+        if alphanumeric:
+            return random_alnum_cnpj(formatted=formatted)
         return random_cnpj(formatted=formatted)
 
+    def generate_cnpjs(self, n: int, formatted: bool = True, alphanumeric_share: float = 0.0) -> list[str]:
+        """Generate n valid CNPJ numbers at once.
+
+        Args:
+            n: Number of CNPJs to generate
+            formatted: If True, returns CNPJs in XX.XXX.XXX/XXXX-XX format
+            alphanumeric_share: Share of CNPJs in the alphanumeric format, from 0 to 1
+        """
+        return random_cnpjs(n, formatted=formatted, alphanumeric_share=alphanumeric_share)
+
     def generate_cei(self, formatted: bool = True) -> str:
         """Generate a valid CEI number.
 
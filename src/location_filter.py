@@ -0,0 +1,181 @@
+"""
+Conditional location sampling.
+
+A ``LocationFilter`` selects cities by macro-region, state and population range. The
+matching cities are compiled once into an alias table over their renormalized nationwide
+weights, and ``FilteredTableCache`` keeps the most recently used tables so repeated draws
+under the same filter cost one O(1) draw each, scalar or batch.
+"""
+
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import NamedTuple
+
+import numpy as np
+
+from src.alias_table import AliasTable
+from src.population_index import STATE_REGIONS, PopulationIndex
+
+# Number of compiled filters kept by a sampler's cache
+DEFAULT_FILTER_CACHE_SIZE = 32
+
+REGIONS = frozenset(STATE_REGIONS.values())
+
+
+def _normalize_region(region: str) -> str:
+    """Region key as used in the data, e.g. 'Centro Oeste' -> 'centro-oeste'."""
+    return '-'.join(region.strip().lower().split())
+
+
+class LocationFilter(NamedTuple):
+    """Hashable selection of cities; a field left as None does not restrict.
+
+    Build it with ``LocationFilter.create`` so equivalent filters compare equal and share a
+    cache entry. Population bounds are inclusive.
+    """
+
+    regions: frozenset[str] | None = None
+    states: frozenset[str] | None = None
+    min_population: float | None = None
+    max_population: float | None = None
+
+    @classmethod
+    def create(
+        cls,
+        regions: str | Iterable[str] | None = None,
+        states: str | Iterable[str] | None = None,
+        min_population: float | None = None,
+        max_population: float | None = None,
+    ) -> 'LocationFilter':
+        """Normalize a filter: regions lower-cased, states upper-cased, both as frozensets.
+
+        Args:
+            regions: Region name or names, e.g. 'nordeste' or ['Sul', 'Sudeste']
+            states: State abbreviation or abbreviations, e.g. ['SP', 'RJ']
+            min_population: Smallest city population to include
+            max_population: Largest city population to include
+
+        Raises:
+            ValueError: If a region is unknown or the population range is empty
+        """
+        if isinstance(regions, str):
+            regions = [regions]
+        if isinstance(states, str):
+            states = [states]
+        if regions is not None:
+            regions = frozenset(_normalize_region(region) for region in regions)
+            unknown = sorted(regions - REGIONS)
+            if unknown:
+                raise ValueError(f'Unknown region: {unknown[0]}')
+        if states is not None:
+            states = frozenset(state.strip().upper() for state in states)
+        if min_population is not None and max_population is not None and min_population > max_population:
+            raise ValueError(f'Empty population range: {min_population} > {max_population}')
+        return cls(regions, states, min_population, max_population)
+
+    def mask(self, index: PopulationIndex) -> np.ndarray:
+        """Boolean array over the cities of ``index``, True where the city matches.
+
+        Raises:
+            ValueError: If a state is unknown, or a population bound is set and the data lacks populations
+        """
+        state_mask = np.ones(len(index.state_abbrs), dtype=bool)
+        if self.regions is not None:
+            state_mask &= np.isin(np.array(index.state_regions, dtype=object), list(self.regions))
+        if self.states is not None:
+            unknown = sorted(self.states - set(index.state_abbrs))
+            if unknown:
+                raise ValueError(f'Unknown state: {unknown[0]}')
+            state_mask &= np.isin(np.array(index.state_abbrs, dtype=object), list(self.states))
+
+        mask = state_mask[index.city_state]
+        if self.min_population is not None or self.max_population is not None:
+            if np.isnan(index.city_population).any():
+                raise ValueError('Population filters need city_population for every city')
+            if self.min_population is not None:
+                mask &= index.city_population >= self.min_population
+            if self.max_population is not None:
+                mask &= index.city_population <= self.max_population
+        return mask
+
+
+class FilteredCities(NamedTuple):
+    """Cities matching a filter and an alias table over their positions in ``cities``.
+
+    ``city_list`` mirrors ``cities`` as a plain list for scalar draws.
+    """
+
+    cities: np.ndarray
+    city_list: list[int]
+    table: AliasTable
+
+
+class CacheInfo(NamedTuple):
+    """Counters of a ``FilteredTableCache``, in the style of ``functools.lru_cache``."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class FilteredTableCache:
+    """LRU cache of compiled ``FilteredCities`` keyed by ``LocationFilter``.
+
+    Attributes:
+        hits: Lookups answered from the cache
+        misses: Lookups that compiled a table
+        maxsize: Number of tables kept; the least recently used one is evicted first
+    """
+
+    def __init__(self, index: PopulationIndex, weights: np.ndarray, maxsize: int = DEFAULT_FILTER_CACHE_SIZE):
+        """Create an empty cache.
+
+        Args:
+            index: Compiled population data the filters select from
+            weights: Weight of every city, renormalized over the matching cities
+            maxsize: Number of tables to keep, at least 1
+        """
+        if maxsize < 1:
+            raise ValueError('Cache size must be at least 1')
+        self.index = index
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._tables: OrderedDict[LocationFilter, FilteredCities] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def get(self, location_filter: LocationFilter) -> FilteredCities:
+        """Return the compiled table of a filter, building it on a miss.
+
+        Raises:
+            ValueError: If the filter is invalid for the data or matches no city with positive weight
+        """
+        tables = self._tables
+        if location_filter in tables:
+            self.hits += 1
+            tables.move_to_end(location_filter)
+            return tables[location_filter]
+
+        self.misses += 1
+        cities = np.flatnonzero(location_filter.mask(self.index) & (self.weights > 0)).astype(np.int32)
+        if not len(cities):
+            raise ValueError(f'No cities match filter: {location_filter}')
+        filtered = FilteredCities(cities, cities.tolist(), AliasTable(self.weights[cities]))
+        tables[location_filter] = filtered
+        if len(tables) > self.maxsize:
+            tables.popitem(last=False)
+        return filtered
+
+    def cache_info(self) -> CacheInfo:
+        """Hit and miss counters and the current size."""
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._tables))
+
+    def clear(self) -> None:
+        """Drop every table and reset the counters."""
+        self._tables.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,208 @@
+"""
+Compiled, schema-normalized view of the population data.
+
+Two JSON layouts are in use. The legacy one keys cities by plain name and stores CEP ranges
+as ``cep_starts``/``cep_ends``/``cep_starts_two``/``cep_ends_two``; the 2024 one keys cities
+as ``"Name_UF"`` with ``city_name``, ``city_population``, ``ddd``, IBGE codes and
+``cep_range_begins``/``cep_range_ends``. ``load_population_index`` accepts either and compiles
+it into integer city and state IDs with parallel arrays, so sampling code never has to look
+anything up by string.
+"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.cep_ranges import CepRangeTable, load_postal_code_ranges, parse_cep, parse_postal_code_ranges
+from src.utils.cpf import CPF_FISCAL_REGIONS
+from src.utils.muni import muni_check_digits
+
+# (start, end) keys of the CEP ranges of a city, in the legacy and the 2024 data layouts
+CEP_RANGE_KEYS = (
+    (('cep_starts', 'cep_ends'), ('cep_starts_two', 'cep_ends_two')),
+    (('cep_range_begins', 'cep_range_ends'), ('cep_range_begins_two', 'cep_range_ends_two')),
+)
+
+# Macro-region of each state, named as in the 'regions' key of the population data. The first digit
+# of the IBGE state code (uf_code) encodes the same split: 1 norte, 2 nordeste, 3 sudeste, 4 sul, 5 centro-oeste.
+STATE_REGIONS = {
+    **dict.fromkeys(('AC', 'AM', 'AP', 'PA', 'RO', 'RR', 'TO'), 'norte'),
+    **dict.fromkeys(('AL', 'BA', 'CE', 'MA', 'PB', 'PE', 'PI', 'RN', 'SE'), 'nordeste'),
+    **dict.fromkeys(('ES', 'MG', 'RJ', 'SP'), 'sudeste'),
+    **dict.fromkeys(('PR', 'RS', 'SC'), 'sul'),
+    **dict.fromkeys(('DF', 'GO', 'MS', 'MT'), 'centro-oeste'),
+}
+
+
+def _city_cep_ranges(city_data: dict[str, Any], csv_ranges: dict[str, list[tuple[int, int]]]) -> list[tuple[int, int]]:
+    """CEP ranges of a city: from the CSV by IBGE code, a ``postalCode_ranges`` field, or the start/end keys."""
+    ibge_code = f'{city_data.get("uf_code", "")}{city_data.get("city_code", "")}'
+    if ibge_code in csv_ranges:
+        return csv_ranges[ibge_code]
+    if city_data.get('postalCode_ranges'):
+        return parse_postal_code_ranges(city_data['postalCode_ranges'])
+    for layout in CEP_RANGE_KEYS:
+        ranges = [
+            (parse_cep(city_data[start]), parse_cep(city_data[end])) for start, end in layout if city_data.get(start) and city_data.get(end)
+        ]
+        if ranges:
+            return ranges
+    return []
+
+
+def _optional_float(city_data: dict[str, Any], key: str) -> float:
+    """Numeric field as float, NaN when missing or empty."""
+    value = city_data.get(key)
+    return float(value) if value not in (None, '') else np.nan
+
+
+def _ibge_codes(cities: dict[str, dict[str, Any]]) -> np.ndarray:
+    """7-digit IBGE code of every city, 0 where the data has none.
+
+    The code is rebuilt from its 6-digit stem (``uf_code`` plus the first four digits of
+    ``city_code``) and the computed check digit, SHIM exceptions included, so data that stores
+    only the stem gets a complete code too.
+
+    Raises:
+        ValueError: If a stored 7-digit code disagrees with its check digit
+    """
+    stored = [
+        f'{city_data.get("uf_code", "")}{city_data.get("city_code", "")}' if city_data.get('city_code') else ''
+        for city_data in cities.values()
+    ]
+    stems = np.array([int(code[:6]) if len(code) >= 6 else 0 for code in stored], dtype=np.int64)
+    codes = np.where(stems > 0, stems * 10 + muni_check_digits(stems), 0)
+    for key, code, computed in zip(cities, stored, codes.tolist(), strict=True):
+        if len(code) == 7 and int(code) != computed:
+            raise ValueError(f'Invalid IBGE code for city {key}: {code}')
+    return codes.astype(np.int32)
+
+
+class PopulationIndex:
+    """States and cities compiled into integer IDs and parallel arrays.
+
+    City ``i`` is described by ``city_keys[i]``, ``city_names[i]``, ``city_state[i]`` and
+    the ``i``-th entry of every city array; ``cep_table`` holds its CEP ranges. Missing
+    numeric fields are NaN (floats) or 0 (codes).
+
+    Attributes:
+        state_names: Full state names, by state ID
+        state_abbrs: State abbreviations (UF), by state ID
+        state_weights: ``population_percentage`` of each state
+        state_regions: Macro-region of each state, '' for states outside ``STATE_REGIONS``
+        state_cpf_regions: CPF fiscal region digit of each state, -1 for states outside ``CPF_FISCAL_REGIONS``
+        city_keys: Keys of the cities in the source data
+        city_names: Display names of the cities
+        city_state: State ID of each city
+        city_population: Resident population of each city
+        city_percentage_total: Share of the national population, in percent
+        city_percentage_state: Share of the state population, in percent
+        city_ddd: Area code of each city
+        city_ibge_code: 7-digit IBGE municipality code of each city, check digit included
+        cep_table: CEP ranges of each city
+    """
+
+    def __init__(self, data: dict[str, Any], cep_ranges_path: str | Path | None = None):
+        """Compile the index.
+
+        Args:
+            data: Population data in either layout, with 'states' and 'cities'
+            cep_ranges_path: Optional br-city-codes style CSV whose ``postalCode_ranges`` replace
+                the CEP ranges of the cities it lists, matched by IBGE code
+
+        Raises:
+            ValueError: If states or cities are missing, or a city references an unknown state
+        """
+        if 'states' not in data or 'cities' not in data:
+            raise ValueError("Population data must have 'states' and 'cities'")
+
+        states = data['states']
+        self.state_names = tuple(states)
+        self.state_abbrs = tuple(state_data['state_abbr'] for state_data in states.values())
+        self.state_weights = np.array([float(state_data['population_percentage']) for state_data in states.values()])
+        self.state_ids = {abbr: state for state, abbr in enumerate(self.state_abbrs)}
+        self.state_regions = tuple(STATE_REGIONS.get(abbr, '') for abbr in self.state_abbrs)
+        self.state_cpf_regions = np.array([CPF_FISCAL_REGIONS.get(abbr, -1) for abbr in self.state_abbrs], dtype=np.int8)
+
+        cities = data['cities']
+        self.city_keys = tuple(cities)
+        try:
+            self.city_state = np.array([self.state_ids[city_data['city_uf']] for city_data in cities.values()], dtype=np.int32)
+        except KeyError as err:
+            raise ValueError(f'City references unknown state: {err}') from err
+
+        self.city_names = tuple(
+            city_data.get('city_name') or key.removesuffix(f'_{city_data["city_uf"]}') for key, city_data in cities.items()
+        )
+        self.city_population = np.array([_optional_float(city_data, 'city_population') for city_data in cities.values()])
+        self.city_percentage_total = np.array([_optional_float(city_data, 'population_percentage_total') for city_data in cities.values()])
+        self.city_percentage_state = np.array([_optional_float(city_data, 'population_percentage_state') for city_data in cities.values()])
+        self.city_ddd = np.array([int(city_data.get('ddd') or 0) for city_data in cities.values()], dtype=np.int16)
+        self.city_ibge_code = _ibge_codes(cities)
+
+        csv_ranges = load_postal_code_ranges(cep_ranges_path) if cep_ranges_path else {}
+        self.cep_table = CepRangeTable([_city_cep_ranges(city_data, csv_ranges) for city_data in cities.values()])
+
+        # Name lookups happen once per caller request, never per draw
+        self.city_ids = {key: city for city, key in enumerate(self.city_keys)}
+        self._city_ids_by_name = {
+            (name, self.state_abbrs[state]): city
+            for city, (name, state) in enumerate(zip(self.city_names, self.city_state.tolist(), strict=True))
+        }
+
+    def __len__(self) -> int:
+        """Number of cities."""
+        return len(self.city_keys)
+
+    def city_id(self, city: str, state_abbr: str | None = None) -> int:
+        """Resolve a city key, or a display name with its state, to a city ID.
+
+        Raises:
+            KeyError: If the city is unknown
+        """
+        if state_abbr is not None and (city, state_abbr) in self._city_ids_by_name:
+            return self._city_ids_by_name[city, state_abbr]
+        return self.city_ids[city]
+
+    def state_cities(self, state: int) -> np.ndarray:
+        """City IDs of a state, in data order."""
+        return np.flatnonzero(self.city_state == state).astype(np.int32)
+
+    def national_city_weights(self) -> np.ndarray:
+        """Nationwide weight of every city.
+
+        Uses ``city_population`` when every city has it, then ``population_percentage_total``,
+        and otherwise falls back to the product of the state weight and the within-state share.
+        """
+        for weights in (self.city_population, self.city_percentage_total):
+            if len(weights) and not np.isnan(weights).any():
+                return weights
+
+        within = self.state_city_weights()
+        state_totals = np.bincount(self.city_state, weights=within, minlength=len(self.state_abbrs))
+        shares = np.divide(within, state_totals[self.city_state], out=np.zeros_like(within), where=state_totals[self.city_state] > 0)
+        return (self.state_weights / self.state_weights.sum())[self.city_state] * shares
+
+    def state_city_weights(self) -> np.ndarray:
+        """Weight of every city within its state: ``population_percentage_state``, else the population."""
+        if np.isnan(self.city_percentage_state).any() and not np.isnan(self.city_population).any():
+            return self.city_population
+        return np.nan_to_num(self.city_percentage_state)
+
+
+def load_population_index(source: str | Path | dict[str, Any], cep_ranges_path: str | Path | None = None) -> PopulationIndex:
+    """Load population data from a JSON path, or use pre-loaded data, and compile it.
+
+    Args:
+        source: Path to the population JSON file, or the loaded dictionary
+        cep_ranges_path: Optional br-city-codes style CSV with ``postalCode_ranges``
+
+    Returns:
+        Compiled PopulationIndex
+    """
+    if isinstance(source, str | Path):
+        with Path(source).open(encoding='utf-8') as file:
+            source = json.load(file)
+    return PopulationIndex(source, cep_ranges_path)
@@ -1,12 +1,16 @@
 """Test configuration and fixtures."""
 
 import json
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
 import pytest
 
-from src.time_period import TimePeriod
+from src.br_name_class import TimePeriod
+
+# Fields of a 2024-layout city record, in the order of the city tuples accepted by ``sampler_data``
+CITY_FIELDS_2024 = ('city_name', 'city_uf', 'city_population', 'cep_range_begins', 'cep_range_ends')
 
 
 @pytest.fixture
@@ -32,3 +36,28 @@ def minimal_test_data() -> dict[str, Any]:
             'top_40': {'TEST': {'percentage': 1.0}},
         },
     }
+
+
+@pytest.fixture
+def sampler_data() -> Callable[..., dict[str, Any]]:
+    """Return a factory of inline location sampler data.
+
+    The factory takes ``states``, mapping state names to ``(state_abbr, population_percentage)``
+    or to full state records, and ``cities``, mapping city keys to full city records or to
+    ``CITY_FIELDS_2024`` tuples. It adds a one-name, one-surname (SILVA) name model.
+    """
+
+    def make(states: dict[str, Any], cities: dict[str, Any]) -> dict[str, Any]:
+        return {
+            'common_names_percentage': {period.value: {'names': {'TEST': {'percentage': 1.0}}, 'total': 1} for period in TimePeriod},
+            'surnames': {'SILVA': {'percentage': 1.0}, 'top_40': {'SILVA': {'percentage': 1.0}}},
+            'states': {
+                name: state if isinstance(state, dict) else {'state_abbr': state[0], 'population_percentage': state[1]}
+                for name, state in states.items()
+            },
+            'cities': {
+                key: city if isinstance(city, dict) else dict(zip(CITY_FIELDS_2024, city, strict=True)) for key, city in cities.items()
+            },
+        }
+
+    return make
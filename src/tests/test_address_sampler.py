@@ -0,0 +1,103 @@
+"""Tests for street-level address generation."""
+
+import random
+import re
+import zipfile
+
+import numpy as np
+import pytest
+
+from src.address_sampler import COMPLEMENTS, BrazilianAddressSampler, StreetIndex
+from src.br_location_class import BrazilianLocationSampler
+
+ADDRESS = re.compile(
+    r'^(?P<street>[^,]+), (?P<number>S/N|\d+)(?:, (?P<complement>[^-]+))?'
+    r' - (?P<bairro>.+), (?P<city>.+) - (?P<uf>[A-Z]{2}), (?P<cep>\d{5}-\d{3})$'
+)
+
+DUMP = """01310100,Avenida Paulista,de 1047 a 1865 - lado ímpar,Bela Vista,1,1
+01310200,Avenida Paulista,,Bela Vista,1,1
+01001000,Praça da Sé,lado ímpar,Sé,1,1
+20040020,Rua da Assembleia,,Centro,2,2
+99999999,Rua Fora,,Lugar Nenhum,3,3
+13000000,,,,4,1
+"""
+
+
+@pytest.fixture
+def location_sampler(sampler_data) -> BrazilianLocationSampler:
+    return BrazilianLocationSampler(
+        sampler_data(
+            {'São Paulo': ('SP', 60.0), 'Rio de Janeiro': ('RJ', 40.0)},
+            {
+                'São Paulo_SP': ('São Paulo', 'SP', 6, '01000-000', '05999-999'),
+                'Campinas_SP': ('Campinas', 'SP', 2, '13000-000', '13139-999'),
+                'Rio de Janeiro_RJ': ('Rio de Janeiro', 'RJ', 4, '20000-000', '23799-999'),
+            },
+        )
+    )
+
+
+def test_synthetic_address(location_sampler) -> None:
+    random.seed(20)
+    sampler = BrazilianAddressSampler(location_sampler)
+    for _ in range(500):
+        match = ADDRESS.match(sampler.get_random_address('Campinas', 'SP'))
+        assert match, 'address does not match the expected format'
+        assert match['city'] == 'Campinas'
+        assert 13_000_000 <= int(match['cep'].replace('-', '')) <= 13_139_999
+        assert match['street'] in sampler.streets
+        assert match['bairro'] in sampler.neighborhoods
+
+
+def test_batch_matches_scalar_vocabulary(location_sampler) -> None:
+    """Batch rows have the scalar format, and a CEP always maps to the same synthetic street."""
+    sampler = BrazilianAddressSampler(location_sampler)
+    columns = sampler.get_random_addresses(20_000, np.random.default_rng(20))
+    rows = columns.to_list()
+    assert len(rows) == len(columns) == 20_000
+    assert all(ADDRESS.match(row) for row in rows)
+    assert columns.to_list(cep_without_dash=True)[0].endswith(f', {columns.location.cep[0]:08d}')
+
+    street, neighborhood = sampler._synthetic_street_ids(columns.location.cep)
+    assert (street == columns.street).all()
+    assert (neighborhood == columns.neighborhood).all()
+    shares = np.bincount(columns.complement, minlength=len(COMPLEMENTS)) / len(columns)
+    assert shares == pytest.approx([weight for _, weight, _, _ in COMPLEMENTS], abs=0.015)
+    assert (columns.number == 0).mean() == pytest.approx(0.03, abs=0.01)
+
+
+def test_street_index(location_sampler, tmp_path) -> None:
+    """Dumps are compiled by CEP into cities; covered cities draw real records."""
+    dump = tmp_path / 'sp.cepaberto_parte_1.csv'
+    dump.write_text(DUMP, encoding='utf-8')
+    archive = tmp_path / 'RJ_part1.zip'
+    with zipfile.ZipFile(archive, 'w') as file:
+        file.writestr('rj.csv', '23000000,Estrada do Mato,,Campo Grande,2,2\n')
+
+    index = StreetIndex.compile([dump, archive], location_sampler.index)
+    assert len(index) == 5
+    assert np.diff(index.offsets).tolist() == [3, 0, 2]
+
+    path = tmp_path / 'streets.npz'
+    index.save(path)
+    sampler = BrazilianAddressSampler(location_sampler, path)
+    random.seed(20)
+    rio = {ADDRESS.match(sampler.get_random_address('Rio de Janeiro', 'RJ'))['street'] for _ in range(200)}
+    assert rio == {'Rua da Assembleia', 'Estrada do Mato'}
+
+    columns = sampler.get_random_addresses(5_000, np.random.default_rng(20))
+    rows = np.array(columns.to_list())
+    city = np.array(columns.location.city_names)[columns.location.city]
+    assert {row.split(',')[0] for row in rows[city == 'São Paulo']} == {'Avenida Paulista', 'Praça da Sé'}
+    assert any('Sé, São Paulo - SP, 01001-000' in row for row in rows[city == 'São Paulo'])
+    assert not set(columns.street[city == 'Campinas']) & set(range(len(sampler.streets) - len(index.streets), len(sampler.streets)))
+
+
+def test_street_index_for_other_data(location_sampler, tmp_path) -> None:
+    dump = tmp_path / 'dump.csv'
+    dump.write_text(DUMP, encoding='utf-8')
+    index = StreetIndex.compile([dump], location_sampler.index)
+    index.city_keys = ('Elsewhere_XX',)
+    with pytest.raises(ValueError, match='different population data'):
+        BrazilianAddressSampler(location_sampler, index)
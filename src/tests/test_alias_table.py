@@ -0,0 +1,81 @@
+"""Tests for the Vose alias table."""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.alias_table import AliasTable
+
+WEIGHTS = [5.0, 0.0, 1.0, 2.5, 0.25, 11.0, 3.0]
+
+
+def chi_square(counts: np.ndarray, weights: list[float]) -> float:
+    """Chi-square statistic of observed counts against weights, ignoring zero-weight cells."""
+    probabilities = np.asarray(weights) / sum(weights)
+    expected = probabilities * counts.sum()
+    mask = expected > 0
+    return float((((counts - expected) ** 2)[mask] / expected[mask]).sum())
+
+
+def chi_square_limit(cells: int) -> float:
+    """Generous acceptance limit: mean plus six standard deviations of a chi-square variable."""
+    dof = cells - 1
+    return dof + 6 * (2 * dof) ** 0.5
+
+
+def test_implied_probabilities_match_weights() -> None:
+    """The table encodes exactly the normalized input distribution."""
+    table = AliasTable(WEIGHTS)
+    np.testing.assert_allclose(table.probabilities, np.asarray(WEIGHTS) / sum(WEIGHTS), atol=1e-12)
+
+
+def test_implied_probabilities_large_random_vector() -> None:
+    weights = np.random.default_rng(7).pareto(1.2, 20_000)
+    table = AliasTable(weights)
+    np.testing.assert_allclose(table.probabilities, weights / weights.sum(), rtol=1e-9, atol=1e-15)
+
+
+def test_scalar_draw_distribution() -> None:
+    random.seed(42)
+    table = AliasTable(WEIGHTS)
+    counts = np.bincount([table.draw() for _ in range(100_000)], minlength=len(WEIGHTS))
+    assert counts[1] == 0
+    assert chi_square(counts, WEIGHTS) < chi_square_limit(len(WEIGHTS) - 1)
+
+
+def test_batch_draw_distribution() -> None:
+    table = AliasTable(WEIGHTS)
+    counts = np.bincount(table.sample(500_000, np.random.default_rng(42)), minlength=len(WEIGHTS))
+    assert counts[1] == 0
+    assert chi_square(counts, WEIGHTS) < chi_square_limit(len(WEIGHTS) - 1)
+
+
+def test_items_are_returned() -> None:
+    table = AliasTable([1.0, 0.0], items=['A', 'B'])
+    assert table.choice() == 'A'
+    assert table.choices(3) == ['A', 'A', 'A']
+
+
+@pytest.mark.parametrize(
+    ('weights', 'message'),
+    [([0.0, 0.0], 'greater than zero'), ([1.0, -1.0], 'finite and non-negative'), ([1.0, float('nan')], 'finite and non-negative')],
+)
+def test_invalid_weights(weights, message) -> None:
+    with pytest.raises(ValueError, match=message):
+        AliasTable(weights)
+
+
+def test_empty_table() -> None:
+    table = AliasTable([])
+    assert len(table) == 0
+    with pytest.raises(IndexError):
+        table.draw()
+
+
+def test_batch_shape_and_scalar_choices() -> None:
+    table = AliasTable([1.0, 3.0], items=['A', 'B'])
+    assert table.sample((10, 2), np.random.default_rng(0)).shape == (10, 2)
+    random.seed(3)
+    draws = table.choices(40_000)
+    assert draws.count('B') / len(draws) == pytest.approx(0.75, abs=0.01)
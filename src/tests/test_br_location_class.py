@@ -0,0 +1,290 @@
+"""Tests for the compiled sampling tables of BrazilianLocationSampler."""
+
+import json
+import random
+import re
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from src.br_location_class import BrazilianLocationSampler
+from src.br_name_class import SURNAME_PREFIX_FORMS_RAW, BrazilianNameSampler
+from src.utils.cpf import CPF_FISCAL_REGIONS, validate_cpf
+
+
+@pytest.fixture
+def location_data(sampler_data):
+    """Two states in the legacy layout, with within-state percentages and no populations."""
+    return sampler_data(
+        {'São Paulo': ('SP', 0.6), 'Rio de Janeiro': ('RJ', 0.4)},
+        {
+            'São Paulo': {
+                'city_uf': 'SP',
+                'population_percentage_state': 0.75,
+                'cep_starts': '01000-000',
+                'cep_ends': '05999-999',
+                'cep_starts_two': '08000-000',
+                'cep_ends_two': '08499-999',
+            },
+            'Campinas': {'city_uf': 'SP', 'population_percentage_state': 0.25, 'cep_starts': '13000-000', 'cep_ends': '13139-999'},
+            'Rio de Janeiro': {'city_uf': 'RJ', 'population_percentage_state': 1.0, 'cep_starts': '20000-000', 'cep_ends': '23799-999'},
+        },
+    )
+
+
+@pytest.fixture
+def location_data_path(location_data, tmp_path):
+    path = tmp_path / 'population.json'
+    path.write_text(json.dumps(location_data), encoding='utf-8')
+    return path
+
+
+def test_state_distribution(location_data_path) -> None:
+    """State draws follow the population percentages."""
+    random.seed(11)
+    sampler = BrazilianLocationSampler(location_data_path)
+    draws = 50_000
+    counts = Counter(sampler.get_state()[1] for _ in range(draws))
+    assert counts['SP'] / draws == pytest.approx(0.6, abs=0.01)
+    assert counts['RJ'] / draws == pytest.approx(0.4, abs=0.01)
+
+
+def test_city_distribution_within_state(location_data_path) -> None:
+    """City draws follow the within-state population percentages."""
+    random.seed(12)
+    sampler = BrazilianLocationSampler(location_data_path)
+    draws = 50_000
+    counts = Counter(sampler.get_city('SP')[0] for _ in range(draws))
+    assert counts['São Paulo'] / draws == pytest.approx(0.75, abs=0.01)
+    assert counts['Campinas'] / draws == pytest.approx(0.25, abs=0.01)
+
+
+def test_unknown_state(location_data_path) -> None:
+    sampler = BrazilianLocationSampler(location_data_path)
+    with pytest.raises(ValueError, match='No cities found for state: XX'):
+        sampler.get_city('XX')
+
+
+def test_name_sampler_is_built_once(location_data_path, tmp_path, monkeypatch) -> None:
+    """get_random_location reuses one name sampler instead of reloading the middle-names file per call."""
+    middle_names_path = tmp_path / 'middle_names.json'
+    middle_names_path.write_text(
+        json.dumps(
+            {
+                'total_people': 10,
+                'total_with_second_names': 5,
+                'percentage_with_second': 50.0,
+                'most_common': [{'name': 'APARECIDA', 'count': 5, 'percentage': '100.0'}],
+            }
+        ),
+        encoding='utf-8',
+    )
+    loads = []
+    original = BrazilianNameSampler._load_middle_names
+    monkeypatch.setattr(BrazilianNameSampler, '_load_middle_names', lambda self, path: loads.append(path) or original(self, path))
+
+    sampler = BrazilianLocationSampler(location_data_path, middle_names_path)
+    for _ in range(50):
+        sampler.get_random_location()
+    assert loads == [middle_names_path]
+
+
+def test_injected_name_sampler(location_data) -> None:
+    """A caller-provided name sampler is used as is."""
+    name_sampler = BrazilianNameSampler(location_data)
+    sampler = BrazilianLocationSampler(location_data, name_sampler=name_sampler)
+    assert sampler.name_sampler is name_sampler
+    # one or two surnames, each SILVA in one of its prefixed forms ('DA SILVA', 'SILVA E', ...)
+    form = '|'.join(re.escape(form.format('SILVA')) for form in SURNAME_PREFIX_FORMS_RAW)
+    for _ in range(50):
+        assert re.fullmatch(f'(?:{form})(?: (?:{form}))?', sampler.get_random_location(only_surname=True, name_raw=True))
+
+
+def test_national_city_table_uses_city_population(location_data) -> None:
+    """The single-draw table follows city_population even when state percentages are rounded."""
+    populations = {'São Paulo': 11_000_000, 'Campinas': 1_000_000, 'Rio de Janeiro': 8_000_000}
+    for city_name, population in populations.items():
+        location_data['cities'][city_name]['city_population'] = population
+
+    sampler = BrazilianLocationSampler(location_data)
+    table = sampler._national_city_table
+    expected = [population / 20_000_000 for population in populations.values()]
+    assert table.probabilities == pytest.approx(expected)
+    assert sampler.index.city_population.tolist() == list(populations.values())
+
+    random.seed(13)
+    draws = 50_000
+    counts = Counter(sampler.get_state_and_city()[2] for _ in range(draws))
+    assert counts['Rio de Janeiro'] / draws == pytest.approx(0.4, abs=0.01)
+    assert counts['Campinas'] / draws == pytest.approx(0.05, abs=0.01)
+
+
+def test_two_stage_flag_keeps_state_then_city(location_data) -> None:
+    """With two_stage=True the state comes from population_percentage, then the city within it."""
+    for city_name, population in {'São Paulo': 11_000_000, 'Campinas': 1_000_000, 'Rio de Janeiro': 8_000_000}.items():
+        location_data['cities'][city_name]['city_population'] = population
+
+    random.seed(14)
+    sampler = BrazilianLocationSampler(location_data, two_stage=True)
+    draws = 50_000
+    counts = Counter(sampler.get_state_and_city()[2] for _ in range(draws))
+    assert counts['Rio de Janeiro'] / draws == pytest.approx(0.4, abs=0.01)
+    assert counts['Campinas'] / draws == pytest.approx(0.15, abs=0.01)
+
+
+def test_batch_locations_columns(location_data) -> None:
+    """Batch rows keep state, city and CEP consistent and follow the city weights."""
+    sampler = BrazilianLocationSampler(location_data)
+    columns = sampler.get_random_locations(60_000, rng=np.random.default_rng(15))
+    assert len(columns) == 60_000
+
+    cities = np.array(columns.city_names)[columns.city]
+    abbrs = np.array(columns.state_abbrs)[columns.state]
+    assert (abbrs[cities == 'Campinas'] == 'SP').all()
+    assert (abbrs[cities == 'Rio de Janeiro'] == 'RJ').all()
+    assert (cities == 'Rio de Janeiro').mean() == pytest.approx(0.4, abs=0.01)
+
+    sao_paulo = columns.cep[cities == 'São Paulo']
+    first_range = (sao_paulo >= 1_000_000) & (sao_paulo <= 5_999_999)
+    second_range = (sao_paulo >= 8_000_000) & (sao_paulo <= 8_499_999)
+    assert (first_range | second_range).all()
+    # Ranges are picked in proportion to their width: 5,000,000 vs 500,000 CEPs
+    assert first_range.mean() == pytest.approx(10 / 11, abs=0.01)
+    campinas = columns.cep[cities == 'Campinas']
+    assert ((campinas >= 13_000_000) & (campinas <= 13_139_999)).all()
+
+
+def test_batch_locations_two_stage(location_data) -> None:
+    """The two-stage batch path draws states first, then cities within them."""
+    sampler = BrazilianLocationSampler(location_data, two_stage=True)
+    columns = sampler.get_random_locations(60_000, rng=np.random.default_rng(16))
+    cities = np.array(columns.city_names)[columns.city]
+    assert (cities == 'Campinas').mean() == pytest.approx(0.15, abs=0.01)
+
+
+def test_batch_locations_formatting(location_data) -> None:
+    """Strings are only built on request and match format_full_location's layout."""
+    del location_data['cities']['Campinas']['cep_starts']
+    sampler = BrazilianLocationSampler(location_data)
+    columns = sampler.get_random_locations(2_000, rng=np.random.default_rng(17))
+
+    rows = columns.to_list()
+    index = int(np.flatnonzero(np.array(columns.city_names)[columns.city] == 'Rio de Janeiro')[0])
+    cep = int(columns.cep[index])
+    assert rows[index] == f'Rio de Janeiro, Rio de Janeiro (RJ), {cep // 1000:05d}-{cep % 1000:03d}'
+    assert columns.to_list(include_cep=False)[index] == 'Rio de Janeiro, Rio de Janeiro (RJ)'
+    assert columns.format_ceps(with_dash=False)[index] == f'{cep:08d}'
+
+    no_cep = np.array(columns.city_names)[columns.city] == 'Campinas'
+    assert (columns.cep[no_cep] == -1).all()
+
+
+def test_cep_ranges_from_csv(location_data, tmp_path) -> None:
+    """A postalCode_ranges CSV replaces the ranges of the cities it lists, matched by IBGE code."""
+    location_data['cities']['Campinas'].update({'uf_code': '35', 'city_code': '09502'})
+    csv_path = tmp_path / 'br-city-codes.csv'
+    csv_path.write_text(
+        'name,state,idIBGE,postalCode_ranges\nCampinas,SP,3509502,[13000-001 13000-010] [13100-000 13100-009] [13200-000 13200-000]\n',
+        encoding='utf-8',
+    )
+    sampler = BrazilianLocationSampler(location_data, cep_ranges_path=csv_path)
+    assert sampler._cep_table.ranges(sampler.index.city_id('Campinas')) == [
+        (13_000_001, 13_000_010),
+        (13_100_000, 13_100_009),
+        (13_200_000, 13_200_000),
+    ]
+    assert sampler._cep_table.ranges(sampler.index.city_id('São Paulo')) == [(1_000_000, 5_999_999), (8_000_000, 8_499_999)]
+    ceps = {sampler._get_random_cep_for_city('Campinas') for _ in range(2_000)}
+    assert 13_200_000 in ceps
+    assert len(ceps) == 21
+
+
+def test_lookup_and_validate_cep(location_data) -> None:
+    """CEPs resolve to their city and state, one at a time or in batch."""
+    sampler = BrazilianLocationSampler(location_data)
+    assert sampler.lookup_cep('08100-000') == ('São Paulo', 'SP', 'São Paulo')
+    assert sampler.lookup_cep(13_050_000) == ('São Paulo', 'SP', 'Campinas')
+    assert sampler.lookup_cep('07000-000') is None
+
+    assert sampler.validate_cep_for_city('20000-000', 'Rio de Janeiro')
+    assert not sampler.validate_cep_for_city('13000-000', 'Rio de Janeiro')
+    assert not sampler.validate_cep_for_city('13000-000', 'Atlantis')
+
+    columns = sampler.get_random_locations(5_000, rng=np.random.default_rng(24))
+    resolved = sampler.lookup_ceps(columns.cep)
+    assert (resolved.city == columns.city).all()
+    assert (resolved.state == columns.state).all()
+
+    names = [sampler.city_names[city] for city in columns.city.tolist()]
+    assert sampler.validate_ceps_for_cities(columns.cep, names).all()
+    assert sampler.validate_ceps_for_cities([7_000_000, 20_000_000], ['São Paulo', 'Atlantis']).tolist() == [False, False]
+    assert sampler.lookup_ceps([7_000_000]).city.tolist() == [-1]
+
+
+def test_lookup_misses_render_empty(location_data) -> None:
+    """to_list leaves CEP lookup misses empty instead of rendering a wrong city."""
+    sampler = BrazilianLocationSampler(location_data)
+    columns = sampler.get_random_locations(200, rng=np.random.default_rng(14))
+    ceps = np.insert(columns.cep, [0, 50, 200], [0, 7_000_000, 99_999_999])
+    rows = sampler.lookup_ceps(ceps).to_list()
+    assert [rows[0], rows[51], rows[-1]] == ['', '', '']
+    assert [row for row in rows if row] == columns.to_list()
+    assert sampler.lookup_ceps(ceps).to_list(include_cep=False)[1:51] == columns.to_list(include_cep=False)[:50]
+    assert sampler.lookup_ceps([0]).to_list() == ['']
+
+
+def test_phones_match_city_ddd(location_data) -> None:
+    """Phone numbers get the area code of the sampled city."""
+    for city_name, ddd in {'São Paulo': '11', 'Campinas': '19', 'Rio de Janeiro': '21'}.items():
+        location_data['cities'][city_name]['ddd'] = ddd
+    sampler = BrazilianLocationSampler(location_data)
+
+    assert sampler.get_random_phone('Campinas').startswith('(19) 9')
+    assert sampler.get_random_phone(state_abbr='RJ', mobile=False, style='e164').startswith('+5521')
+
+    columns = sampler.get_random_locations(5_000, rng=np.random.default_rng(33))
+    phones = sampler.get_random_phones(columns.city, rng=np.random.default_rng(34))
+    expected = np.array([11, 19, 21])[columns.city]
+    assert (phones.ddd == expected).all()
+
+
+def test_phones_need_ddd(location_data) -> None:
+    sampler = BrazilianLocationSampler(location_data)
+    with pytest.raises(ValueError, match='No DDD'):
+        sampler.get_random_phone('Campinas')
+    with pytest.raises(ValueError, match='No DDD'):
+        sampler.get_random_phones(np.array([0, 1]))
+
+
+def test_ibge_codes(location_data) -> None:
+    """IBGE codes are completed from 6-digit stems and carried by batch columns."""
+    location_data['cities']['Campinas'].update({'uf_code': '35', 'city_code': '0950'})
+    sampler = BrazilianLocationSampler(location_data)
+    assert sampler.get_ibge_code('Campinas') == '3509502'
+    with pytest.raises(ValueError, match='No IBGE code'):
+        sampler.get_ibge_code('São Paulo')
+
+    columns = sampler.get_random_locations(500)
+    campinas = np.array(columns.city_names)[columns.city] == 'Campinas'
+    assert (columns.ibge_code[campinas] == 3509502).all()
+    assert (columns.ibge_code[~campinas] == 0).all()
+    assert sampler.validate_ibge_codes([3509502, 3509503, 0]).tolist() == [True, False, False]
+
+    location_data['cities']['Campinas']['city_code'] = '09503'
+    with pytest.raises(ValueError, match='Invalid IBGE code'):
+        BrazilianLocationSampler(location_data)
+
+
+def test_cpfs_match_location_state(location_data) -> None:
+    """Batch CPFs carry the fiscal region digit of each row's state."""
+    sampler = BrazilianLocationSampler(location_data)
+    columns = sampler.get_random_locations(1_000)
+    regions = np.array([CPF_FISCAL_REGIONS[abbr] for abbr in columns.state_abbrs])[columns.state]
+    assert columns.cpf_region.tolist() == regions.tolist()
+    cpfs = columns.random_cpfs(formatted=False, rng=np.random.default_rng(25))
+    assert all(validate_cpf(cpf) for cpf in cpfs)
+    assert [int(cpf[8]) for cpf in cpfs] == regions.tolist()
+
+    missed = sampler.lookup_ceps(np.array([-5, columns.cep[0]]))
+    assert missed.cpf_region.tolist() == [-1, regions[0]]
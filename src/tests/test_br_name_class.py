@@ -0,0 +1,283 @@
+"""Tests for the compiled sampling tables of BrazilianNameSampler."""
+
+import json
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from src.br_name_class import BrazilianNameSampler, TimePeriod, title_case
+
+
+@pytest.fixture
+def weighted_data():
+    return {
+        'common_names_percentage': {
+            period.value: {'names': {'MARIA': {'percentage': 6.0}, 'JOSE': {'percentage': 3.0}, 'ANA': {'percentage': 1.0}}, 'total': 100}
+            for period in TimePeriod
+        },
+        'surnames': {
+            'SILVA': {'percentage': 0.3},
+            'SANTOS': {'percentage': 0.2},
+            'ALMEIDA': {'percentage': 0.5},
+            'top_40': {
+                'SILVA': {'percentage': 0.5},
+                'SANTOS': {'percentage': 0.5},
+            },
+        },
+    }
+
+
+def test_name_tables_compiled_per_period(weighted_data) -> None:
+    """Each time period is compiled into its own table on first use and then reused."""
+    sampler = BrazilianNameSampler(weighted_data)
+    assert sampler._period_models == {}
+
+    sampler.get_random_name(TimePeriod.UNTIL_2010, include_surname=False)
+    assert set(sampler._period_models) == {TimePeriod.UNTIL_2010}
+    table = sampler._period_models[TimePeriod.UNTIL_2010].table
+    assert sampler._period_model('ate2010').table is table
+    assert table.items == ('MARIA', 'JOSE', 'ANA')
+    assert table.probabilities == pytest.approx([0.6, 0.3, 0.1])
+
+
+def test_first_name_distribution(weighted_data) -> None:
+    """Draws follow the percentage weights of the period."""
+    random.seed(1234)
+    sampler = BrazilianNameSampler(weighted_data)
+    draws = 50_000
+    counts = Counter(sampler.get_random_name(raw=True, include_surname=False) for _ in range(draws))
+    assert counts['MARIA'] / draws == pytest.approx(0.6, abs=0.01)
+    assert counts['JOSE'] / draws == pytest.approx(0.3, abs=0.01)
+    assert counts['ANA'] / draws == pytest.approx(0.1, abs=0.01)
+
+
+def test_surname_tables_skip_top_40_entry(weighted_data) -> None:
+    """The nested top_40 dictionary is not a surname."""
+    sampler = BrazilianNameSampler(weighted_data)
+    assert 'top_40' not in sampler.surname_data
+    assert sampler._surname_table.items == ('SILVA', 'SANTOS', 'ALMEIDA')
+    assert sampler._top_40_surname_table.items == ('SILVA', 'SANTOS')
+
+
+def test_surname_pair_format(weighted_data) -> None:
+    """Two surnames by default, one when requested, always from the selected table."""
+    random.seed(5)
+    sampler = BrazilianNameSampler(weighted_data)
+    for _ in range(200):
+        surnames = sampler.get_random_surname(top_40=True, raw=True)
+        assert 'ALMEIDA' not in surnames
+        assert sum(surnames.count(surname) for surname in ('SILVA', 'SANTOS')) == 2
+        single = sampler.get_random_surname(raw=True, with_only_one_surname=True)
+        assert sum(single.count(surname) for surname in ('SILVA', 'SANTOS', 'ALMEIDA')) == 1
+
+
+def test_surname_distribution(weighted_data) -> None:
+    """Surname draws follow the percentage weights."""
+    random.seed(4321)
+    sampler = BrazilianNameSampler(weighted_data)
+    draws = 50_000
+    counts = Counter(sampler._surname_table.choice() for _ in range(draws))
+    assert counts['ALMEIDA'] / draws == pytest.approx(0.5, abs=0.01)
+    assert counts['SILVA'] / draws == pytest.approx(0.3, abs=0.01)
+    assert counts['SANTOS'] / draws == pytest.approx(0.2, abs=0.01)
+
+
+def test_middle_name_distribution(weighted_data, tmp_path) -> None:
+    """Middle names are drawn from the compiled table with the file's percentages."""
+    middle_names_path = tmp_path / 'middle_names.json'
+    middle_names_path.write_text(
+        json.dumps(
+            {
+                'total_people': 100,
+                'total_with_second_names': 40,
+                'percentage_with_second': 40.0,
+                'most_common': [
+                    {'name': 'APARECIDA', 'count': 30, 'percentage': '75.0'},
+                    {'name': 'CRISTINA', 'count': 10, 'percentage': '25.0'},
+                ],
+            }
+        ),
+        encoding='utf-8',
+    )
+    random.seed(99)
+    sampler = BrazilianNameSampler(weighted_data, middle_names_path)
+    draws = 40_000
+    counts = Counter(sampler._get_random_middle_name() for _ in range(draws))
+    assert counts['APARECIDA'] / draws == pytest.approx(0.75, abs=0.01)
+    assert counts['CRISTINA'] / draws == pytest.approx(0.25, abs=0.01)
+
+
+def test_middle_name_mask_rate(weighted_data, tmp_path) -> None:
+    """The batch path gives a middle name to percentage_with_second percent of rows, and only to those."""
+    middle_names_path = tmp_path / 'middle_names.json'
+    middle_names_path.write_text(
+        json.dumps(
+            {
+                'total_people': 100,
+                'total_with_second_names': 40,
+                'percentage_with_second': '40.0',
+                'most_common': [
+                    {'name': 'APARECIDA', 'count': 30, 'percentage': '75.0'},
+                    {'name': 'CRISTINA', 'count': 10, 'percentage': '25.0'},
+                ],
+            }
+        ),
+        encoding='utf-8',
+    )
+    sampler = BrazilianNameSampler(weighted_data, middle_names_path)
+    assert sampler._middle_name_probability == pytest.approx(0.4)
+
+    columns = sampler.get_random_name_columns(50_000, rng=np.random.default_rng(8))
+    has_middle = columns.middle_name >= 0
+    assert has_middle.mean() == pytest.approx(0.4, abs=0.01)
+    assert (columns.middle_name[has_middle] < len(columns.middle_names)).all()
+
+    always = sampler.get_random_name_columns(1_000, always_middle=True, rng=np.random.default_rng(8))
+    assert (always.middle_name >= 0).all()
+
+    middle_names = sampler.get_random_middle_names(20_000, rng=np.random.default_rng(8))
+    assert set(middle_names) == {'Aparecida', 'Cristina'}
+    assert middle_names.count('Aparecida') / 20_000 == pytest.approx(0.75, abs=0.015)
+
+
+def test_middle_name_probability_out_of_range(weighted_data, tmp_path) -> None:
+    """A percentage_with_second outside 0-100 is rejected at load time."""
+    middle_names_path = tmp_path / 'middle_names.json'
+    middle_names_path.write_text(
+        json.dumps(
+            {
+                'total_people': 100,
+                'total_with_second_names': 40,
+                'percentage_with_second': 140,
+                'most_common': [{'name': 'APARECIDA', 'count': 30, 'percentage': '100.0'}],
+            }
+        ),
+        encoding='utf-8',
+    )
+    with pytest.raises(ValueError, match='percentage_with_second'):
+        BrazilianNameSampler(weighted_data, middle_names_path)
+
+
+def test_batch_names_shape_and_format(weighted_data) -> None:
+    """The batch API returns n title-cased names with two surnames by default."""
+    sampler = BrazilianNameSampler(weighted_data)
+    names = sampler.get_random_names(1000, rng=np.random.default_rng(0))
+    assert len(names) == 1000
+    for name in names:
+        first, *surnames = name.split(' ')
+        assert first in {'Maria', 'Jose', 'Ana'}
+        assert surnames
+
+
+def test_batch_names_options(weighted_data) -> None:
+    sampler = BrazilianNameSampler(weighted_data)
+    rng = np.random.default_rng(1)
+    assert all(name.isupper() for name in sampler.get_random_names(200, raw=True, rng=rng))
+    assert sampler.get_random_names(0) == []
+
+    # Only the prefix rules can add words to a single surname from the top 40
+    for name in sampler.get_random_names(500, raw=True, top_40=True, with_only_one_surname=True, rng=rng):
+        assert name.split(' ')[0] in {'MARIA', 'JOSE', 'ANA'}
+        assert 'SILVA' in name or 'SANTOS' in name
+        assert 'ALMEIDA' not in name
+
+
+def test_batch_first_name_distribution(weighted_data) -> None:
+    """The batch path draws first names with the same weights as the scalar path."""
+    sampler = BrazilianNameSampler(weighted_data)
+    draws = 100_000
+    counts = Counter(name.split(' ')[0] for name in sampler.get_random_names(draws, rng=np.random.default_rng(2)))
+    assert counts['Maria'] / draws == pytest.approx(0.6, abs=0.01)
+    assert counts['Jose'] / draws == pytest.approx(0.3, abs=0.01)
+    assert counts['Ana'] / draws == pytest.approx(0.1, abs=0.01)
+
+
+def test_name_columns_codes(weighted_data) -> None:
+    """Columnar output holds compact code arrays into shared vocabularies."""
+    sampler = BrazilianNameSampler(weighted_data)
+    columns = sampler.get_random_name_columns(5000, raw=True, rng=np.random.default_rng(3))
+    assert len(columns) == 5000
+    assert columns.first_name.dtype == np.int32
+    assert columns.surname1.dtype == np.int32
+    assert columns.prefix1.dtype == np.int8
+    assert columns.first_names == ('MARIA', 'JOSE', 'ANA')
+    assert columns.surnames == ('SILVA', 'SANTOS', 'ALMEIDA')
+    assert (columns.middle_name == -1).all()  # no middle names file
+    assert columns.surname2.min() >= 0
+
+    # Only surnames with prefix rules get a prefix
+    almeida = columns.surname1 == columns.surnames.index('ALMEIDA')
+    assert (columns.prefix1[almeida] == 0).all()
+    assert (columns.prefix1[~almeida] > 0).any()
+
+
+def test_name_columns_single_surname(weighted_data) -> None:
+    sampler = BrazilianNameSampler(weighted_data)
+    columns = sampler.get_random_name_columns(100, with_only_one_surname=True, rng=np.random.default_rng(4))
+    assert (columns.surname2 == -1).all()
+    assert (columns.prefix2 == 0).all()
+    assert all(len(name.split(' ')) in {2, 3} for name in columns.to_list())
+
+
+def test_name_columns_to_list_renders_prefixes(weighted_data) -> None:
+    sampler = BrazilianNameSampler(weighted_data)
+    columns = sampler.get_random_name_columns(2000, rng=np.random.default_rng(5))
+    names = columns.to_list()
+    for row, name in enumerate(names):
+        surname = columns.surnames[columns.surname1[row]]
+        rendered = columns.prefixes[columns.prefix1[row]].format(surname)
+        assert name.startswith(f'{columns.first_names[columns.first_name[row]]} {rendered} ')
+
+
+def test_name_columns_to_arrow(weighted_data) -> None:
+    pa = pytest.importorskip('pyarrow')
+    sampler = BrazilianNameSampler(weighted_data)
+    columns = sampler.get_random_name_columns(100, with_only_one_surname=True, rng=np.random.default_rng(6))
+    arrays = columns.to_arrow()
+    assert isinstance(arrays['first_name'], pa.DictionaryArray)
+    assert arrays['first_name'].dictionary.to_pylist() == ['Maria', 'Jose', 'Ana']
+    assert arrays['surname2'].null_count == 100
+    assert arrays['surname1'].dictionary.equals(arrays['surname2'].dictionary)
+    assert arrays['first_name'].to_pylist()[:5] == [columns.first_names[code] for code in columns.first_name[:5]]
+
+
+@pytest.mark.parametrize(
+    ('text', 'leading', 'expected'),
+    [
+        ('MARIA', True, 'Maria'),
+        ('MARIA DAS DORES', True, 'Maria das Dores'),
+        ('JOÃO-PEDRO', True, 'João-Pedro'),
+        ("D'ÁVILA", True, "D'Ávila"),
+        ("D'ÁVILA", False, "d'Ávila"),
+        ('DE JESUS', False, 'de Jesus'),
+        ('SOUZA E SILVA', False, 'Souza e Silva'),
+    ],
+)
+def test_title_case(text, leading, expected) -> None:
+    assert title_case(text, leading) == expected
+
+
+def test_vocabularies_hold_both_renderings(weighted_data) -> None:
+    """Each vocabulary stores the raw and the title-cased column once."""
+    sampler = BrazilianNameSampler(weighted_data)
+    vocabulary = sampler._period_model(TimePeriod.UNTIL_2010).vocabulary
+    assert vocabulary.forms(raw=True) == ('MARIA', 'JOSE', 'ANA')
+    assert vocabulary.forms(raw=False) == ('Maria', 'Jose', 'Ana')
+    assert sampler._surname_vocabulary.title == ('Silva', 'Santos', 'Almeida')
+
+
+def test_elided_prefix_rendering() -> None:
+    """The d' elision attaches to the surname in both raw and title-cased output."""
+    sampler = BrazilianNameSampler(
+        {
+            'common_names_percentage': {period.value: {'names': {'ANA': {'percentage': 1.0}}} for period in TimePeriod},
+            'surnames': {'OLIVEIRA': {'percentage': 1.0}},
+        }
+    )
+    random.seed(8)
+    title = {sampler.get_random_surname(with_only_one_surname=True) for _ in range(500)}
+    raw = {sampler.get_random_surname(raw=True, with_only_one_surname=True) for _ in range(500)}
+    assert title == {'de Oliveira', "d'Oliveira"}
+    assert raw == {'DE OLIVEIRA', "D'OLIVEIRA"}
@@ -0,0 +1,94 @@
+"""Bulk identifier validators agree with the scalar ones on every input form."""
+
+import random
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from src.utils.cei import random_cei, validate_cei, validate_ceis
+from src.utils.cnpj import random_alnum_cnpj, random_cnpj, validate_cnpj, validate_cnpjs
+from src.utils.cpf import random_cpf, validate_cpf, validate_cpfs
+from src.utils.pis import random_pis, validate_pis, validate_pis_batch
+
+VALIDATORS = [
+    (random_cpf, validate_cpf, validate_cpfs),
+    (random_pis, validate_pis, validate_pis_batch),
+    (random_cei, validate_cei, validate_ceis),
+    (random_cnpj, validate_cnpj, validate_cnpjs),
+    (random_alnum_cnpj, validate_cnpj, validate_cnpjs),
+]
+
+
+def _mangle(identifier: str) -> str:
+    """Valid, broken, short, long, zero and oddly punctuated variants of an identifier."""
+    choice = random.randrange(8)
+    if choice == 0:
+        return identifier
+    if choice == 1:
+        return identifier.replace('.', '').replace('-', '').replace('/', '')
+    if choice == 2:
+        position = random.randrange(len(identifier))
+        return identifier[:position] + random.choice('0123456789') + identifier[position + 1 :]
+    if choice == 3:
+        return identifier.lstrip('0.').replace('.', '')[random.randrange(4) :]
+    if choice == 4:
+        return identifier + random.choice(['', '1', ' ', 'x'])
+    if choice == 5:
+        return random.choice(['', '0', '000.000.000-00', ' 0 ', '00000000000000', '-'])
+    if choice == 6:
+        return f' {identifier.lower()} '
+    return ''.join(random.sample(identifier, len(identifier)))
+
+
+@pytest.mark.parametrize(('generate', 'scalar', 'bulk'), VALIDATORS)
+@pytest.mark.parametrize('autopad', [True, False])
+def test_bulk_matches_scalar(generate, scalar, bulk, autopad) -> None:
+    random.seed(23)
+    identifiers = [_mangle(generate(formatted=random.random() < 0.5)) for _ in range(3_000)]
+    if scalar is validate_cnpj:
+        expected = [
+            scalar(identifier, autopad) if not any(c.isalpha() for c in identifier) else scalar(identifier) for identifier in identifiers
+        ]
+    else:
+        expected = [scalar(identifier, autopad) for identifier in identifiers]
+    assert 0.2 < sum(expected) / len(expected) < 0.8
+
+    assert bulk(identifiers, autopad).tolist() == expected
+    assert bulk(np.array(identifiers), autopad).tolist() == expected
+    encoded = np.array([identifier.encode('ascii') for identifier in identifiers])
+    assert bulk(encoded, autopad).tolist() == expected
+    assert bulk(encoded.tobytes(), autopad, width=encoded.itemsize).tolist() == expected
+
+
+def test_raw_buffer_needs_width() -> None:
+    with pytest.raises(ValueError, match='record width'):
+        validate_cpfs(b'52998224725')
+    assert validate_cpfs(b'5299822472511144477735', width=11).tolist() == [True, True]
+    assert validate_cpfs([]).tolist() == []
+
+
+def test_arrow_columns() -> None:
+    pa = pytest.importorskip('pyarrow')
+    random.seed(23)
+    identifiers = [_mangle(random_cpf(formatted=random.random() < 0.5)) for _ in range(3_000)]
+    expected = [validate_cpf(identifier) for identifier in identifiers]
+
+    for kind in (pa.string(), pa.large_string()):
+        column = pa.array(identifiers, type=kind)
+        assert validate_cpfs(column).tolist() == expected
+        assert validate_cpfs(column.slice(1_000, 500)).tolist() == expected[1_000:1_500]
+    chunked = pa.chunked_array([identifiers[:1_000], identifiers[1_000:]])
+    assert validate_cpfs(chunked).tolist() == expected
+
+    assert validate_cpfs(pa.array(['529.982.247-25', '111.444.777-35', '111.444.777-36'])).tolist() == [True, True, False]
+    with_nulls = pa.array(['529.982.247-25', None, '', '11144477735'])
+    assert validate_cpfs(with_nulls).tolist() == [True, False, False, True]
+    with pytest.raises(TypeError, match='string or binary'):
+        validate_cpfs(pa.array([1, 2]))
+
+
+def test_import_does_not_load_pyarrow() -> None:
+    code = 'import sys, src; sys.exit("pyarrow" in sys.modules)'
+    assert subprocess.run([sys.executable, '-c', code], check=False).returncode == 0  # noqa: S603
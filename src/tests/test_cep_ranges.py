@@ -0,0 +1,95 @@
+"""Tests for the compiled CEP range tables."""
+
+import random
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.cep_ranges import CepIndex, CepRangeTable, load_postal_code_ranges, parse_cep, parse_postal_code_ranges
+
+CITY_CODES_CSV = Path(__file__).resolve().parents[2] / 'data' / 'fixing_cities' / 'br-city-codes.csv'
+
+
+def test_parse_cep() -> None:
+    assert parse_cep('01000-001') == 1_000_001
+    assert parse_cep('69945000') == 69_945_000
+    with pytest.raises(ValueError, match='Invalid CEP'):
+        parse_cep('1000-001')
+
+
+def test_parse_postal_code_ranges() -> None:
+    assert parse_postal_code_ranges('[01000-001 05999-999] [08000-000 08499-999]') == [(1_000_001, 5_999_999), (8_000_000, 8_499_999)]
+    assert parse_postal_code_ranges('') == []
+
+
+@pytest.fixture
+def table():
+    return CepRangeTable([[(100, 199), (1_000, 1_899)], [], [(50, 50)], [(7, 9), (20, 21), (30, 31), (40, 42)]])
+
+
+def test_table_layout(table) -> None:
+    """Ranges are stored flat with per-city offsets and a running width total."""
+    assert len(table) == 4
+    assert table.offsets.tolist() == [0, 2, 2, 3, 7]
+    assert table.cumulative.tolist() == [100, 1_000, 1_001, 1_004, 1_006, 1_008, 1_011]
+    assert table.ranges(3) == [(7, 9), (20, 21), (30, 31), (40, 42)]
+    assert table.ranges(1) == []
+
+
+def test_scalar_draws_are_width_proportional(table) -> None:
+    random.seed(21)
+    draws = [table.draw(0) for _ in range(20_000)]
+    assert all(100 <= cep <= 199 or 1_000 <= cep <= 1_899 for cep in draws)
+    assert sum(cep < 1_000 for cep in draws) / len(draws) == pytest.approx(0.1, abs=0.01)
+    assert {table.draw(3) for _ in range(2_000)} == {7, 8, 9, 20, 21, 30, 31, 40, 41, 42}
+    assert table.draw(2) == 50
+    with pytest.raises(ValueError, match='No CEP range'):
+        table.draw(1)
+
+
+def test_batch_sample_matches_ranges(table) -> None:
+    cities = np.repeat(np.arange(4), 10_000)
+    ceps = table.sample(cities, np.random.default_rng(22))
+    assert (ceps[cities == 1] == -1).all()
+    assert (ceps[cities == 2] == 50).all()
+    assert set(np.unique(ceps[cities == 3]).tolist()) == {7, 8, 9, 20, 21, 30, 31, 40, 41, 42}
+    first = ceps[cities == 0]
+    assert (((first >= 100) & (first <= 199)) | ((first >= 1_000) & (first <= 1_899))).all()
+    assert (first < 1_000).mean() == pytest.approx(0.1, abs=0.01)
+
+
+def test_load_postal_code_ranges_from_city_codes() -> None:
+    """The bundled br-city-codes.csv compiles, including the cities with two ranges."""
+    ranges = load_postal_code_ranges(CITY_CODES_CSV)
+    assert ranges['3550308'] == [(1_000_001, 5_999_999), (8_000_000, 8_499_999)]  # São Paulo
+    assert sum(len(city_ranges) > 1 for city_ranges in ranges.values()) == 3
+    assert len(CepRangeTable(list(ranges.values()))) == len(ranges)
+
+
+def test_cep_index_lookup(table) -> None:
+    """The index maps each CEP to the city whose range contains it."""
+    index = CepIndex(table)
+    assert index.starts.tolist() == sorted(index.starts.tolist())
+    assert index.lookup(150) == 0
+    assert index.lookup(1_899) == 0
+    assert index.lookup(50) == 2
+    assert index.lookup(41) == 3
+    assert index.lookup(10) == -1
+    assert index.lookup(6) == -1
+    assert index.lookup(5_000) == -1
+
+    ceps = np.array([150, 1_899, 50, 41, 10, 6, 5_000, 0])
+    assert index.lookup_many(ceps).tolist() == [0, 0, 2, 3, -1, -1, -1, -1]
+
+
+def test_cep_index_round_trip(table) -> None:
+    """Every sampled CEP resolves back to the city it was drawn for."""
+    cities = np.array([0, 2, 3] * 5_000)
+    ceps = table.sample(cities, np.random.default_rng(23))
+    assert (CepIndex(table).lookup_many(ceps) == cities).all()
+
+
+def test_cep_index_rejects_overlaps() -> None:
+    with pytest.raises(ValueError, match='overlap'):
+        CepIndex(CepRangeTable([[(100, 199)], [(150, 250)]]))
@@ -0,0 +1,108 @@
+"""Tests for numeric and alphanumeric CNPJs."""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.document_sampler import DocumentSampler
+from src.utils.cnpj import (
+    alnum_cnpj_check_digits,
+    cnpj_check_digit_matrix,
+    cnpj_check_digits,
+    format_alnum_cnpj,
+    parse_alnum_cnpj,
+    random_alnum_cnpj,
+    random_cnpj_values,
+    random_cnpjs,
+    validate_alnum_cnpj,
+    validate_cnpj,
+    validate_cnpjs,
+)
+from src.utils.util import DEFAULT_RNG
+
+
+def test_alnum_check_digits() -> None:
+    # Example published by the Receita Federal
+    assert alnum_cnpj_check_digits('12.ABC.345/01DE') == (3, 5)
+    assert validate_alnum_cnpj('12.abc.345/01de-35')
+    assert validate_cnpj('12.ABC.345/01DE-35')
+    assert not validate_cnpj('12.ABC.345/01DE-36')
+    # numeric CNPJs are alphanumeric ones too
+    assert alnum_cnpj_check_digits('112223330001') == cnpj_check_digits('112223330001')
+    assert validate_alnum_cnpj('11.222.333/0001-81')
+
+
+@pytest.mark.parametrize('cnpj', ['12ABC34501DE3', '12ABC34501DE3A', '00000000000000', '12ABC34501DE351'])
+def test_invalid_alnum(cnpj: str) -> None:
+    assert not validate_alnum_cnpj(cnpj)
+
+
+def test_format_and_parse() -> None:
+    assert format_alnum_cnpj('12abc34501de35') == '12.ABC.345/01DE-35'
+    parsed = parse_alnum_cnpj('12ABC34501DE35', formatted=False)
+    assert parsed == ('12ABC34501DE35', '12ABC345', '01DE', (3, 5), True)
+    assert parse_alnum_cnpj('12ABC34501DE35').firm == '12.ABC.345'
+    random.seed(22)
+    assert all(validate_alnum_cnpj(random_alnum_cnpj()) for _ in range(1_000))
+
+
+def test_check_digit_matrix_matches_scalar() -> None:
+    random.seed(22)
+    bases = [''.join(random.choices('0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ', k=12)) for _ in range(5_000)]
+    values = np.array([[ord(char) - 48 for char in base] for base in bases])
+    assert cnpj_check_digit_matrix(values).tolist() == [list(alnum_cnpj_check_digits(base)) for base in bases]
+
+
+def test_batch_generation_and_validation() -> None:
+    values = random_cnpj_values(20_000, alphanumeric_share=0.5, rng=np.random.default_rng(22))
+    assert (values[:, 12:] < 10).all()
+    cnpjs = random_cnpjs(20_000, alphanumeric_share=0.5, rng=np.random.default_rng(22))
+    assert sum(any(char.isalpha() for char in cnpj) for cnpj in cnpjs) / len(cnpjs) == pytest.approx(0.5, abs=0.02)
+    assert all(validate_cnpj(cnpj) for cnpj in cnpjs)
+    assert validate_cnpjs(cnpjs).all()
+
+    numeric = random_cnpjs(1_000, formatted=False, rng=np.random.default_rng(22))
+    assert all(cnpj.isdigit() and validate_cnpj(cnpj) for cnpj in numeric)
+    assert validate_cnpjs(np.array(numeric, dtype=bytes)).all()
+
+    broken = [cnpj[:-1] + str((int(cnpj[-1]) + 1) % 10) for cnpj in cnpjs[:1_000]]
+    assert not validate_cnpjs(broken).any()
+    assert validate_cnpjs(['12.abc.345/01de-35', '00.000.000/0000-00', '112223330001', '12ABC34501DEA5', '']).tolist() == [
+        True,
+        False,
+        False,
+        False,
+        False,
+    ]
+
+
+def test_random_cnpjs_follow_shared_generator() -> None:
+    state = DEFAULT_RNG.bit_generator.state
+    first = random_cnpjs(100, alphanumeric_share=0.5)
+    DEFAULT_RNG.bit_generator.state = state
+    assert random_cnpjs(100, alphanumeric_share=0.5) == first
+
+
+def test_document_sampler() -> None:
+    sampler = DocumentSampler()
+    assert validate_cnpj(sampler.generate_cnpj(alphanumeric=True))
+    assert validate_cnpjs(sampler.generate_cnpjs(100, alphanumeric_share=1.0)).all()
+
+
+@pytest.mark.parametrize(
+    ('cnpj', 'expected'),
+    [
+        ('CNPJ: 11.222.333/0001-81', True),
+        ('CNPJ:11.222.333/0001-81', True),
+        ('11.222.333/0001-81 (matriz)', True),
+        ('CNPJ nº 12.ABC.345/01DE-35', True),
+        ('CNPJ: 11.222.333/0001-82', False),
+        ('X11.222.333/0001-81', False),
+        ('CNPJ', False),
+    ],
+)
+def test_labeled_cnpj(cnpj: str, expected: bool) -> None:
+    """Letters of labels around the identifier do not switch numeric CNPJs to the alphanumeric check."""
+    assert validate_cnpj(cnpj) is expected
+    assert validate_cnpjs([cnpj]).tolist() == [expected]
@@ -0,0 +1,73 @@
+"""Tests for batch CPF generation."""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.document_sampler import DocumentSampler
+from src.utils.cpf import (
+    CPF_FISCAL_REGIONS,
+    cpf_check_digit_matrix,
+    cpf_check_digits,
+    cpf_fiscal_region,
+    random_cpf,
+    random_cpf_digits,
+    random_cpfs,
+    render_cpfs,
+    validate_cpf,
+)
+from src.utils.util import DEFAULT_RNG, render_digit_matrix
+
+
+def test_check_digit_matrix_matches_scalar() -> None:
+    random.seed(21)
+    stems = [random.randint(0, 999_999_999) for _ in range(5_000)] + [0, 999_999_999]
+    matrix = np.array([[int(digit) for digit in f'{stem:09d}'] for stem in stems])
+    assert cpf_check_digit_matrix(matrix).tolist() == [list(cpf_check_digits(f'{stem:09d}')) for stem in stems]
+
+
+def test_random_cpfs_validate() -> None:
+    digits = random_cpf_digits(20_000, np.random.default_rng(21))
+    assert digits.shape == (20_000, 11)
+    assert (digits[:, 0] > 0).all()
+    cpfs = render_cpfs(digits, formatted=False).astype(str).tolist()
+    assert all(len(cpf) == 11 and validate_cpf(cpf) for cpf in cpfs)
+
+    formatted = random_cpfs(1_000, rng=np.random.default_rng(21))
+    assert all(cpf[3] == cpf[7] == '.' and cpf[11] == '-' and validate_cpf(cpf) for cpf in formatted)
+    assert DocumentSampler().generate_cpfs(3, formatted=False)[0].isdigit()
+
+
+def test_random_cpfs_follow_shared_generator() -> None:
+    state = DEFAULT_RNG.bit_generator.state
+    first = random_cpfs(100)
+    DEFAULT_RNG.bit_generator.state = state
+    assert random_cpfs(100) == first
+
+
+def test_render_digit_matrix() -> None:
+    assert render_digit_matrix([[1, 2], [0, 9]], '#-#').tolist() == [b'1-2', b'0-9']
+    with pytest.raises(ValueError, match='2 placeholders'):
+        render_digit_matrix([[1, 2, 3]], '#-#')
+
+
+def test_fiscal_region_digit() -> None:
+    assert len(CPF_FISCAL_REGIONS) == 27
+    assert sorted(set(CPF_FISCAL_REGIONS.values())) == list(range(10))
+    for state_abbr in ('SP', 'RJ', 'RS', 'DF'):
+        cpf = random_cpf(state_abbr=state_abbr)
+        assert validate_cpf(cpf)
+        assert cpf_fiscal_region(cpf) == CPF_FISCAL_REGIONS[state_abbr]
+    with pytest.raises(ValueError, match='Unknown state'):
+        random_cpf(state_abbr='XX')
+
+    state_abbrs = list(CPF_FISCAL_REGIONS) * 40
+    cpfs = random_cpfs(len(state_abbrs), rng=np.random.default_rng(25), state_abbrs=state_abbrs)
+    assert all(validate_cpf(cpf) for cpf in cpfs)
+    assert [cpf_fiscal_region(cpf) for cpf in cpfs] == [CPF_FISCAL_REGIONS[abbr] for abbr in state_abbrs]
+    assert {cpf_fiscal_region(cpf) for cpf in DocumentSampler().generate_cpfs(100, state_abbrs='SP')} == {8}
+
+    digits = random_cpf_digits(1_000, np.random.default_rng(25), regions=np.where(np.arange(1_000) % 2, 3, -1))
+    assert (digits[1::2, 8] == 3).all()
+    assert len(set(digits[::2, 8].tolist())) == 10
@@ -0,0 +1,85 @@
+"""Tests for conditional location sampling."""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.br_location_class import BrazilianLocationSampler
+from src.location_filter import FilteredTableCache, LocationFilter
+
+
+@pytest.fixture
+def sampler(sampler_data) -> BrazilianLocationSampler:
+    cities = {
+        'São Paulo_SP': ('São Paulo', 'SP', 11_000_000),
+        'Campinas_SP': ('Campinas', 'SP', 1_000_000),
+        'Rio de Janeiro_RJ': ('Rio de Janeiro', 'RJ', 6_000_000),
+        'Salvador_BA': ('Salvador', 'BA', 2_400_000),
+        'Ilhéus_BA': ('Ilhéus', 'BA', 160_000),
+        'Uauá_BA': ('Uauá', 'BA', 24_000),
+    }
+    return BrazilianLocationSampler(
+        sampler_data(
+            {'São Paulo': ('SP', 50.0), 'Rio de Janeiro': ('RJ', 25.0), 'Bahia': ('BA', 25.0)},
+            {key: (*city, '40000-000', '40000-999') for key, city in cities.items()},
+        )
+    )
+
+
+def test_create_normalizes() -> None:
+    assert LocationFilter.create(regions='Nordeste', states=['sp', 'RJ']) == LocationFilter.create(
+        regions=['nordeste'], states=('RJ', 'SP')
+    )
+    assert LocationFilter.create(regions='Centro Oeste').regions == frozenset({'centro-oeste'})
+    with pytest.raises(ValueError, match='Unknown region: atlantida'):
+        LocationFilter.create(regions='atlantida')
+    with pytest.raises(ValueError, match='Empty population range'):
+        LocationFilter.create(min_population=10, max_population=5)
+
+
+def test_filtered_city_draws(sampler) -> None:
+    """Scalar draws stay inside the filter and follow the renormalized populations."""
+    random.seed(18)
+    nordeste = LocationFilter.create(regions='nordeste')
+    draws = [sampler.get_filtered_city(nordeste) for _ in range(20_000)]
+    assert {state for _, state in draws} == {'BA'}
+    share = sum(city == 'Salvador' for city, _ in draws) / len(draws)
+    assert share == pytest.approx(2_400_000 / 2_584_000, abs=0.01)
+
+    big = LocationFilter.create(states=['SP', 'BA'], min_population=100_000, max_population=5_000_000)
+    assert {sampler.get_filtered_city(big)[0] for _ in range(2_000)} == {'Campinas', 'Salvador', 'Ilhéus'}
+
+
+def test_filtered_batch(sampler) -> None:
+    columns = sampler.get_random_locations(10_000, np.random.default_rng(18), LocationFilter.create(states='RJ'))
+    assert set(columns.to_list(include_cep=False)) == {'Rio de Janeiro, Rio de Janeiro (RJ)'}
+    assert (columns.cep // 1000 == 40_000).all()
+
+
+def test_filter_errors(sampler) -> None:
+    with pytest.raises(ValueError, match='Unknown state: XX'):
+        sampler.get_filtered_city(LocationFilter.create(states='XX'))
+    with pytest.raises(ValueError, match='No cities match filter'):
+        sampler.get_filtered_city(LocationFilter.create(regions='sul'))
+
+
+def test_cache_counters_and_eviction(sampler) -> None:
+    nordeste = LocationFilter.create(regions='nordeste')
+    for _ in range(3):
+        sampler.get_filtered_city(nordeste)
+    sampler.get_random_locations(10, location_filter=LocationFilter.create(regions=['Nordeste']))
+    info = sampler.filter_cache_info()
+    assert (info.hits, info.misses, info.currsize) == (3, 1, 1)
+
+    cache = FilteredTableCache(sampler.index, sampler.index.city_population, maxsize=2)
+    sp, rj = LocationFilter.create(states='SP'), LocationFilter.create(states='RJ')
+    cache.get(sp)
+    cache.get(rj)
+    cache.get(sp)
+    cache.get(nordeste)  # evicts RJ, the least recently used
+    cache.get(sp)
+    cache.get(rj)
+    assert cache.cache_info() == (2, 4, 2, 2)
+    cache.clear()
+    assert cache.cache_info() == (0, 0, 2, 0)
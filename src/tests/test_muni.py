@@ -0,0 +1,39 @@
+"""Tests for IBGE municipality code check digits."""
+
+import numpy as np
+import pytest
+
+from src.utils.muni import SHIM, muni_check_digit, muni_check_digits, muni_code, validate_muni, validate_munis
+
+
+@pytest.mark.parametrize(
+    ('code', 'expected'), [('3509502', True), ('2201903', True), ('3509503', False), ('0509502', False), ('350950', False)]
+)
+def test_validate_muni(code: str, expected: bool) -> None:
+    assert validate_muni(code) is expected
+
+
+@pytest.mark.parametrize('code', sorted(SHIM))
+def test_shim_exceptions(code: str) -> None:
+    assert validate_muni(code)
+    assert muni_check_digit(code[:6]) == int(code[-1])
+    assert muni_code(code[:6]) == int(code)
+
+
+def test_check_digits_match_scalar() -> None:
+    stems = np.arange(110_000, 530_000, 997)
+    assert muni_check_digits(stems).tolist() == [muni_check_digit(str(stem)) for stem in stems.tolist()]
+
+
+def test_validate_munis() -> None:
+    codes = np.array([3509502, 3509503, 2201919, 2201910, 123, 99_999_999])
+    assert validate_munis(codes).tolist() == [True, False, True, False, False, False]
+    assert validate_munis(np.array([], dtype=np.int64)).tolist() == []
+
+
+def test_validate_munis_matches_scalar_on_shim_stems() -> None:
+    """Both the SHIM digit and the computed digit of an exception stem are accepted, as by validate_muni."""
+    codes = [int(code[:6]) * 10 + digit for code in sorted(SHIM) for digit in range(10)]
+    assert validate_munis(np.array(codes)).tolist() == [validate_muni(str(code)) for code in codes]
+    assert validate_muni('2201911')
+    assert validate_munis([2201911, 2201919]).tolist() == [True, True]
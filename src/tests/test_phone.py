@@ -0,0 +1,73 @@
+"""Tests for Brazilian phone number generation."""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.utils.phone import VALID_DDDS, format_phone, random_phone, random_phones, validate_phone
+from src.utils.util import render_digits
+
+
+def test_render_digits() -> None:
+    assert render_digits([1234567890, 5], '(##) ####-####') == ['(12) 3456-7890', '(00) 0000-0005']
+    assert render_digits([], '##') == []
+
+
+def test_format_phone_styles() -> None:
+    assert format_phone(11, 912345678) == '(11) 91234-5678'
+    assert format_phone(11, 23456789) == '(11) 2345-6789'
+    assert format_phone(21, 987654321, style='e164') == '+5521987654321'
+    assert format_phone(21, 33334444, style='digits') == '2133334444'
+
+
+def test_random_phone() -> None:
+    random.seed(31)
+    for _ in range(200):
+        mobile = random_phone(61)
+        landline = random_phone('61', mobile=False, style='e164')
+        assert validate_phone(mobile)
+        assert validate_phone(landline)
+        assert mobile.startswith('(61) 9')
+        assert landline.startswith('+5561')
+        assert len(landline) == 13
+    with pytest.raises(ValueError, match='Invalid DDD'):
+        random_phone(20)
+
+
+@pytest.mark.parametrize(
+    ('phone', 'expected'),
+    [
+        ('(11) 98765-4321', True),
+        ('+55 11 2345-6789', True),
+        ('5511987654321', True),
+        ('(20) 98765-4321', False),  # DDD not in use
+        ('(11) 81234-5678', False),  # 9 digits not starting with 9
+        ('(11) 95234-5678', False),  # mobile second digit below 6
+        ('(11) 7345-6789', False),  # landline must start with 2-5
+        ('+1 11 98765-4321', False),
+        ('1234', False),
+    ],
+)
+def test_validate_phone(phone, expected) -> None:
+    assert validate_phone(phone) is expected
+
+
+def test_random_phones_batch() -> None:
+    """Batch numbers keep each row's DDD, follow the mobile share and render valid strings."""
+    ddds = np.array(sorted(VALID_DDDS) * 300)
+    phones = random_phones(ddds, mobile_share=0.75, rng=np.random.default_rng(32))
+    assert len(phones) == len(ddds)
+    assert (phones.ddd == ddds).all()
+    assert phones.mobile.mean() == pytest.approx(0.75, abs=0.01)
+    assert ((phones.number[phones.mobile] >= 960_000_000) & (phones.number[phones.mobile] < 10**9)).all()
+    assert ((phones.number[~phones.mobile] >= 20_000_000) & (phones.number[~phones.mobile] < 60_000_000)).all()
+
+    formatted = phones.to_list()
+    assert all(validate_phone(phone) for phone in formatted)
+    assert formatted[0] == format_phone(ddds[0], int(phones.number[0]))
+    e164 = phones.to_list(style='e164')
+    assert all(phone.startswith(f'+55{ddd}') for phone, ddd in zip(e164, ddds.tolist(), strict=True))
+
+    with pytest.raises(ValueError, match='Invalid DDD: 100'):
+        random_phones([11, 100])
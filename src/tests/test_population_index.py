@@ -0,0 +1,122 @@
+"""Tests for the schema-normalizing population index."""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.br_location_class import BrazilianLocationSampler
+from src.population_index import PopulationIndex, load_population_index
+from src.utils.muni import validate_munis
+
+POPULATION_DATA = Path(__file__).resolve().parents[2] / 'data' / 'fixing_cities' / 'population_data_2024_complete_revised.json'
+
+
+@pytest.fixture
+def data_2024():
+    """Two states in the 2024 layout, with a city name shared by both."""
+    return {
+        'states': {
+            'Piauí': {'state_abbr': 'PI', 'state_population': 3_000, 'population_percentage': 30.0},
+            'Maranhão': {'state_abbr': 'MA', 'state_population': 7_000, 'population_percentage': 70.0},
+        },
+        'cities': {
+            'Bom Jesus_PI': {
+                'city_name': 'Bom Jesus',
+                'city_uf': 'PI',
+                'uf_code': '22',
+                'city_code': '01903',
+                'city_population': 3_000,
+                'population_percentage_total': 30.0,
+                'population_percentage_state': 100.0,
+                'ddd': '89',
+                'cep_range_begins': '64900-000',
+                'cep_range_ends': '64909-999',
+            },
+            'Bom Jesus_MA': {
+                'city_name': 'Bom Jesus',
+                'city_uf': 'MA',
+                'uf_code': '21',
+                'city_code': '01939',
+                'city_population': 7_000,
+                'population_percentage_total': 70.0,
+                'population_percentage_state': 100.0,
+                'ddd': '99',
+                'cep_range_begins': '65935-000',
+                'cep_range_ends': '65935-999',
+                'cep_range_begins_two': '65936-000',
+                'cep_range_ends_two': '65936-099',
+            },
+        },
+    }
+
+
+def test_2024_layout(data_2024) -> None:
+    """Keys, display names, codes and CEP ranges are compiled into parallel arrays."""
+    index = PopulationIndex(data_2024)
+    assert len(index) == 2
+    assert index.city_keys == ('Bom Jesus_PI', 'Bom Jesus_MA')
+    assert index.city_names == ('Bom Jesus', 'Bom Jesus')
+    assert index.city_state.tolist() == [0, 1]
+    assert index.city_ddd.tolist() == [89, 99]
+    assert index.city_ibge_code.tolist() == [2201903, 2101939]
+    assert index.cep_table.ranges(1) == [(65_935_000, 65_935_999), (65_936_000, 65_936_099)]
+    assert index.national_city_weights().tolist() == [3_000, 7_000]
+
+    assert index.city_id('Bom Jesus', 'MA') == 1
+    assert index.city_id('Bom Jesus_PI') == 0
+    with pytest.raises(KeyError):
+        index.city_id('Bom Jesus')
+
+
+def test_legacy_layout_falls_back_to_two_stage_weights() -> None:
+    """Without populations, the nationwide weight is state weight times within-state share."""
+    index = PopulationIndex(
+        {
+            'states': {
+                'São Paulo': {'state_abbr': 'SP', 'population_percentage': 60},
+                'Rio de Janeiro': {'state_abbr': 'RJ', 'population_percentage': 40},
+            },
+            'cities': {
+                'São Paulo': {'city_uf': 'SP', 'population_percentage_state': 75, 'cep_starts': '01000-000', 'cep_ends': '05999-999'},
+                'Campinas': {'city_uf': 'SP', 'population_percentage_state': 25, 'cep_starts': '13000-000', 'cep_ends': '13139-999'},
+                'Rio de Janeiro': {'city_uf': 'RJ', 'population_percentage_state': 100},
+            },
+        }
+    )
+    assert index.city_names == ('São Paulo', 'Campinas', 'Rio de Janeiro')
+    assert index.city_ibge_code.tolist() == [0, 0, 0]
+    assert np.isnan(index.city_population).all()
+    assert index.national_city_weights() == pytest.approx([0.45, 0.15, 0.4])
+    assert index.cep_table.ranges(2) == []
+
+
+def test_unknown_state_is_rejected(data_2024) -> None:
+    data_2024['cities']['Bom Jesus_PI']['city_uf'] = 'XX'
+    with pytest.raises(ValueError, match='unknown state'):
+        PopulationIndex(data_2024)
+
+
+def test_sampler_on_2024_layout(data_2024, sampler_data) -> None:
+    """The sampler runs on the 2024 layout and resolves shared city names by state."""
+    sampler = BrazilianLocationSampler(sampler_data(data_2024['states'], data_2024['cities']))
+
+    location = sampler.format_full_location('Bom Jesus', 'Maranhão', 'MA')
+    assert location.startswith('Bom Jesus, Maranhão (MA), 6593')
+    assert sampler.lookup_cep('64905-123') == ('Piauí', 'PI', 'Bom Jesus')
+    assert sampler.validate_cep_for_city('65936-050', 'Bom Jesus', 'MA')
+    assert not sampler.validate_cep_for_city('65936-050', 'Bom Jesus', 'PI')
+    assert sampler.get_random_location(city_only=True) == 'Bom Jesus'
+
+
+def test_bundled_population_file() -> None:
+    """The bundled 2024 file compiles with a CEP range, DDD and IBGE code for every city."""
+    index = load_population_index(POPULATION_DATA)
+    assert len(index) == 5_570
+    assert len(index.state_abbrs) == 27
+    assert validate_munis(index.city_ibge_code).all()
+    assert (index.city_ddd > 10).all()
+    assert (np.diff(index.cep_table.offsets) >= 1).all()
+    with POPULATION_DATA.open(encoding='utf-8') as file:
+        assert index.city_population.sum() == json.load(file)['brasil']['total_population']
@@ -0,0 +1,109 @@
+"""Distribution parity of the compiled surname prefix tables with the original prefix rules."""
+
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from src.br_name_class import SURNAME_PREFIX_FORMS, BrazilianNameSampler, TimePeriod
+
+DRAWS = 100_000
+TOLERANCE = 0.006
+
+
+def reference_apply_prefix(surname: str) -> str:
+    """The branching prefix rules as they were written before the tables were compiled."""
+    is_raw = surname.isupper()
+    surname_upper = surname.upper()
+
+    if surname_upper in BrazilianNameSampler.SURNAME_PREFIXES:
+        if surname_upper in ['SANTOS', 'SILVA']:
+            compound_chance = random.random()
+            if compound_chance < 0.05:
+                return f'{surname} {"E" if is_raw else "e"}'
+            if compound_chance < 0.15:
+                compound_prefix = ('DA' if random.random() < 0.7 else 'DO') if is_raw else ('da' if random.random() < 0.7 else 'do')
+                return f'{surname} {compound_prefix}'
+
+        prefix_options = BrazilianNameSampler.SURNAME_PREFIXES[surname_upper]
+        total_weight = sum(weight for _, weight in prefix_options)
+        rand = random.random() * total_weight
+
+        cumulative = 0
+        for candidate_prefix, weight in prefix_options:
+            cumulative += weight
+            if rand <= cumulative:
+                final_prefix = candidate_prefix
+                if final_prefix in ['da', 'do'] and random.random() < 0.08:
+                    final_prefix = ('DOS' if final_prefix == 'do' else 'DAS') if is_raw else ('dos' if final_prefix == 'do' else 'das')
+                elif final_prefix == 'de' and surname[0].lower() in 'aeiou' and random.random() < 0.7:
+                    final_prefix = "D'" if is_raw else "d'"
+                else:
+                    final_prefix = final_prefix.upper() if is_raw else final_prefix
+                # The elided form is now rendered without a space ("d'Oliveira"); only the rendering changed
+                return f'{final_prefix}{surname}' if final_prefix in ["d'", "D'"] else f'{final_prefix} {surname}'
+
+    return surname
+
+
+@pytest.fixture
+def sampler():
+    surnames = {surname: {'percentage': 1.0} for surname in [*BrazilianNameSampler.SURNAME_PREFIXES, 'ALMEIDA', 'ARAUJO']}
+    return BrazilianNameSampler(
+        {
+            'common_names_percentage': {period.value: {'names': {'MARIA': {'percentage': 1.0}}} for period in TimePeriod},
+            'surnames': {**surnames, 'top_40': surnames},
+        }
+    )
+
+
+def frequencies(outputs: list[str]) -> dict[str, float]:
+    return {output: count / len(outputs) for output, count in Counter(outputs).items()}
+
+
+def assert_close(observed: dict[str, float], expected: dict[str, float]) -> None:
+    for output in set(observed) | set(expected):
+        assert observed.get(output, 0.0) == pytest.approx(expected.get(output, 0.0), abs=TOLERANCE), output
+
+
+@pytest.mark.parametrize('surname', [*BrazilianNameSampler.SURNAME_PREFIXES, 'ALMEIDA'])
+@pytest.mark.parametrize('raw', [True, False])
+def test_compiled_table_matches_reference_rules(sampler, surname, raw) -> None:
+    """Scalar draws from the compiled table reproduce the output distribution of the original rules."""
+    rendered = surname if raw else surname.title()
+    random.seed(2024)
+    reference = frequencies([reference_apply_prefix(rendered) for _ in range(DRAWS)])
+    compiled = frequencies([sampler._apply_prefix(rendered) for _ in range(DRAWS)])
+    assert_close(compiled, reference)
+
+
+@pytest.mark.parametrize('surname', list(BrazilianNameSampler.SURNAME_PREFIXES))
+def test_exact_probabilities_match_reference_rules(sampler, surname) -> None:
+    """The precompiled probabilities agree with a Monte Carlo estimate of the original rules."""
+    random.seed(7)
+    reference = frequencies([reference_apply_prefix(surname.title()) for _ in range(DRAWS)])
+    exact = {
+        SURNAME_PREFIX_FORMS[code].format(surname.title()): probability
+        for code, probability in enumerate(sampler._prefix_form_probabilities(surname))
+        if probability > 0
+    }
+    assert sum(exact.values()) == pytest.approx(1.0)
+    assert_close(reference, exact)
+
+
+def test_vectorized_draws_match_probabilities(sampler) -> None:
+    """One vectorized uniform draw per surname follows each surname's compiled distribution."""
+    table = sampler._surname_table
+    codes = np.repeat(np.arange(len(table)), 20_000)
+    prefixes = sampler._draw_prefix_codes(sampler._surname_prefix_rows[codes], np.random.default_rng(11))
+    for code, surname in enumerate(table.items):
+        observed = np.bincount(prefixes[codes == code], minlength=len(SURNAME_PREFIX_FORMS)) / 20_000
+        np.testing.assert_allclose(observed, sampler._prefix_form_probabilities(surname), atol=0.012)
+
+
+def test_surnames_without_rules_never_get_prefix(sampler) -> None:
+    assert sampler._prefix_form_probabilities('ALMEIDA')[0] == 1.0
+    columns = sampler.get_random_name_columns(5000, raw=True, rng=np.random.default_rng(0))
+    plain = np.isin(columns.surname1, [columns.surnames.index('ALMEIDA'), columns.surnames.index('ARAUJO')])
+    assert (columns.prefix1[plain] == 0).all()
@@ -0,0 +1,70 @@
+"""Tests for collision-free identifier streams."""
+
+import numpy as np
+import pytest
+
+from src.utils.cei import validate_cei
+from src.utils.cnpj import validate_cnpj
+from src.utils.cpf import validate_cpf, validate_cpfs
+from src.utils.pis import validate_pis
+from src.utils.unique import FeistelPermutation, UniqueIdStream, UniqueSequence
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 10, 1_000, 65_537])
+def test_permutation_is_bijection(size: int) -> None:
+    permutation = FeistelPermutation(size, key='bijection')
+    values = permutation.permute_many(np.arange(size))
+    assert sorted(values.tolist()) == list(range(size))
+    assert [permutation.permute(i) for i in range(min(size, 500))] == values[:500].tolist()
+
+
+def test_keys_change_the_order() -> None:
+    first = FeistelPermutation(10_000, key='a').permute_many(np.arange(10_000))
+    assert not np.array_equal(first, FeistelPermutation(10_000, key='b').permute_many(np.arange(10_000)))
+    assert np.array_equal(first, FeistelPermutation(10_000, key='a').permute_many(np.arange(10_000)))
+
+
+def test_shards_partition_the_domain() -> None:
+    shards = [UniqueSequence(1_001, key=3, shard=shard, shards=4) for shard in range(4)]
+    values = [sequence.take(10_000) for sequence in shards]
+    assert sum(len(shard) for shard in values) == 1_001
+    assert sorted(np.concatenate(values).tolist()) == list(range(1_001))
+    assert all(sequence.remaining == 0 and sequence.take(5).size == 0 for sequence in shards)
+    with pytest.raises(StopIteration):
+        next(shards[0])
+
+
+def test_resume_from_counter() -> None:
+    stream = UniqueIdStream('cpf', key='resume', shard=1, shards=3)
+    head = stream.take(250)
+    tail = stream.take(250)
+    resumed = UniqueIdStream('cpf', key='resume', shard=1, shards=3, counter=250)
+    assert resumed.take(250) == tail
+    assert next(UniqueIdStream('cpf', key='resume', shard=1, shards=3)) == head[0]
+    assert stream.counter == 500
+
+
+def test_million_cpfs_are_distinct_and_valid() -> None:
+    cpfs = UniqueIdStream('cpf', key=0).take_bytes(1_000_000, formatted=False)
+    assert len(np.unique(cpfs)) == 1_000_000
+    assert validate_cpfs(cpfs).all()
+
+
+@pytest.mark.parametrize(
+    ('identifier', 'validate'), [('cpf', validate_cpf), ('pis', validate_pis), ('cei', validate_cei), ('cnpj', validate_cnpj)]
+)
+def test_streams_yield_valid_identifiers(identifier: str, validate) -> None:
+    values = UniqueIdStream(identifier, key=identifier).take(2_000)
+    assert len(set(values)) == 2_000
+    assert all(validate(value) for value in values)
+    bare = UniqueIdStream(identifier, key=identifier).take(10, formatted=False)
+    assert all(value.isdigit() for value in bare)
+
+
+def test_invalid_arguments() -> None:
+    with pytest.raises(ValueError, match='Unknown identifier'):
+        UniqueIdStream('rg', key=0)
+    with pytest.raises(ValueError, match='Shard must be'):
+        UniqueSequence(10, key=0, shard=2, shards=2)
+    with pytest.raises(ValueError, match='out of range'):
+        FeistelPermutation(10, key=0).permute(10)
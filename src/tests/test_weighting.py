@@ -0,0 +1,105 @@
+"""Tests for location weighting scenarios."""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.alias_table import AliasTable
+from src.br_location_class import BrazilianLocationSampler
+from src.weighting import WeightingScenario, compile_scenario
+
+POPULATIONS = {'São Paulo_SP': 8_000, 'Campinas_SP': 1_000, 'Rio de Janeiro_RJ': 1_000}
+
+
+@pytest.fixture
+def sampler(sampler_data) -> BrazilianLocationSampler:
+    return BrazilianLocationSampler(
+        sampler_data(
+            {'São Paulo': ('SP', 90.0), 'Rio de Janeiro': ('RJ', 10.0)},
+            {key: (key[:-3], key[-2:], population, '01000-000', '01000-999') for key, population in POPULATIONS.items()},
+        )
+    )
+
+
+def _shares(sampler: BrazilianLocationSampler) -> list[float]:
+    return sampler._national_city_table.probabilities.tolist()
+
+
+def test_multipliers(sampler) -> None:
+    base = sampler.index.national_city_weights()
+    weights = WeightingScenario(city_multipliers={'Campinas_SP': 3.0}, state_multipliers={'RJ': 2.0}).weights(sampler.index, base)
+    assert weights.tolist() == pytest.approx([1.0, 0.375, 0.25])
+    small = WeightingScenario(population_bands=((None, 1_000, 10.0), (5_000, None, 0.0))).weights(sampler.index, base)
+    assert small.tolist() == pytest.approx([0.0, 1.25, 1.25])
+
+
+def test_temperature(sampler) -> None:
+    base = sampler.index.national_city_weights()
+    flat = WeightingScenario(temperature=1e9).weights(sampler.index, base)
+    assert flat.tolist() == pytest.approx([1.0, 1.0, 1.0])
+    sharp = WeightingScenario(temperature=0.5).weights(sampler.index, base)
+    assert sharp.tolist() == pytest.approx([1.0, 1 / 64, 1 / 64])
+
+
+@pytest.mark.parametrize(
+    ('scenario', 'message'),
+    [
+        (WeightingScenario(temperature=0), 'Temperature must be positive'),
+        (WeightingScenario(city_multipliers={'Nowhere_XX': 2.0}), 'Unknown city: Nowhere_XX'),
+        (WeightingScenario(state_multipliers={'XX': 2.0}), 'Unknown state: XX'),
+        (WeightingScenario(state_multipliers={'SP': -1.0}), 'finite and non-negative'),
+        (WeightingScenario(state_multipliers={'SP': 0.0, 'RJ': 0.0}), 'greater than zero'),
+    ],
+)
+def test_invalid_scenario(sampler, scenario, message) -> None:
+    before = _shares(sampler)
+    with pytest.raises(ValueError, match=message):
+        sampler.set_scenario(scenario)
+    assert sampler.scenario is None
+    assert _shares(sampler) == before
+
+
+def test_sampler_scenario(sampler) -> None:
+    """A scenario reweights scalar, batch, two-stage and filtered draws alike."""
+    sampler.set_scenario(WeightingScenario(temperature=1e9))
+    assert _shares(sampler) == pytest.approx([1 / 3] * 3)
+    random.seed(19)
+    rj = sum(sampler.get_state()[1] == 'RJ' for _ in range(30_000)) / 30_000
+    assert rj == pytest.approx(1 / 3, abs=0.015)
+    sampler.two_stage = True
+    columns = sampler.get_random_locations(30_000, np.random.default_rng(19))
+    assert np.bincount(columns.city, minlength=3) / 30_000 == pytest.approx([1 / 3] * 3, abs=0.015)
+
+    sampler.set_scenario(None)
+    assert _shares(sampler) == pytest.approx([0.8, 0.1, 0.1])
+
+
+def test_disk_cache(sampler, tmp_path, monkeypatch) -> None:
+    scenario = WeightingScenario(state_multipliers={'RJ': 4.0}, temperature=2.0)
+    base = sampler.index.national_city_weights()
+    built = compile_scenario(sampler.index, scenario, base, tmp_path)
+    assert len(list(tmp_path.glob('scenario-*.npz'))) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError('cached scenario was rebuilt')
+
+    monkeypatch.setattr(AliasTable, '__init__', fail)
+    loaded = compile_scenario(sampler.index, scenario, base, tmp_path)
+    assert loaded.prob.tolist() == built.prob.tolist()
+    assert loaded.alias.tolist() == built.alias.tolist()
+    assert loaded.probabilities.tolist() == pytest.approx(built.probabilities.tolist())
+    assert scenario.fingerprint(sampler.index, base) != scenario._replace(temperature=3.0).fingerprint(sampler.index, base)
+
+
+def test_disk_cache_misses_on_new_populations(sampler, tmp_path) -> None:
+    """Population bands read city populations, so changing them must not reuse a cached table."""
+    scenario = WeightingScenario(population_bands=((None, 1_000, 10.0),))
+    base = sampler.index.national_city_weights()
+    built = compile_scenario(sampler.index, scenario, base, tmp_path)
+    assert built.probabilities.tolist() == pytest.approx([8 / 28, 10 / 28, 10 / 28])
+
+    sampler.index.city_population = np.array([8_000.0, 1_000.0, 5_000.0])
+    rebuilt = compile_scenario(sampler.index, scenario, base, tmp_path)
+    assert len(list(tmp_path.glob('scenario-*.npz'))) == 2
+    assert rebuilt.probabilities.tolist() == pytest.approx([8 / 19, 10 / 19, 1 / 19])
@@ -1 +1 @@
-__all__ = ['cnpj', 'cei', 'pis', 'cpf']
+__all__ = ['cnpj', 'cei', 'pis', 'cpf', 'phone', 'muni', 'unique']
@@ -4,7 +4,9 @@
 import random
 import re
 
-from .util import clean_id, pad_id
+import numpy as np
+
+from .util import clean_id, int_digit_matrix, pad_id, render_digit_matrix, validate_ids
 
 """
 Functions for working with Brazilian CEI identifiers.
@@ -13,6 +15,7 @@ Functions for working with Brazilian CEI identifiers.
 
 NONDIGIT = re.compile(r'[^0-9]')
 CEI_WEIGHTS = [7, 4, 1, 8, 5, 2, 1, 6, 3, 7, 4]
+CEI_TEMPLATES = {True: '##.###.#####/##', False: '############'}
 
 
 def validate_cei(cei, autopad=True):
@@ -76,3 +79,36 @@ def _cei_check(digits):
     if modulo == 0:
         return 0
     return 10 - modulo
+
+
+def cei_check_digit_matrix(stems):
+    """Find the check digit for each row of an (N, 11) digit matrix."""
+    digsum = np.asarray(stems, dtype=np.int32) @ np.array(CEI_WEIGHTS, dtype=np.int32) % 100
+    modulo = (digsum // 10 + digsum % 10) % 10
+    return np.where(modulo == 0, 0, 10 - modulo)
+
+
+def cei_digits_from_stems(stems):
+    """Build the (N, 12) digit matrix of the valid CEIs with the given 11-digit integer stems."""
+    digits = int_digit_matrix(stems, 11)
+    return np.concatenate([digits, cei_check_digit_matrix(digits).astype(np.uint8)[:, None]], axis=1)
+
+
+def render_ceis(digits, formatted=True):
+    """Render an (N, 12) CEI digit matrix as fixed-width byte strings."""
+    return render_digit_matrix(digits, CEI_TEMPLATES[bool(formatted)])
+
+
+def validate_ceis(ceis, autopad=True, width=None):
+    """Check many CEIs at once, with the semantics of ``validate_cei``.
+
+    Args:
+        ceis: NumPy string array, sequence of str or bytes, pyarrow string column,
+            or raw buffer of fixed-width records
+        autopad: Pad CEIs shorter than 12 digits with leading zeros
+        width: Record width of a raw byte buffer
+
+    Returns:
+        Boolean array
+    """
+    return validate_ids(ceis, 12, lambda digits: cei_check_digit_matrix(digits[:, :11]) == digits[:, 11], autopad, width)
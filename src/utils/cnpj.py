@@ -2,22 +2,50 @@
 
 
 import random
+import re
+import string
 from collections import namedtuple
 
-from .util import clean_id, pad_id
+import numpy as np
+
+from .util import DEFAULT_RNG, align_rows, clean_id, digit_rows, id_char_rows, int_digit_matrix, pad_id, render_digit_matrix
 
 """
 Functions for working with Brazilian company identifiers (CNPJ).
 
+From July 2026 new CNPJs may be alphanumeric: the 12 base characters are digits
+or upper-case letters, each valued as its ASCII code minus 48 (so digits keep
+their value and 'A' is 17), and the two check digits stay numeric and use the
+legacy weights. A numeric CNPJ is therefore also a valid alphanumeric one.
+
 """
 
 CNPJ_FIRST_WEIGHTS = [5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
 CNPJ_SECOND_WEIGHTS = [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
 CNPJ = namedtuple('CNPJ', ['cnpj', 'firm', 'establishment', 'check', 'valid'])
+CNPJ_TEMPLATES = {True: '##.###.###/####-##', False: '##############'}
+ALNUM_CHARS = string.digits + string.ascii_uppercase
+NONALNUM = re.compile(r'[^0-9A-Z]')
+ALNUM_CNPJ = re.compile(r'[0-9A-Z]{12}[0-9]{2}')
+# from the start of the token holding the first digit to the end of the token holding the last one;
+# what lies outside is a label, as in 'CNPJ: 11.222.333/0001-81'
+IDENTIFIER_SPAN = re.compile(r'[^\t-\r :]*[0-9](?:.*[0-9])?[^\t-\r :]*', re.DOTALL)
+
+# weights of the first and second check digit over the 12 base characters, as columns;
+# the second check digit then adds the first one weighed by 2
+_CNPJ_WEIGHT_MATRIX = np.array([CNPJ_FIRST_WEIGHTS, CNPJ_SECOND_WEIGHTS[:-1]], dtype=np.float32).T
 
 
 def validate_cnpj(cnpj, autopad=True):
-    """Check whether CNPJ is valid. Optionally pad if too short."""
+    """Check whether CNPJ is valid. Optionally pad if too short.
+
+    CNPJs containing letters are checked as alphanumeric CNPJs; letters of labels
+    around the identifier, as in 'CNPJ: 11.222.333/0001-81', do not count.
+    """
+    if isinstance(cnpj, str):
+        identifier = _identifier_span(cnpj)
+        if any(c.isalpha() for c in identifier):
+            return validate_alnum_cnpj(identifier)
     cnpj = clean_id(cnpj)
 
     # all complete CNPJ are 14 digits long
@@ -113,3 +141,194 @@ def random_cnpj(formatted=True):
     if formatted:
         return format_cnpj(cnpj)
     return cnpj
+
+
+def _identifier_span(cnpj):
+    """The part of a string that holds the identifier, without surrounding labels."""
+    match = IDENTIFIER_SPAN.search(cnpj)
+    return match.group() if match else ''
+
+
+def clean_alnum_cnpj(cnpj):
+    """Upper-case an alphanumeric CNPJ and remove everything but digits and letters."""
+    return NONALNUM.sub('', str(cnpj).upper())
+
+
+def alnum_cnpj_check_digits(cnpj):
+    """Find two check digits needed to make an alphanumeric CNPJ valid."""
+    cnpj = clean_alnum_cnpj(cnpj)
+    if len(cnpj) < 12:
+        raise ValueError(f'CNPJ must have at least 12 characters: {cnpj}')
+    values = [ord(k) - 48 for k in cnpj[:12]]
+    cs = sum(w * k for w, k in zip(CNPJ_FIRST_WEIGHTS, values)) % 11
+    check = 0 if cs < 2 else 11 - cs
+    values.append(check)
+    cs = sum(w * k for w, k in zip(CNPJ_SECOND_WEIGHTS, values)) % 11
+    return check, 0 if cs < 2 else 11 - cs
+
+
+def validate_alnum_cnpj(cnpj):
+    """Check whether an alphanumeric (or numeric) CNPJ is valid, ignoring surrounding labels."""
+    cnpj = clean_alnum_cnpj(_identifier_span(str(cnpj)))
+    if not ALNUM_CNPJ.fullmatch(cnpj) or cnpj == '00000000000000':
+        return False
+    return alnum_cnpj_check_digits(cnpj) == (int(cnpj[12]), int(cnpj[13]))
+
+
+def format_alnum_cnpj(cnpj):
+    """Applies typical 00.000.000/0000-00 formatting to an alphanumeric CNPJ."""
+    cnpj = clean_alnum_cnpj(cnpj)
+    if len(cnpj) != 14:
+        raise ValueError(f'CNPJ must have 14 characters: {cnpj}')
+    return f'{cnpj[:2]}.{cnpj[2:5]}.{cnpj[5:8]}/{cnpj[8:12]}-{cnpj[12:]}'
+
+
+def parse_alnum_cnpj(cnpj, formatted=True):
+    """Split an alphanumeric CNPJ into firm, establishment, and check digits, and validate.
+
+    Firm and establishment stay strings, since they may contain letters.
+    """
+    cnpj = clean_alnum_cnpj(cnpj)
+    valid = validate_alnum_cnpj(cnpj)
+    estbl, check = cnpj[8:12], cnpj[12:]
+    if formatted:
+        cnpj = format_alnum_cnpj(cnpj)
+        return CNPJ(cnpj, cnpj[:10], estbl, check, valid)
+    return CNPJ(cnpj, cnpj[:8], estbl, tuple(int(k) for k in check), valid)
+
+
+def random_alnum_cnpj(formatted=True):
+    """Create a random, valid alphanumeric CNPJ identifier."""
+    base = ''.join(random.choices(ALNUM_CHARS, k=12))
+    first, second = alnum_cnpj_check_digits(base)
+    cnpj = f'{base}{first}{second}'
+    if formatted:
+        return format_alnum_cnpj(cnpj)
+    return cnpj
+
+
+def cnpj_check_digit_matrix(values):
+    """Find both check digits for each row of an (N, 12) matrix of character values.
+
+    Values are ASCII codes minus 48, so numeric and alphanumeric CNPJs share the kernel.
+    Weighted sums stay below 5000, so the float32 product is exact.
+
+    Returns:
+        (N, 2) matrix of check digits
+    """
+    sums = (np.asarray(values).astype(np.float32) @ _CNPJ_WEIGHT_MATRIX).astype(np.int32)
+    first = sums[:, 0] % 11
+    first = np.where(first < 2, 0, 11 - first)
+    second = (sums[:, 1] + 2 * first) % 11
+    return np.stack([first, np.where(second < 2, 0, 11 - second)], axis=1)
+
+
+def random_cnpj_values(n, alphanumeric_share=0.0, rng=None):
+    """Create an (N, 14) matrix of character values of random, valid CNPJs.
+
+    Numeric rows are drawn like ``random_cnpj``; alphanumeric rows draw every base
+    character uniformly from digits and upper-case letters.
+
+    Args:
+        n: Number of CNPJs
+        alphanumeric_share: Share of rows in the alphanumeric format, from 0 to 1
+        rng: NumPy generator, defaults to ``DEFAULT_RNG``
+    """
+    rng = DEFAULT_RNG if rng is None else rng
+    alnum_values = np.frombuffer(ALNUM_CHARS.encode('ascii'), dtype=np.uint8) - 48
+    values = np.zeros((n, 14), dtype=np.uint8)
+
+    firm = rng.integers(10_000_000, 100_000_000, size=n)
+    values[:, :8] = firm[:, None] // 10 ** np.arange(7, -1, -1) % 10
+    values[:, 11] = rng.integers(1, 6, size=n)
+    rows = np.flatnonzero(rng.random(n) < alphanumeric_share)
+    values[rows, :12] = alnum_values[rng.integers(0, len(alnum_values), size=(len(rows), 12))]
+
+    values[:, 12:] = cnpj_check_digit_matrix(values[:, :12])
+    return values
+
+
+def cnpj_values_from_firms(firms, establishment=1):
+    """Build the (N, 14) value matrix of the valid numeric CNPJs of the given 8-digit firm IDs."""
+    firms = np.asarray(firms, dtype=np.int64)
+    values = np.zeros((len(firms), 14), dtype=np.uint8)
+    values[:, :8] = int_digit_matrix(firms, 8)
+    values[:, 8:12] = int_digit_matrix(np.full(len(firms), establishment), 4)
+    values[:, 12:] = cnpj_check_digit_matrix(values[:, :12])
+    return values
+
+
+def render_cnpjs(values, formatted=True):
+    """Render an (N, 14) CNPJ value matrix as fixed-width byte strings."""
+    return render_digit_matrix(values, CNPJ_TEMPLATES[bool(formatted)])
+
+
+def random_cnpjs(n, formatted=True, alphanumeric_share=0.0, rng=None):
+    """Create a list of n random, valid CNPJs, a share of them alphanumeric."""
+    return render_cnpjs(random_cnpj_values(n, alphanumeric_share, rng), formatted).astype(str).tolist()
+
+
+def validate_cnpjs(cnpjs, autopad=True, width=None):
+    """Check many numeric or alphanumeric CNPJs at once, with the semantics of ``validate_cnpj``.
+
+    Rows with ASCII letters inside the identifier span (labels around it do not count)
+    are checked as alphanumeric CNPJs, which are never padded; the others as numeric
+    CNPJs, padded with leading zeros if ``autopad``.
+
+    Args:
+        cnpjs: NumPy string array, sequence of str or bytes, pyarrow string column,
+            or raw buffer of fixed-width records
+        autopad: Pad numeric CNPJs shorter than 14 digits with leading zeros
+        width: Record width of a raw byte buffer
+
+    Returns:
+        Boolean array
+    """
+    masks = []
+    for chars, present in id_char_rows(cnpjs, width):
+        upper = np.where((chars >= ord('a')) & (chars <= ord('z')), chars - 32, chars)
+        digit = (upper >= ord('0')) & (upper <= ord('9'))
+        letter = (upper >= ord('A')) & (upper <= ord('Z'))
+        if letter.any():
+            # only rows with a separator can carry a label
+            labeled = np.flatnonzero(letter.any(axis=1) & _separators(chars).any(axis=1))
+            if len(labeled):
+                letter[labeled] &= _identifier_span_mask(chars[labeled], digit[labeled])
+        alnum_rows = letter.any(axis=1)
+
+        digits, valid = digit_rows(chars, 14, autopad)
+        valid &= ~alnum_rows & _cnpj_check_matrix(digits)
+        rows = np.flatnonzero(alnum_rows)
+        if len(rows):
+            keep = digit[rows] | letter[rows]
+            aligned, counts = align_rows(upper[rows], keep, 14)
+            values = aligned.astype(np.int16) - 48
+            numeric_check = (values[:, 12:] < 10).all(axis=1)
+            valid[rows] = (counts == 14) & numeric_check & _cnpj_check_matrix(values)
+        masks.append(present & valid)
+    return np.concatenate(masks) if masks else np.zeros(0, dtype=bool)
+
+
+def _separators(chars):
+    """Whether each character is whitespace or a colon, the separators of ``IDENTIFIER_SPAN``."""
+    return (chars == ord(' ')) | (chars == ord(':')) | ((chars >= ord('\t')) & (chars <= ord('\r')))
+
+
+def _identifier_span_mask(chars, digit):
+    """Vectorized ``IDENTIFIER_SPAN``: which characters of each row belong to the identifier."""
+    width = chars.shape[1]
+    positions = np.arange(width)
+    separator = _separators(chars)
+    has_digit = digit.any(axis=1)
+    first = digit.argmax(axis=1)
+    last = width - 1 - digit[:, ::-1].argmax(axis=1)
+    rows = np.arange(len(chars))
+    # last separator before each position, and first separator after it
+    before = np.maximum.accumulate(np.where(separator, positions, -1), axis=1)[rows, first]
+    after = np.minimum.accumulate(np.where(separator, positions, width)[:, ::-1], axis=1)[:, ::-1][rows, last]
+    return has_digit[:, None] & (positions > before[:, None]) & (positions < after[:, None])
+
+
+def _cnpj_check_matrix(values):
+    """Whether each row of an (N, 14) value matrix has the right check digits."""
+    return (cnpj_check_digit_matrix(values[:, :12]) == values[:, 12:]).all(axis=1)
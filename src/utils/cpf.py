@@ -4,7 +4,9 @@
 import random
 import re
 
-from .util import clean_id, pad_id
+import numpy as np
+
+from .util import DEFAULT_RNG, clean_id, int_digit_matrix, pad_id, render_digit_matrix, validate_ids
 
 """
 Functions for working with Brazilian CPF identifiers.
@@ -13,6 +15,24 @@ Functions for working with Brazilian CPF identifiers.
 
 NONDIGIT = re.compile(r'[^0-9]')
 CPF_WEIGHTS = [1, 2, 3, 4, 5, 6, 7, 8, 9]
+CPF_TEMPLATES = {True: '###.###.###-##', False: '###########'}
+
+# fiscal region of the Receita Federal office that issued a CPF, encoded in its 9th digit
+CPF_FISCAL_REGIONS = {
+    **dict.fromkeys(('DF', 'GO', 'MS', 'MT', 'TO'), 1),
+    **dict.fromkeys(('AC', 'AM', 'AP', 'PA', 'RO', 'RR'), 2),
+    **dict.fromkeys(('CE', 'MA', 'PI'), 3),
+    **dict.fromkeys(('AL', 'PB', 'PE', 'RN'), 4),
+    **dict.fromkeys(('BA', 'SE'), 5),
+    'MG': 6,
+    **dict.fromkeys(('ES', 'RJ'), 7),
+    'SP': 8,
+    **dict.fromkeys(('PR', 'SC'), 9),
+    'RS': 0,
+}
+
+# weights of the first and second check digit over the 9-digit stem, as columns
+_CPF_WEIGHT_MATRIX = np.array([CPF_WEIGHTS, [0, *CPF_WEIGHTS[:-1]]], dtype=np.float32).T
 
 
 def validate_cpf(cpf, autopad=True):
@@ -72,10 +92,109 @@ def pad_cpf(cpf, validate=False):
     return padded
 
 
-def random_cpf(formatted=True):
-    """Create a random, valid CPF identifier."""
-    stem = random.randint(100000000, 999999999)
+def cpf_fiscal_region(cpf):
+    """Fiscal region digit of a CPF, its 9th digit."""
+    return int(pad_cpf(cpf)[8])
+
+
+def cpf_region_digits(state_abbrs):
+    """Fiscal region digit of each state abbreviation (UF), as an int8 array."""
+    try:
+        return np.array([CPF_FISCAL_REGIONS[abbr] for abbr in state_abbrs], dtype=np.int8)
+    except KeyError as err:
+        raise ValueError(f'Unknown state: {err.args[0]}') from err
+
+
+def random_cpf(formatted=True, state_abbr=None):
+    """Create a random, valid CPF identifier, issued in the fiscal region of state_abbr if given."""
+    if state_abbr is None:
+        stem = random.randint(100000000, 999999999)
+    else:
+        stem = random.randint(10000000, 99999999) * 10 + int(cpf_region_digits([state_abbr])[0])
     cpf = str(stem) + '{0}{1}'.format(*cpf_check_digits(stem))
     if formatted:
         return format_cpf(cpf)
     return cpf
+
+
+def cpf_check_digit_matrix(stems):
+    """Find both check digits for each row of an (N, 9) digit matrix.
+
+    Both weighted sums come from one product with a (9, 2) weight matrix, the second
+    column weighing digits 2 to 9 by 1..8; the second check digit then adds the first
+    one weighed by 9. Sums stay below 500, so float32 (and its BLAS kernels) is exact.
+
+    Returns:
+        (N, 2) matrix of check digits
+    """
+    stems = np.asarray(stems)
+    sums = (stems.astype(np.float32) @ _CPF_WEIGHT_MATRIX).astype(np.int32)
+    first = sums[:, 0] % 11 % 10
+    second = (sums[:, 1] + 9 * first) % 11 % 10
+    return np.stack([first, second], axis=1)
+
+
+def random_cpf_digits(n, rng=None, regions=None):
+    """Create an (N, 11) digit matrix of random, valid CPFs.
+
+    Stems are drawn like ``random_cpf``, from 100000000 to 999999999.
+
+    Args:
+        n: Number of CPFs
+        rng: NumPy generator, defaults to ``DEFAULT_RNG``
+        regions: Optional fiscal region digit, for all rows or one per row (e.g. from
+            ``cpf_region_digits``); rows with a negative region keep a random 9th digit
+    """
+    rng = DEFAULT_RNG if rng is None else rng
+    stems = rng.integers(0, 10, size=(n, 9), dtype=np.uint8)
+    stems[:, 0] = rng.integers(1, 10, size=n, dtype=np.uint8)
+    if regions is not None:
+        regions = np.broadcast_to(np.asarray(regions), (n,))
+        stems[:, 8] = np.where(regions >= 0, regions, stems[:, 8])
+    return _with_cpf_check_digits(stems)
+
+
+def cpf_digits_from_stems(stems):
+    """Build the (N, 11) digit matrix of the valid CPFs with the given 9-digit integer stems."""
+    return _with_cpf_check_digits(int_digit_matrix(stems, 9))
+
+
+def _with_cpf_check_digits(stems):
+    """Append both check digits to an (N, 9) digit matrix."""
+    return np.concatenate([stems, cpf_check_digit_matrix(stems).astype(np.uint8)], axis=1)
+
+
+def render_cpfs(digits, formatted=True):
+    """Render an (N, 11) CPF digit matrix as fixed-width byte strings."""
+    return render_digit_matrix(digits, CPF_TEMPLATES[bool(formatted)])
+
+
+def random_cpfs(n, formatted=True, rng=None, state_abbrs=None):
+    """Create a list of n random, valid CPF identifiers.
+
+    state_abbrs restricts them to fiscal regions: one UF for all CPFs, or a sequence of n UFs.
+    """
+    regions = None
+    if state_abbrs is not None:
+        regions = cpf_region_digits([state_abbrs] if isinstance(state_abbrs, str) else state_abbrs)
+    return render_cpfs(random_cpf_digits(n, rng, regions), formatted).astype(str).tolist()
+
+
+def validate_cpfs(cpfs, autopad=True, width=None):
+    """Check many CPFs at once, with the semantics of ``validate_cpf``.
+
+    Args:
+        cpfs: NumPy string array, sequence of str or bytes, pyarrow string column,
+            or raw buffer of fixed-width records
+        autopad: Pad CPFs shorter than 11 digits with leading zeros
+        width: Record width of a raw byte buffer
+
+    Returns:
+        Boolean array
+    """
+    return validate_ids(cpfs, 11, _cpf_check_matrix, autopad, width)
+
+
+def _cpf_check_matrix(digits):
+    """Whether each row of an (N, 11) digit matrix has the right check digits."""
+    return (cpf_check_digit_matrix(digits[:, :9]) == digits[:, 9:]).all(axis=1)
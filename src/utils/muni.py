@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+
+
+import numpy as np
+
+from .util import clean_id
+
+"""
+Functions for working with Brazilian municipality (municipio) codes.
+
+"""
+
+MUNI_WEIGHTS = [1, 2, 1, 2, 1, 2]
+
+# there are 9 IBGE municipal codes with invalid check digits;
+# see, http://www.sefaz.al.gov.br/nfe/notas_tecnicas/NT2008.004.pdf
+SHIM = {
+    '2201919': 9,  # Bom Princípio do Piauí, PI
+    '2201988': 8,  # Brejo do Piauí, PI
+    '2202251': 1,  # Canavieira, PI
+    '2611533': 3,  # Quixaba, PE
+    '3117836': 6,  # Cônego Marinho, MG
+    '3152131': 1,  # Ponto Chique, MG
+    '4305871': 1,  # Coronel Barros, RS
+    '5203939': 9,  # Buriti de Goiás, GO
+    '5203962': 2,  # Buritinópolis, GO
+}
+
+# the same exceptions keyed by their 6-digit stem, for computing check digits
+SHIM_STEMS = {int(code[:6]): digit for code, digit in SHIM.items()}
+_SHIM_STEM_KEYS = np.array(sorted(SHIM_STEMS), dtype=np.int64)
+_SHIM_STEM_DIGITS = np.array([SHIM_STEMS[stem] for stem in sorted(SHIM_STEMS)], dtype=np.int64)
+
+# sum of the digits of 2 * d, for d in 0..9
+_DOUBLED_DIGIT_SUM = np.array([0, 2, 4, 6, 8, 1, 3, 5, 7, 9], dtype=np.int64)
+
+
+def validate_muni(muni):
+    """Check whether municipio code is valid."""
+    muni = clean_id(muni)
+    # municipal codes are 7 digits long, and cannot start with 0
+    if len(muni) != 7:
+        return False
+
+    if muni[0] == '0':
+        return False
+
+    digits = [int(k) for k in muni]
+    valid = _muni_check(digits[:-1]) == digits[-1]
+    return valid or muni in SHIM  # need to check exceptions list
+
+
+def muni_check_digit(muni):
+    """Find check digit needed to make a valid municipio code."""
+    muni = clean_id(muni)
+    if len(muni) < 6:
+        raise ValueError(f'Municipio must have at least 6 digits: {muni}')
+    if int(muni[:6]) in SHIM_STEMS:
+        return SHIM_STEMS[int(muni[:6])]
+
+    digits = [int(k) for k in muni[:6]]
+    return _muni_check(digits)
+
+
+def muni_code(stem):
+    """Append the check digit to a 6-digit stem (2-digit UF + 4-digit municipio)."""
+    return int(stem) * 10 + muni_check_digit(f'{int(stem):06d}')
+
+
+def _muni_check(digits):
+    """Calculate check digit from iterable of integers."""
+    digmul = (w * k for w, k in zip(MUNI_WEIGHTS, digits))
+    digsum = sum(n if n < 10 else 1 + (n % 10) for n in digmul)
+    modulo = digsum % 10
+    return 0 if modulo == 0 else 10 - modulo
+
+
+def muni_check_digits(stems):
+    """Check digits of an array of 6-digit stems, SHIM exceptions included."""
+    stems = np.asarray(stems, dtype=np.int64)
+    shim = _shim_digits(stems)
+    return np.where(shim >= 0, shim, _computed_check_digits(stems))
+
+
+def _computed_check_digits(stems):
+    """Check digits of an array of 6-digit stems by the weighting rule alone."""
+    digsum = np.zeros(stems.shape, dtype=np.int64)
+    remaining = stems.copy()
+    # walk the digits from the right; folded products of weight-2 digits come from a lookup
+    for weight in reversed(MUNI_WEIGHTS):
+        remaining, digit = np.divmod(remaining, 10)
+        digsum += digit if weight == 1 else _DOUBLED_DIGIT_SUM[digit]
+    return (10 - digsum % 10) % 10
+
+
+def _shim_digits(stems):
+    """SHIM check digit of each stem, -1 for stems that are not exceptions."""
+    digits = np.full(stems.shape, -1, dtype=np.int64)
+    shim = np.isin(stems, _SHIM_STEM_KEYS)
+    if shim.any():
+        digits[shim] = _SHIM_STEM_DIGITS[np.searchsorted(_SHIM_STEM_KEYS, stems[shim])]
+    return digits
+
+
+def validate_munis(codes):
+    """Check an array of 7-digit municipio codes; returns a boolean array.
+
+    Like ``validate_muni``, a code is valid if its check digit is the computed one or the
+    code is one of the SHIM exceptions.
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    stems, digits = np.divmod(codes, 10)
+    in_range = (codes >= 1_000_000) & (codes <= 9_999_999)
+    return in_range & ((_computed_check_digits(stems) == digits) | (_shim_digits(stems) == digits))
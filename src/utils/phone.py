@@ -0,0 +1,159 @@
+"""
+Functions for generating Brazilian phone numbers.
+
+Numbers follow the Anatel numbering plan: a two-digit area code (DDD), then either a
+mobile number of 9 digits starting with 9 and a digit from 6 to 9, or a landline number of
+8 digits starting with 2 to 5. Batch generation draws whole subscriber numbers as integer
+arrays and only renders strings on request.
+"""
+
+import random
+from typing import NamedTuple
+
+import numpy as np
+
+from .util import DEFAULT_RNG, clean_id, render_digits
+
+# Area codes in use, per the Anatel numbering plan
+VALID_DDDS = frozenset(
+    {
+        11, 12, 13, 14, 15, 16, 17, 18, 19, 21, 22, 24, 27, 28, 31, 32, 33, 34, 35, 37, 38, 41, 42, 43, 44, 45, 46, 47, 48, 49,
+        51, 53, 54, 55, 61, 62, 63, 64, 65, 66, 67, 68, 69, 71, 73, 74, 75, 77, 79, 81, 82, 83, 84, 85, 86, 87, 88, 89, 91, 92,
+        93, 94, 95, 96, 97, 98, 99,
+    }
+)  # fmt: skip
+
+# Share of generated numbers that are mobile when the caller does not choose
+DEFAULT_MOBILE_SHARE = 0.9
+
+# Subscriber number ranges, half-open: mobile 96000-0000 to 99999-9999, landline 2000-0000 to 5999-9999
+MOBILE_RANGE = (960_000_000, 1_000_000_000)
+LANDLINE_RANGE = (20_000_000, 60_000_000)
+
+PHONE_TEMPLATES = {
+    'formatted': ('(##) #####-####', '(##) ####-####'),
+    'e164': ('+55###########', '+55##########'),
+    'digits': ('###########', '##########'),
+}
+
+
+def _check_ddd(ddd):
+    """Return the area code as an int, raising ValueError if it is not in use."""
+    ddd = int(ddd)
+    if ddd not in VALID_DDDS:
+        raise ValueError(f'Invalid DDD: {ddd}')
+    return ddd
+
+
+def format_phone(ddd, number, style='formatted'):
+    """Render an area code and subscriber number.
+
+    Args:
+        ddd: Two-digit area code
+        number: 9-digit mobile or 8-digit landline subscriber number
+        style: 'formatted' for (11) 91234-5678, 'e164' for +5511912345678 or 'digits'
+
+    Returns:
+        The rendered phone number
+
+    Raises:
+        ValueError: If the style is unknown
+    """
+    digits = f'{int(number):09d}' if number >= 100_000_000 else f'{int(number):08d}'
+    if style == 'formatted':
+        return f'({int(ddd):02d}) {digits[:-4]}-{digits[-4:]}'
+    if style == 'e164':
+        return f'+55{int(ddd):02d}{digits}'
+    if style == 'digits':
+        return f'{int(ddd):02d}{digits}'
+    raise ValueError(f'Unknown phone style: {style}')
+
+
+def random_phone(ddd, mobile=True, style='formatted'):
+    """Create a random phone number in the given area code.
+
+    Args:
+        ddd: Two-digit area code
+        mobile: True for a mobile number, False for a landline
+        style: 'formatted', 'e164' or 'digits'
+
+    Raises:
+        ValueError: If the area code is not in use
+    """
+    low, high = MOBILE_RANGE if mobile else LANDLINE_RANGE
+    return format_phone(_check_ddd(ddd), random.randrange(low, high), style)
+
+
+def validate_phone(phone):
+    """Check whether a phone number, with or without +55 and punctuation, is plausible.
+
+    The number must have a DDD in use followed by a 9-digit mobile number starting
+    with 9 or an 8-digit landline number starting with 2 to 5.
+    """
+    digits = clean_id(phone)
+    # National numbers have 10 or 11 digits, so anything longer must carry the country code
+    if len(digits) in (12, 13):
+        if not digits.startswith('55'):
+            return False
+        digits = digits[2:]
+    if len(digits) not in (10, 11) or int(digits[:2]) not in VALID_DDDS:
+        return False
+    if len(digits) == 11:
+        return digits[2] == '9' and digits[3] in '6789'
+    return digits[2] in '2345'
+
+
+class PhoneColumns(NamedTuple):
+    """Batch of phone numbers as integer columns.
+
+    ``ddd`` holds the area code and ``number`` the subscriber number of each row; mobile
+    rows have 9-digit numbers and landline rows 8-digit numbers.
+    """
+
+    ddd: np.ndarray
+    number: np.ndarray
+    mobile: np.ndarray
+
+    def __len__(self):
+        return len(self.number)
+
+    def to_list(self, style='formatted'):
+        """Render the numbers as strings: 'formatted', 'e164' or 'digits'."""
+        if style not in PHONE_TEMPLATES:
+            raise ValueError(f'Unknown phone style: {style}')
+        mobile_template, landline_template = PHONE_TEMPLATES[style]
+        full = self.ddd.astype(np.int64) * np.where(self.mobile, 10**9, 10**8) + self.number
+        rendered = np.empty(len(full), dtype=object)
+        for mask, template in ((self.mobile, mobile_template), (~self.mobile, landline_template)):
+            if mask.any():
+                rendered[mask] = render_digits(full[mask], template)
+        return rendered.tolist()
+
+
+def random_phones(ddds, mobile_share=DEFAULT_MOBILE_SHARE, rng=None):
+    """Create one random phone number per area code in ``ddds``.
+
+    Args:
+        ddds: Integer array of area codes
+        mobile_share: Probability that each number is mobile
+        rng: NumPy generator to use, defaults to the shared generator
+
+    Returns:
+        PhoneColumns with the area codes, subscriber numbers and mobile mask
+
+    Raises:
+        ValueError: If an area code is not in use
+    """
+    rng = DEFAULT_RNG if rng is None else rng
+    ddds = np.asarray(ddds, dtype=np.int16)
+    valid = np.zeros(100, dtype=bool)
+    valid[list(VALID_DDDS)] = True
+    invalid = (ddds < 0) | (ddds > 99) | ~valid[np.clip(ddds, 0, 99)]
+    if invalid.any():
+        raise ValueError(f'Invalid DDD: {int(ddds[invalid][0])}')
+
+    mobile = rng.random(len(ddds)) < mobile_share
+    low = np.where(mobile, MOBILE_RANGE[0], LANDLINE_RANGE[0])
+    high = np.where(mobile, MOBILE_RANGE[1], LANDLINE_RANGE[1])
+    number = rng.integers(low, high, dtype=np.int64)
+    return PhoneColumns(ddd=ddds, number=number, mobile=mobile)
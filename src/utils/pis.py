@@ -4,7 +4,9 @@
 import re
 from random import randint
 
-from .util import clean_id, pad_id
+import numpy as np
+
+from .util import clean_id, int_digit_matrix, pad_id, render_digit_matrix, validate_ids
 
 """
 Functions for working with Brazilian PIS/PASEP identifiers.
@@ -13,6 +15,7 @@ Functions for working with Brazilian PIS/PASEP identifiers.
 
 NONDIGIT = re.compile(r'[^0-9]')
 PIS_WEIGHTS = [3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
+PIS_TEMPLATES = {True: '###.####.###-#', False: '###########'}
 
 
 def validate_pis(pis, autopad=True):
@@ -77,3 +80,35 @@ def _pis_check(pis):
     # find check digit
     cs = sum(w * k for w, k in zip(PIS_WEIGHTS, digits)) % 11
     return 0 if cs < 2 else 11 - cs
+
+
+def pis_check_digit_matrix(stems):
+    """Find the check digit for each row of an (N, 10) digit matrix."""
+    cs = np.asarray(stems, dtype=np.int32) @ np.array(PIS_WEIGHTS, dtype=np.int32) % 11
+    return np.where(cs < 2, 0, 11 - cs)
+
+
+def pis_digits_from_stems(stems):
+    """Build the (N, 11) digit matrix of the valid PIS/PASEP with the given 10-digit integer stems."""
+    digits = int_digit_matrix(stems, 10)
+    return np.concatenate([digits, pis_check_digit_matrix(digits).astype(np.uint8)[:, None]], axis=1)
+
+
+def render_pis(digits, formatted=True):
+    """Render an (N, 11) PIS/PASEP digit matrix as fixed-width byte strings."""
+    return render_digit_matrix(digits, PIS_TEMPLATES[bool(formatted)])
+
+
+def validate_pis_batch(pis, autopad=True, width=None):
+    """Check many PIS/PASEP at once, with the semantics of ``validate_pis``.
+
+    Args:
+        pis: NumPy string array, sequence of str or bytes, pyarrow string column,
+            or raw buffer of fixed-width records
+        autopad: Pad PIS/PASEP shorter than 11 digits with leading zeros
+        width: Record width of a raw byte buffer
+
+    Returns:
+        Boolean array
+    """
+    return validate_ids(pis, 11, lambda digits: pis_check_digit_matrix(digits[:, :10]) == digits[:, 10], autopad, width)
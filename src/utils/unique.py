@@ -0,0 +1,222 @@
+"""
+Collision-free streams of identifiers.
+
+A keyed Feistel network is a bijection on [0, 4**k); cycle-walking (re-applying
+it until the result falls in range) restricts it to a bijection on [0, size).
+Walking the counter 0, 1, 2, ... through that permutation therefore gives
+pseudo-random, never repeated indices with O(1) state: the key and the counter.
+Shard ``s`` of ``n`` takes counters s, s + n, s + 2n, ..., so shards never
+collide, and any stream can be resumed from its counter.
+"""
+
+import hashlib
+
+import numpy as np
+
+from .cei import cei_digits_from_stems, render_ceis
+from .cnpj import cnpj_values_from_firms, render_cnpjs
+from .cpf import cpf_digits_from_stems, render_cpfs
+from .pis import pis_digits_from_stems, render_pis
+
+MASK64 = (1 << 64) - 1
+FEISTEL_ROUNDS = 8
+FEISTEL_BLOCK = 1 << 14
+# splitmix64 finalizer, the Feistel round function
+MIX_STEPS = ((np.uint64(30), np.uint64(0xBF58476D1CE4E5B9)), (np.uint64(27), np.uint64(0x94D049BB133111EB)))
+MIX_LAST_SHIFT = np.uint64(31)
+
+# stems of each identifier, as drawn by its random_* function; see ``IDENTIFIERS``
+CPF_STEMS = (100_000_000, 1_000_000_000)
+PIS_STEMS = (1_000_000_000, 10_000_000_000)
+CEI_UFS = (11, 54)
+CEI_STEMS = (100_000_000, 1_000_000_000)
+CNPJ_FIRMS = (10_000_000, 100_000_000)
+
+
+def _round_keys(key, rounds):
+    """Derive one 64-bit key per round from an int, str or bytes key."""
+    if isinstance(key, int):
+        key = str(key)
+    if isinstance(key, str):
+        key = key.encode('utf-8')
+    digest = hashlib.blake2b(key, digest_size=8 * rounds, person=b'feistel-ids').digest()
+    return [int.from_bytes(digest[8 * k : 8 * k + 8], 'little') for k in range(rounds)]
+
+
+class FeistelPermutation:
+    """Keyed pseudo-random permutation of [0, size)."""
+
+    def __init__(self, size, key, rounds=FEISTEL_ROUNDS):
+        if size < 1:
+            raise ValueError(f'Permutation size must be positive: {size}')
+        self.size = size
+        self.half_bits = max(1, (max(size - 1, 1).bit_length() + 1) // 2)
+        self.half_mask = (1 << self.half_bits) - 1
+        self.keys = _round_keys(key, rounds)
+        self._keys_array = np.array(self.keys, dtype=np.uint64)
+
+    def _round(self, right, key):
+        """Round function: splitmix64 finalizer of the half block plus the round key."""
+        z = (right + key) & MASK64
+        for shift, multiplier in MIX_STEPS:
+            z = ((z ^ (z >> int(shift))) * int(multiplier)) & MASK64
+        return (z ^ (z >> int(MIX_LAST_SHIFT))) & self.half_mask
+
+    def _encrypt(self, value):
+        left, right = value >> self.half_bits, value & self.half_mask
+        for key in self.keys:
+            left, right = right, left ^ self._round(right, key)
+        return (left << self.half_bits) | right
+
+    def permute(self, index):
+        """Image of one index in [0, size)."""
+        if not 0 <= index < self.size:
+            raise ValueError(f'Index out of range: {index}')
+        value = self._encrypt(index)
+        while value >= self.size:
+            value = self._encrypt(value)
+        return value
+
+    def _encrypt_many(self, values):
+        # the rounds run in place over cache-sized blocks: on large arrays the temporaries of
+        # plain NumPy expressions cost several times more than the arithmetic itself
+        half_bits, half_mask = np.uint64(self.half_bits), np.uint64(self.half_mask)
+        encrypted = np.empty_like(values)
+        z = np.empty(min(FEISTEL_BLOCK, len(values)), dtype=np.uint64)
+        shifted = np.empty_like(z)
+        for start in range(0, len(values), FEISTEL_BLOCK):
+            block = values[start : start + FEISTEL_BLOCK]
+            left, right = block >> half_bits, block & half_mask
+            zz, tt = z[: len(block)], shifted[: len(block)]
+            for key in self._keys_array:
+                np.add(right, key, out=zz)
+                for shift, multiplier in MIX_STEPS:
+                    np.right_shift(zz, shift, out=tt)
+                    zz ^= tt
+                    zz *= multiplier
+                np.right_shift(zz, MIX_LAST_SHIFT, out=tt)
+                zz ^= tt
+                zz &= half_mask
+                left ^= zz
+                left, right = right, left
+            out = encrypted[start : start + len(block)]
+            np.left_shift(left, half_bits, out=out)
+            out |= right
+        return encrypted
+
+    def permute_many(self, indices):
+        """Images of an array of indices in [0, size), as int64."""
+        indices = np.asarray(indices, dtype=np.int64)
+        if len(indices) and (indices.min() < 0 or indices.max() >= self.size):
+            raise ValueError('Index out of range')
+        values = self._encrypt_many(indices.astype(np.uint64))
+        outside = np.flatnonzero(values >= self.size)
+        # cycle-walk the few values that land past the end of the range
+        while len(outside):
+            values[outside] = self._encrypt_many(values[outside])
+            outside = outside[values[outside] >= self.size]
+        return values.astype(np.int64)
+
+
+class UniqueSequence:
+    """Resumable, shardable stream of distinct pseudo-random integers from [0, size).
+
+    Attributes:
+        counter: Number of values this shard has produced; pass it back to resume
+    """
+
+    def __init__(self, size, key, shard=0, shards=1, counter=0, rounds=FEISTEL_ROUNDS):
+        if not 0 <= shard < shards:
+            raise ValueError(f'Shard must be in [0, {shards}): {shard}')
+        if counter < 0:
+            raise ValueError(f'Counter must not be negative: {counter}')
+        self.permutation = FeistelPermutation(size, key, rounds)
+        self.shard = shard
+        self.shards = shards
+        self.counter = counter
+
+    @property
+    def remaining(self):
+        """Number of values this shard can still produce."""
+        first = self.shard + self.shards * self.counter
+        return max(0, -(-(self.permutation.size - first) // self.shards))
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not self.remaining:
+            raise StopIteration
+        value = self.permutation.permute(self.shard + self.shards * self.counter)
+        self.counter += 1
+        return value
+
+    def take(self, n):
+        """Next n values as an int64 array, fewer if the shard runs out."""
+        n = min(n, self.remaining)
+        first = self.shard + self.shards * self.counter
+        indices = first + self.shards * np.arange(n, dtype=np.int64)
+        self.counter += n
+        return self.permutation.permute_many(indices)
+
+
+def _cei_stems(indices):
+    """CEI stems: a two-digit UF code followed by 9 digits."""
+    per_uf = CEI_STEMS[1] - CEI_STEMS[0]
+    return (CEI_UFS[0] + indices // per_uf) * 10**9 + CEI_STEMS[0] + indices % per_uf
+
+
+# identifier -> (size of its stem space, index -> stem, stems -> digit rows, digit rows -> bytes)
+IDENTIFIERS = {
+    'cpf': (CPF_STEMS[1] - CPF_STEMS[0], lambda indices: CPF_STEMS[0] + indices, cpf_digits_from_stems, render_cpfs),
+    'pis': (PIS_STEMS[1] - PIS_STEMS[0], lambda indices: PIS_STEMS[0] + indices, pis_digits_from_stems, render_pis),
+    'cei': ((CEI_UFS[1] - CEI_UFS[0]) * (CEI_STEMS[1] - CEI_STEMS[0]), _cei_stems, cei_digits_from_stems, render_ceis),
+    'cnpj': (CNPJ_FIRMS[1] - CNPJ_FIRMS[0], lambda indices: CNPJ_FIRMS[0] + indices, cnpj_values_from_firms, render_cnpjs),
+}
+
+
+class UniqueIdStream:
+    """Stream of valid identifiers that never repeats within a key.
+
+    Stems cover the same space as the matching ``random_*`` function; CNPJs are
+    headquarters (establishment 0001) of distinct firms.
+
+    Example:
+        >>> stream = UniqueIdStream('cpf', key='run-42', shard=3, shards=8)
+        >>> cpfs = stream.take(1_000_000)
+        >>> resumed = UniqueIdStream('cpf', key='run-42', shard=3, shards=8, counter=stream.counter)
+    """
+
+    def __init__(self, identifier, key, shard=0, shards=1, counter=0):
+        if identifier not in IDENTIFIERS:
+            raise ValueError(f'Unknown identifier: {identifier}; expected one of {", ".join(IDENTIFIERS)}')
+        self.identifier = identifier
+        size, self._stems, self._digits, self._render = IDENTIFIERS[identifier]
+        self.sequence = UniqueSequence(size, key, shard, shards, counter)
+
+    @property
+    def counter(self):
+        """Number of identifiers produced so far, to resume the stream."""
+        return self.sequence.counter
+
+    @property
+    def remaining(self):
+        """Number of identifiers this shard can still produce."""
+        return self.sequence.remaining
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not self.remaining:
+            raise StopIteration
+        return self.take(1)[0]
+
+    def take(self, n, formatted=True):
+        """Next n identifiers as strings, fewer if the shard runs out."""
+        return self.take_bytes(n, formatted).astype(str).tolist()
+
+    def take_bytes(self, n, formatted=True):
+        """Next n identifiers as a NumPy array of fixed-width byte strings."""
+        stems = self._stems(self.sequence.take(n))
+        return self._render(self._digits(stems), formatted)
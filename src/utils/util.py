@@ -1,5 +1,7 @@
 import re
 
+import numpy as np
+
 """
 Helper functions for validating identifiers.
 
@@ -7,6 +9,9 @@ Helper functions for validating identifiers.
 
 NONDIGIT = re.compile(r'[^0-9]')
 
+# Generator used by batch draws when the caller does not provide one
+DEFAULT_RNG = np.random.default_rng()
+
 
 def clean_id(identifier):
     """Remove non-numeric characters from input."""
@@ -26,3 +31,194 @@ def pad_id(identifier, fmt):
             identifier = int(identifier)
 
     return fmt % identifier
+
+
+def render_digits(values, template, placeholder='#'):
+    """Render non-negative integers into a fixed-width text template.
+
+    Each ``placeholder`` in ``template`` receives one decimal digit, most significant
+    first and zero-padded, so ``render_digits([1234567890], '(##) ####-####')`` gives
+    ``['(12) 3456-7890']``. Digits are computed for the whole array at once and each row
+    of the resulting byte matrix is viewed as one string, with no per-digit Python work.
+
+    Args:
+        values: Integers with at most as many digits as there are placeholders
+        template: ASCII template containing the placeholders
+        placeholder: Character replaced by digits
+
+    Returns:
+        List of rendered strings
+    """
+    digits = int_digit_matrix(values, template.count(placeholder))
+    return render_digit_matrix(digits, template, placeholder).astype(str).tolist()
+
+
+def int_digit_matrix(values, width):
+    """Split non-negative integers into an (N, width) matrix of decimal digits, zero-padded."""
+    values = np.asarray(values, dtype=np.int64).ravel()
+    digits = np.empty((len(values), width), dtype=np.uint8)
+    # peel digits off with a scalar uint32 divisor, which NumPy divides much faster than int64
+    # by a broadcast array of powers; wider values are split at 10**9 first
+    high = None
+    if width > 9:
+        high, values = np.divmod(values, 10**9)
+        high = high.astype(np.uint32)
+    values = values.astype(np.uint32)
+    for column in range(width - 1, -1, -1):
+        if column == width - 10:
+            values = high
+        values, digits[:, column] = np.divmod(values, np.uint32(10))
+    return digits
+
+
+def render_digit_matrix(digits, template, placeholder='#'):
+    """Render rows of decimal digits into a fixed-width text template.
+
+    Args:
+        digits: (N, k) integer matrix, one digit per placeholder of ``template``
+        template: ASCII template containing exactly k placeholders
+        placeholder: Character replaced by digits
+
+    Returns:
+        NumPy array of N fixed-width byte strings
+    """
+    digits = np.asarray(digits)
+    layout = np.frombuffer(template.encode('ascii'), dtype=np.uint8)
+    slots = np.flatnonzero(layout == ord(placeholder))
+    if digits.ndim != 2 or digits.shape[1] != len(slots):
+        raise ValueError(f'Template has {len(slots)} placeholders for digit rows of shape {digits.shape}')
+
+    rendered = np.empty((len(digits), len(layout)), dtype=np.uint8)
+    rendered[:] = layout
+    rendered[:, slots] = digits + ord('0')
+    return rendered.view(f'S{len(layout)}').ravel()
+
+
+# rows handled at once by the bulk validators, bounding their temporary arrays
+CHUNK_ROWS = 1 << 20
+
+
+def id_char_rows(values, width=None, chunk_rows=CHUNK_ROWS):
+    """Yield identifiers as 2D arrays of character codes, one row per identifier.
+
+    Accepts NumPy string arrays (unicode rows are viewed as UCS-4 code points, byte
+    rows as bytes, without copying), sequences of str or bytes, raw fixed-width byte
+    buffers (``width`` bytes per record) and pyarrow string or binary arrays, chunked
+    or not. Shorter rows are padded with NUL codes, which no validator keeps.
+
+    Yields:
+        (chars, present) pairs: an (n, w) code matrix and a boolean mask that is False
+        for null entries of Arrow columns
+    """
+    if isinstance(values, bytes | bytearray | memoryview):
+        if not width:
+            raise ValueError('Raw byte buffers need the record width')
+        values = np.frombuffer(values, dtype=f'S{width}')
+
+    # an Arrow column means pyarrow is already loaded; never import it just to check
+    if type(values).__module__.startswith('pyarrow'):
+        yield from _arrow_char_rows(values, chunk_rows)
+        return
+
+    values = np.asarray(values)
+    if values.dtype.kind not in 'US':
+        values = values.astype(str)
+    values = values.ravel()
+    if values.dtype.kind == 'U':
+        codes = values.view(np.uint32).reshape(len(values), values.itemsize // 4)
+    else:
+        codes = values.view(np.uint8).reshape(len(values), values.itemsize)
+    for start in range(0, len(values), chunk_rows):
+        chars = codes[start : start + chunk_rows]
+        yield chars, np.ones(len(chars), dtype=bool)
+
+
+def _arrow_char_rows(values, chunk_rows):
+    """Character rows of a pyarrow string or binary column, from its offsets and data buffers."""
+    import pyarrow as pa  # noqa: PLC0415 - optional input format, kept off the import path of src
+
+    chunks = values.chunks if isinstance(values, pa.ChunkedArray) else [values]
+    for chunk in chunks:
+        large = pa.types.is_large_string(chunk.type) or pa.types.is_large_binary(chunk.type)
+        if not (large or pa.types.is_string(chunk.type) or pa.types.is_binary(chunk.type)):
+            raise TypeError(f'Expected a string or binary column, got {chunk.type}')
+        for start in range(0, len(chunk), chunk_rows):
+            part = chunk.slice(start, chunk_rows)
+            _, offsets_buffer, data_buffer = part.buffers()
+            offsets = np.frombuffer(offsets_buffer, dtype=np.int64 if large else np.int32)
+            offsets = offsets[part.offset : part.offset + len(part) + 1].astype(np.int64)
+            data = np.frombuffer(data_buffer, dtype=np.uint8) if data_buffer is not None else np.zeros(0, dtype=np.uint8)
+
+            lengths = np.diff(offsets)
+            if len(part) and (lengths == lengths[0]).all():
+                # equal-length rows are already a matrix in the data buffer
+                chars = data[offsets[0] : offsets[-1]].reshape(len(part), int(lengths[0]))
+            else:
+                # scatter the variable-length rows into a NUL-padded matrix
+                chars = np.zeros((len(part), int(lengths.max()) if len(part) else 0), dtype=np.uint8)
+                rows = np.repeat(np.arange(len(part)), lengths)
+                columns = np.arange(len(rows)) - np.repeat(offsets[:-1] - offsets[0], lengths)
+                chars[rows, columns] = data[offsets[0] : offsets[-1]]
+            present = ~np.asarray(part.is_null()) if part.null_count else np.ones(len(part), dtype=bool)
+            yield chars, present
+
+
+def align_rows(chars, keep, size):
+    """Pack the kept characters of each row right-aligned into ``size`` columns.
+
+    Rows with fewer kept characters are left-padded with '0', like ``pad_id``; rows
+    with more are truncated and flagged through the returned counts.
+
+    Args:
+        chars: (n, w) matrix of character codes
+        keep: Boolean matrix of the characters to keep
+        size: Width of the result
+
+    Returns:
+        ((n, size) uint8 matrix of ASCII codes, number of kept characters per row)
+    """
+    counts = keep.sum(axis=1)
+    # common case: every row keeps the same positions, e.g. bare or uniformly formatted input
+    if len(keep) and (keep == keep[0]).all() and counts[0] == size:
+        return chars[:, keep[0]].astype(np.uint8), counts
+
+    aligned = np.full((len(chars), size), ord('0'), dtype=np.uint8)
+    # number of kept characters at or after each position gives its column from the right
+    from_end = np.cumsum(keep[:, ::-1], axis=1)[:, ::-1]
+    rows, columns = np.nonzero(keep & (from_end <= size))
+    aligned[rows, size - from_end[rows, columns]] = chars[rows, columns]
+    return aligned, counts
+
+
+def digit_rows(chars, size, autopad=True):
+    """Strip non-digits from each row and pad it to ``size`` digits, like the scalar validators.
+
+    Returns:
+        ((n, size) digit matrix, mask of well-formed rows): a row is well formed if it has
+        exactly ``size`` digits, or fewer with ``autopad``, and is not all zeros
+    """
+    keep = (chars >= ord('0')) & (chars <= ord('9'))
+    aligned, counts = align_rows(chars, keep, size)
+    digits = aligned - ord('0')
+    well_formed = (counts <= size) if autopad else (counts == size)
+    return digits, well_formed & digits.any(axis=1)
+
+
+def validate_ids(values, size, check, autopad=True, width=None):
+    """Validate identifiers in bulk, the way the scalar ``validate_*`` functions do.
+
+    Args:
+        values: Identifiers in any form accepted by ``id_char_rows``
+        size: Number of digits of a complete identifier
+        check: Function from an (n, size) digit matrix to a boolean mask of correct check digits
+        autopad: Pad short identifiers with leading zeros instead of rejecting them
+        width: Record width of raw byte buffers
+
+    Returns:
+        Boolean NumPy array, one entry per identifier
+    """
+    masks = []
+    for chars, present in id_char_rows(values, width):
+        digits, well_formed = digit_rows(chars, size, autopad)
+        masks.append(present & well_formed & check(digits))
+    return np.concatenate(masks) if masks else np.zeros(0, dtype=bool)
@@ -0,0 +1,146 @@
+"""
+Weighting scenarios for location sampling.
+
+A ``WeightingScenario`` reweights cities without touching the population data: base weights
+are flattened or sharpened by a temperature, then multiplied by per-state, per-city and
+population-band factors, all as vectorized operations over the compiled city arrays. The
+resulting alias table can be cached to disk as an ``.npz`` file keyed by a fingerprint of the
+scenario, the base weights and the city data, so a scenario is only compiled once per data set.
+"""
+
+import hashlib
+import json
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from src.alias_table import AliasTable
+from src.population_index import PopulationIndex
+
+
+class WeightingScenario(NamedTuple):
+    """Reweighting of the cities of a population index.
+
+    The weight of city ``i`` is ``(base[i] / max(base)) ** (1 / temperature)`` times the
+    multiplier of its state, of the city itself and of every population band containing it.
+    A temperature above 1 flattens the distribution, below 1 sharpens it.
+
+    Attributes:
+        city_multipliers: Factor per city key, e.g. ``{'São Paulo_SP': 0.5}``
+        state_multipliers: Factor per state abbreviation, e.g. ``{'BA': 2.0}``
+        population_bands: ``(min_population, max_population, factor)`` triples; bounds are inclusive
+            and None leaves a side open, e.g. ``((None, 20_000, 10.0),)`` over-samples small towns
+        temperature: Exponent applied to the base weights as ``1 / temperature``
+    """
+
+    city_multipliers: Mapping[str, float] | None = None
+    state_multipliers: Mapping[str, float] | None = None
+    population_bands: Sequence[tuple[float | None, float | None, float]] = ()
+    temperature: float = 1.0
+
+    def weights(self, index: PopulationIndex, base: np.ndarray) -> np.ndarray:
+        """Scenario weight of every city.
+
+        Args:
+            index: Compiled population data
+            base: Base weight of every city, e.g. ``index.national_city_weights()``
+
+        Raises:
+            ValueError: If the temperature is not positive, a multiplier is negative or not finite,
+                a city or state is unknown, or population bands are used without city populations
+        """
+        if not self.temperature > 0:
+            raise ValueError(f'Temperature must be positive: {self.temperature}')
+        base = np.asarray(base, dtype=np.float64)
+        top = base.max() if len(base) else 0.0
+        weights = (base / top) ** (1.0 / self.temperature) if top > 0 else base.copy()
+
+        if self.state_multipliers:
+            factors = np.ones(len(index.state_abbrs))
+            for state_abbr, factor in self.state_multipliers.items():
+                if state_abbr not in index.state_ids:
+                    raise ValueError(f'Unknown state: {state_abbr}')
+                factors[index.state_ids[state_abbr]] = _check_factor(factor)
+            weights *= factors[index.city_state]
+
+        if self.city_multipliers:
+            unknown = [key for key in self.city_multipliers if key not in index.city_ids]
+            if unknown:
+                raise ValueError(f'Unknown city: {unknown[0]}')
+            cities = [index.city_ids[key] for key in self.city_multipliers]
+            weights[cities] *= [_check_factor(factor) for factor in self.city_multipliers.values()]
+
+        if self.population_bands:
+            population = index.city_population
+            if np.isnan(population).any():
+                raise ValueError('Population bands need city_population for every city')
+            for low, high, factor in self.population_bands:
+                band = np.ones(len(population), dtype=bool)
+                if low is not None:
+                    band &= population >= low
+                if high is not None:
+                    band &= population <= high
+                weights[band] *= _check_factor(factor)
+        return weights
+
+    def fingerprint(self, index: PopulationIndex, base: np.ndarray) -> str:
+        """Hex digest identifying this scenario applied to ``index`` and ``base``, used as the disk cache key.
+
+        Besides the base weights, the digest covers every part of the index the scenario reads:
+        city keys, state abbreviations, the state of each city and city populations.
+        """
+        spec = json.dumps(
+            [
+                sorted((self.city_multipliers or {}).items()),
+                sorted((self.state_multipliers or {}).items()),
+                [list(band) for band in self.population_bands],
+                self.temperature,
+                index.city_keys,
+                index.state_abbrs,
+            ]
+        )
+        digest = hashlib.sha256(spec.encode('utf-8'))
+        for array in (base, index.city_population):
+            digest.update(np.ascontiguousarray(array, dtype=np.float64).tobytes())
+        digest.update(np.ascontiguousarray(index.city_state, dtype=np.int64).tobytes())
+        return digest.hexdigest()[:32]
+
+
+def _check_factor(factor: float) -> float:
+    """Multiplier as float, raising ValueError if it is negative or not finite."""
+    factor = float(factor)
+    if not np.isfinite(factor) or factor < 0:
+        raise ValueError(f'Multipliers must be finite and non-negative: {factor}')
+    return factor
+
+
+def compile_scenario(
+    index: PopulationIndex, scenario: WeightingScenario, base: np.ndarray, cache_dir: str | Path | None = None
+) -> AliasTable:
+    """Compile a scenario into an alias table over city IDs.
+
+    Args:
+        index: Compiled population data
+        scenario: Reweighting to apply
+        base: Base weight of every city
+        cache_dir: Optional directory of compiled scenarios; a table found there is loaded
+            instead of rebuilt, and a newly built one is saved
+
+    Returns:
+        AliasTable over the scenario weights
+
+    Raises:
+        ValueError: If the scenario is invalid for the data or leaves every weight at zero
+    """
+    path = Path(cache_dir) / f'scenario-{scenario.fingerprint(index, base)}.npz' if cache_dir is not None else None
+    if path is not None and path.exists():
+        with np.load(path) as arrays:
+            return AliasTable.from_arrays(arrays['weights'], arrays['prob'], arrays['alias'])
+
+    table = AliasTable(scenario.weights(index, base))
+    if path is not None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(path, weights=table.weights, prob=table.prob, alias=table.alias)
+    return table